@@ -0,0 +1 @@
+# Population analytics over incoming assessments
@@ -0,0 +1,262 @@
+"""
+Streaming feature-drift monitor
+
+Every assessment updates running statistics of the 13 behavioral input
+fields and of the level each rule lands on. On demand the current window
+is compared with a reference snapshot (the population the rules and the
+model were tuned on) using the population stability index (PSI) and the
+Kolmogorov-Smirnov (KS) distance.
+
+Updates are O(1) per field and take no lock: as with the Prometheus
+metrics, each thread accumulates into its own shard (Welford moments and
+fixed-bin histogram counts), and shards are merged only when a snapshot
+is taken. Histogram bins are fixed per field (FIELD_EDGES), so reference
+and current counts always line up. KS is computed on those bins, which
+makes it a lower bound of the exact two-sample statistic.
+"""
+import logging
+import math
+from bisect import bisect_right
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from ..core.config import settings
+from ..core.metrics import ThreadShards
+from ..rules.scoring_engine import ScoringEngine
+from ..core.persistence import read_json, write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+# Interior bin edges per behavioral field; bin i holds edges[i-1] <= x < edges[i]
+_UNIT_EDGES = [i / 20 for i in range(1, 20)]
+FIELD_EDGES = {
+    'utility_payment_months': [3, 6, 9, 12, 15, 18, 24, 30, 36, 48, 60],
+    'utility_payment_consistency': _UNIT_EDGES,
+    'monthly_transaction_count': [5, 10, 15, 20, 25, 30, 40, 50, 60, 80, 100, 150],
+    'transaction_regularity_score': _UNIT_EDGES,
+    'spending_volatility': _UNIT_EDGES,
+    'avg_month_end_balance': [250, 500, 1000, 1500, 2500, 3500, 5000, 7500, 10000, 15000, 25000, 50000],
+    'savings_growth_rate': [-0.2, -0.1, -0.05, 0.0, 0.025, 0.05, 0.075, 0.1, 0.15, 0.2, 0.3, 0.5],
+    'withdrawal_discipline_score': _UNIT_EDGES,
+    'income_regularity_score': _UNIT_EDGES,
+    'income_stability_months': [3, 6, 9, 12, 18, 24, 36, 48, 72],
+    'account_tenure_months': [6, 12, 18, 24, 36, 48, 60, 90, 120, 180, 240],
+    'address_stability_years': [0.5, 1.0, 1.5, 2.0, 3.0, 4.0, 5.0, 7.5, 10.0, 15.0, 20.0],
+    'discretionary_income_ratio': _UNIT_EDGES
+}
+DRIFT_FIELDS = list(FIELD_EDGES)
+
+RULE_IDS = list(ScoringEngine.RULES)
+RULE_LEVELS = ('high', 'medium', 'low', 'minimum')
+
+# Conventional PSI bands: below 0.1 stable, 0.1-0.25 moderate, above significant
+PSI_MODERATE = 0.1
+PSI_SIGNIFICANT = 0.25
+
+# Floor for empty-bin proportions (PSI is undefined for zero counts)
+PSI_EPSILON = 1e-4
+
+STATUS_ORDER = ('insufficient_data', 'stable', 'moderate', 'significant')
+
+
+def psi(reference: List[int], current: List[int]) -> float:
+    """Population stability index of two histograms over the same bins"""
+    ref_total, cur_total = sum(reference), sum(current)
+    if not ref_total or not cur_total:
+        return 0.0
+    value = 0.0
+    for ref_count, cur_count in zip(reference, current):
+        expected = max(ref_count / ref_total, PSI_EPSILON)
+        actual = max(cur_count / cur_total, PSI_EPSILON)
+        value += (actual - expected) * math.log(actual / expected)
+    return value
+
+
+def ks_distance(reference: List[int], current: List[int]) -> float:
+    """Largest gap between the two empirical CDFs at the bin edges"""
+    ref_total, cur_total = sum(reference), sum(current)
+    if not ref_total or not cur_total:
+        return 0.0
+    distance = ref_cdf = cur_cdf = 0.0
+    for ref_count, cur_count in zip(reference, current):
+        ref_cdf += ref_count / ref_total
+        cur_cdf += cur_count / cur_total
+        distance = max(distance, abs(cur_cdf - ref_cdf))
+    return distance
+
+
+def psi_status(value: float) -> str:
+    if value >= PSI_SIGNIFICANT:
+        return 'significant'
+    if value >= PSI_MODERATE:
+        return 'moderate'
+    return 'stable'
+
+
+def _new_shard() -> list:
+    """[moments, histograms, levels]; moments are [n, mean, M2, min, max] per field"""
+    return [
+        [[0, 0.0, 0.0, math.inf, -math.inf] for _ in DRIFT_FIELDS],
+        [[0] * (len(FIELD_EDGES[field]) + 1) for field in DRIFT_FIELDS],
+        [[0] * len(RULE_LEVELS) for _ in RULE_IDS]
+    ]
+
+
+class DriftMonitor:
+    """
+    Running input statistics compared against a reference snapshot
+
+    Snapshots are plain JSON-serializable dicts, so a reference can be
+    frozen from live traffic, saved and reloaded on the next start.
+    """
+
+    def __init__(self, min_samples: int = 100):
+        self.min_samples = min_samples
+        self._edges = [FIELD_EDGES[field] for field in DRIFT_FIELDS]
+        self._rule_index = {rule_id: i for i, rule_id in enumerate(RULE_IDS)}
+        self._level_index = {level: i for i, level in enumerate(RULE_LEVELS)}
+        self._shards = ThreadShards(_new_shard)
+        self.window_started = datetime.utcnow()
+        self.reference: Optional[Dict] = None
+
+    def observe(self, behavioral_data: Dict, rule_results: List[Dict]):
+        """Add one assessment (raw behavioral fields and its rule results)"""
+        moments, histograms, levels = self._shards.local()
+        for i, field in enumerate(DRIFT_FIELDS):
+            value = float(behavioral_data.get(field) or 0)
+            stats = moments[i]
+            n = stats[0] + 1
+            delta = value - stats[1]
+            mean = stats[1] + delta / n
+            stats[2] += delta * (value - mean)
+            stats[1] = mean
+            stats[0] = n
+            if value < stats[3]:
+                stats[3] = value
+            if value > stats[4]:
+                stats[4] = value
+            histograms[i][bisect_right(self._edges[i], value)] += 1
+        for result in rule_results:
+            rule = self._rule_index.get(result['rule_id'])
+            if rule is not None:
+                levels[rule][self._level_index[result['level']]] += 1
+
+    def snapshot(self) -> Dict:
+        """Merged statistics of the current window"""
+        fields = {}
+        shards = self._shards.all()
+        for i, field in enumerate(DRIFT_FIELDS):
+            # Chan et al. pairwise merge of the per-thread Welford moments
+            n, mean, m2 = 0, 0.0, 0.0
+            low, high = math.inf, -math.inf
+            histogram = [0] * (len(self._edges[i]) + 1)
+            for moments, histograms, _ in shards:
+                shard_n, shard_mean, shard_m2, shard_low, shard_high = moments[i]
+                if shard_n:
+                    total = n + shard_n
+                    delta = shard_mean - mean
+                    mean += delta * shard_n / total
+                    m2 += shard_m2 + delta * delta * n * shard_n / total
+                    n = total
+                    low, high = min(low, shard_low), max(high, shard_high)
+                histogram = [a + b for a, b in zip(histogram, histograms[i])]
+            fields[field] = {
+                'count': n,
+                'mean': mean,
+                'std': math.sqrt(m2 / (n - 1)) if n > 1 else 0.0,
+                'min': low if n else None,
+                'max': high if n else None,
+                'histogram': histogram
+            }
+
+        rule_levels = {}
+        for r, rule_id in enumerate(RULE_IDS):
+            counts = [0] * len(RULE_LEVELS)
+            for _, _, levels in shards:
+                counts = [a + b for a, b in zip(counts, levels[r])]
+            rule_levels[rule_id] = dict(zip(RULE_LEVELS, counts))
+
+        return {
+            'n': max((f['count'] for f in fields.values()), default=0),
+            'window_started': self.window_started.isoformat(),
+            'taken_at': datetime.utcnow().isoformat(),
+            'edges': FIELD_EDGES,
+            'fields': fields,
+            'rule_levels': rule_levels
+        }
+
+    def reset(self):
+        """Start a new window (observations racing the reset may be lost)"""
+        self._shards = ThreadShards(_new_shard)
+        self.window_started = datetime.utcnow()
+
+    def set_reference(self, snapshot: Dict) -> bool:
+        """Use a snapshot as the reference; refused if its bins differ"""
+        if snapshot.get('edges') != FIELD_EDGES:
+            logger.warning("Drift reference ignored: histogram bins have changed")
+            return False
+        self.reference = snapshot
+        return True
+
+    def freeze_reference(self, path: Optional[str] = None) -> Dict:
+        """Make the current window the reference, save it and start a new window"""
+        snapshot = self.snapshot()
+        self.set_reference(snapshot)
+        if path:
+            write_json_atomic(path, snapshot)
+        self.reset()
+        return snapshot
+
+    def load_reference(self, path: str) -> bool:
+        """Load a saved reference; False if there is none or it is incompatible"""
+        snapshot = read_json(path)
+        return snapshot is not None and self.set_reference(snapshot)
+
+    def report(self) -> Dict:
+        """PSI and KS of every field and rule against the reference"""
+        current = self.snapshot()
+        reference = self.reference
+        report = {
+            'status': 'no_reference',
+            'n_current': current['n'],
+            'n_reference': reference['n'] if reference else 0,
+            'window_started': current['window_started'],
+            'reference_taken_at': reference['taken_at'] if reference else None,
+            'fields': [],
+            'rules': []
+        }
+        if reference is None:
+            return report
+
+        enough = current['n'] >= self.min_samples
+        for field in DRIFT_FIELDS:
+            cur, ref = current['fields'][field], reference['fields'][field]
+            value = psi(ref['histogram'], cur['histogram'])
+            report['fields'].append({
+                'field': field,
+                'psi': round(value, 4),
+                'ks': round(ks_distance(ref['histogram'], cur['histogram']), 4),
+                'current_mean': cur['mean'],
+                'reference_mean': ref['mean'],
+                'mean_shift_std': round((cur['mean'] - ref['mean']) / ref['std'], 4) if ref['std'] else 0.0,
+                'status': psi_status(value) if enough else 'insufficient_data'
+            })
+        for rule_id in RULE_IDS:
+            cur, ref = current['rule_levels'][rule_id], reference['rule_levels'][rule_id]
+            cur_counts = [cur[level] for level in RULE_LEVELS]
+            ref_counts = [ref[level] for level in RULE_LEVELS]
+            value = psi(ref_counts, cur_counts)
+            report['rules'].append({
+                'rule_id': rule_id,
+                'psi': round(value, 4),
+                'current_levels': cur,
+                'reference_levels': ref,
+                'status': psi_status(value) if enough else 'insufficient_data'
+            })
+
+        statuses = [entry['status'] for entry in report['fields'] + report['rules']]
+        report['status'] = max(statuses, key=STATUS_ORDER.index)
+        return report
+
+
+drift_monitor = DriftMonitor(min_samples=settings.DRIFT_MIN_SAMPLES)
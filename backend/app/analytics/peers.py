@@ -0,0 +1,165 @@
+"""
+Peer comparison of rule values
+
+For every rule the explanation can say how the applicant's value ranks
+against other applicants ("your savings balance is above 64% of
+applicants"). Each rule field has a fixed-resolution histogram sketch of
+PEER_BINS bins over its expected range (values outside are clamped into
+the end bins). Counts sit in a Fenwick tree, so recording a value and
+ranking one are O(log PEER_BINS), and memory is bounded by
+fields x bins per cohort. Within a bin, values are assumed uniform, so
+a rank is exact to within one bin's share of the population.
+
+Besides all applicants, a cohort key can split the population by a
+banded behavioral field (COHORT_KEYS, e.g. tenure bands). The cohort
+rank is used once the cohort has min_peers values; until then the rank
+is against all applicants.
+
+Values come from every assessment (observe) and, at startup, from the
+most recent behavioral_data rows (warm), so ranks are available from the
+first request without scanning the table later. Each worker keeps its
+own sketch; every worker sees a sample of the same traffic.
+"""
+import threading
+from bisect import bisect_right
+from typing import Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+
+from ..core.config import settings
+from ..db import models
+from ..rules.scoring_engine import ScoringEngine
+from .percentiles import FenwickTree
+
+PEER_BINS = 200
+
+# Expected range of each rule field
+FIELD_RANGES = {
+    'utility_payment_months': (0, 120),
+    'utility_payment_consistency': (0.0, 1.0),
+    'monthly_transaction_count': (0, 300),
+    'transaction_regularity_score': (0.0, 1.0),
+    'spending_volatility': (0.0, 1.0),
+    'withdrawal_discipline_score': (0.0, 1.0),
+    'avg_month_end_balance': (0.0, 50000.0),
+    'savings_growth_rate': (-1.0, 1.0),
+    'income_regularity_score': (0.0, 1.0),
+    'income_stability_months': (0, 120),
+    'account_tenure_months': (0, 240),
+    'address_stability_years': (0.0, 20.0)
+}
+
+# Cohort key -> (field, band edges, band labels, peer group phrase)
+COHORT_KEYS = {
+    'tenure_band': (
+        'account_tenure_months',
+        [12, 24, 60],
+        ['under 1 year', '1-2 years', '2-5 years', 'over 5 years'],
+        'applicants with {band} of account history'
+    ),
+    'income_stability_band': (
+        'income_stability_months',
+        [6, 12, 24],
+        ['under 6 months', '6-12 months', '1-2 years', 'over 2 years'],
+        'applicants with {band} of stable income'
+    )
+}
+
+ALL_APPLICANTS = 'applicants'
+
+
+class PeerComparison:
+    """Per-rule peer ranks over all applicants and an optional cohort"""
+
+    def __init__(self, cohort_key: Optional[str] = None, min_peers: int = 50,
+                 bins: int = PEER_BINS):
+        if cohort_key and cohort_key not in COHORT_KEYS:
+            raise ValueError(f"Unknown peer cohort key: {cohort_key}")
+        self.cohort_key = cohort_key or None
+        self.min_peers = min_peers
+        self.bins = bins
+        self.rules = [(rule_id, rule['field'], rule.get('inverse', False))
+                      for rule_id, rule in ScoringEngine.RULES.items()]
+        n_cohorts = 1 + (len(COHORT_KEYS[self.cohort_key][2]) if self.cohort_key else 0)
+        # Group 0 is all applicants, then one group per cohort band
+        self._trees: List[List[FenwickTree]] = [
+            [FenwickTree(bins) for _ in self.rules] for _ in range(n_cohorts)
+        ]
+        self._lock = threading.Lock()
+
+    def _position(self, field: str, value: float) -> float:
+        """Value on the bin scale [0, bins]"""
+        low, high = FIELD_RANGES[field]
+        return min(max((float(value) - low) / (high - low), 0.0), 1.0) * self.bins
+
+    def _cohort(self, behavioral_data: Dict) -> Optional[int]:
+        if self.cohort_key is None:
+            return None
+        field, edges, _, _ = COHORT_KEYS[self.cohort_key]
+        return 1 + bisect_right(edges, float(behavioral_data.get(field) or 0))
+
+    def observe(self, behavioral_data: Dict):
+        """Record one applicant's rule values"""
+        cohort = self._cohort(behavioral_data)
+        bins = [min(int(self._position(field, behavioral_data.get(field) or 0)), self.bins - 1)
+                for _, field, _ in self.rules]
+        with self._lock:
+            for group in (0,) if cohort is None else (0, cohort):
+                for tree, b in zip(self._trees[group], bins):
+                    tree.add(b, 1)
+
+    def _share_below(self, tree: FenwickTree, position: float) -> float:
+        b = min(int(position), self.bins - 1)
+        below = tree.prefix_sum(b)
+        in_bin = tree.prefix_sum(b + 1) - below
+        return (below + (position - b) * in_bin) / tree.total
+
+    def compare(self, behavioral_data: Dict) -> Dict[str, Dict]:
+        """
+        Rank an applicant's rule values against their peers
+
+        Returns:
+            Per rule_id: 'percentile' (share of peers the value is better
+            than: higher, or lower for inverse rules), 'peer_group'
+            (phrase naming the peers) and 'peer_count'; empty until
+            min_peers values are known. 'inverse' marks rules where a
+            lower value is better
+        """
+        cohort = self._cohort(behavioral_data)
+        with self._lock:
+            group, phrase = 0, ALL_APPLICANTS
+            if cohort is not None and self._trees[cohort][0].total >= self.min_peers:
+                _, _, labels, template = COHORT_KEYS[self.cohort_key]
+                group, phrase = cohort, template.format(band=labels[cohort - 1])
+            trees = self._trees[group]
+            if trees[0].total < self.min_peers:
+                return {}
+            result = {}
+            for (rule_id, field, inverse), tree in zip(self.rules, trees):
+                below = self._share_below(tree, self._position(field, behavioral_data.get(field) or 0))
+                result[rule_id] = {
+                    'percentile': round(100.0 * ((1.0 - below) if inverse else below), 1),
+                    'peer_group': phrase,
+                    'peer_count': tree.total,
+                    'inverse': inverse
+                }
+        return result
+
+    def warm(self, engine: Engine, rows: int = 20000) -> int:
+        """Record the most recent behavioral_data rows; returns rows read"""
+        behavioral = models.BehavioralData.__table__
+        fields = list(FIELD_RANGES)
+        with engine.connect() as conn:
+            records = conn.execute(
+                select(*[behavioral.c[field] for field in fields])
+                .order_by(behavioral.c.id.desc())
+                .limit(rows)
+            ).all()
+        for record in records:
+            self.observe(dict(zip(fields, record)))
+        return len(records)
+
+
+peer_comparison = PeerComparison(cohort_key=settings.PEER_COHORT_KEY,
+                                 min_peers=settings.PEER_MIN_COHORT_SIZE)
@@ -0,0 +1,264 @@
+"""
+Population percentile of trust scores
+
+Lenders see where an applicant's latest trust score sits among the latest
+scores of all users ("top 18%"). Rule scores are integers in 420-860, so
+the distribution is a Fenwick (binary indexed) tree over 441 buckets.
+Moving a user to a new score and ranking a score are both O(log 441).
+
+The worker that stores a score applies it at once. The tree also follows
+the credit_scores table: a background thread applies rows with an id
+above the last one seen (keyset, every SCORE_PERCENTILE_SYNC_SECONDS), so
+every worker converges on the same distribution whichever worker stored
+a score, and /score issues no extra query. Applying a score is
+idempotent, so seeing it twice is harmless. The latest bucket of each
+user is kept in memory (about 100 bytes per user) so a new score
+replaces the old one.
+
+The tree, the user buckets and the last id are saved to
+SCORE_PERCENTILE_PATH every SCORE_PERCENTILE_SAVE_SECONDS and at
+shutdown. At startup the snapshot is loaded and then caught up from the
+table. Without a snapshot, or if the table is behind it (a restored or
+recreated database), the tree is rebuilt from all stored scores. A
+score row that commits after a higher id has already been synced is
+missed until the next rebuild (delete the snapshot to force one).
+"""
+import logging
+import threading
+import time
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.engine import Engine
+
+from ..db import models
+from ..rules.scoring_engine import ScoringEngine
+from ..core.persistence import read_json, write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+
+class FenwickTree:
+    """Counts over buckets 0..size-1 with O(log size) updates and prefix sums"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._tree = [0] * (size + 1)
+        self.total = 0
+
+    @classmethod
+    def from_counts(cls, counts: List[int]) -> 'FenwickTree':
+        """Build in O(size)"""
+        tree = cls(len(counts))
+        tree._tree[1:] = counts
+        for i in range(1, tree.size + 1):
+            parent = i + (i & -i)
+            if parent <= tree.size:
+                tree._tree[parent] += tree._tree[i]
+        tree.total = sum(counts)
+        return tree
+
+    def add(self, index: int, delta: int):
+        self.total += delta
+        i = index + 1
+        while i <= self.size:
+            self._tree[i] += delta
+            i += i & -i
+
+    def prefix_sum(self, end: int) -> int:
+        """Sum of buckets [0, end)"""
+        result = 0
+        i = end
+        while i > 0:
+            result += self._tree[i]
+            i -= i & -i
+        return result
+
+    def counts(self) -> List[int]:
+        sums = [self.prefix_sum(i) for i in range(self.size + 1)]
+        return [b - a for a, b in zip(sums, sums[1:])]
+
+
+class ScoreDistribution:
+    """Latest trust score per user, ranked with a Fenwick tree"""
+
+    def __init__(self, score_min: int = ScoringEngine.SCORE_MIN,
+                 score_max: int = ScoringEngine.SCORE_MAX):
+        self.score_min = score_min
+        self.score_max = score_max
+        self._tree = FenwickTree(score_max - score_min + 1)
+        self._user_bucket: Dict[str, int] = {}
+        self.last_score_id = 0
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._engine: Optional[Engine] = None
+        self._path: Optional[str] = None
+
+    @property
+    def population(self) -> int:
+        return self._tree.total
+
+    def reset(self):
+        """Forget every score"""
+        with self._lock:
+            self._tree = FenwickTree(self.score_max - self.score_min + 1)
+            self._user_bucket = {}
+            self.last_score_id = 0
+
+    def _bucket(self, trust_score: int) -> int:
+        return min(max(int(trust_score), self.score_min), self.score_max) - self.score_min
+
+    def apply(self, user_id: str, trust_score: int):
+        """Make trust_score the user's latest score"""
+        with self._lock:
+            self._apply_locked(user_id, trust_score)
+
+    def _apply_locked(self, user_id: str, trust_score: int):
+        bucket = self._bucket(trust_score)
+        previous = self._user_bucket.get(user_id)
+        if previous is not None:
+            self._tree.add(previous, -1)
+        self._tree.add(bucket, 1)
+        self._user_bucket[user_id] = bucket
+
+    def rank(self, trust_score: int) -> Optional[Dict]:
+        """
+        Position of a score among the latest scores of all users
+
+        Returns:
+            Dictionary with 'percentile' (share of users scoring lower),
+            'top_percent' (share scoring the same or higher) and
+            'population', or None while no score is known
+        """
+        bucket = self._bucket(trust_score)
+        with self._lock:
+            total = self._tree.total
+            below = self._tree.prefix_sum(bucket)
+        if not total:
+            return None
+        return {
+            'percentile': round(100.0 * below / total, 1),
+            'top_percent': round(100.0 * (total - below) / total, 1),
+            'population': total
+        }
+
+    def sync(self, engine: Engine, chunk_size: int = 10000) -> int:
+        """
+        Apply credit_scores rows stored since the last sync
+
+        Returns:
+            Rows applied
+        """
+        scores = models.CreditScore.__table__
+        applied = 0
+        while True:
+            with self._lock:
+                cursor = self.last_score_id
+            with engine.connect() as conn:
+                rows = conn.execute(
+                    select(scores.c.id, scores.c.user_id, scores.c.trust_score)
+                    .where(scores.c.id > cursor)
+                    .order_by(scores.c.id)
+                    .limit(chunk_size)
+                ).all()
+            # Rows and cursor move together, so a snapshot never counts a
+            # score twice or misses one
+            with self._lock:
+                if self.last_score_id != cursor:
+                    # Reset (or another sync) moved the cursor during the query
+                    continue
+                for score_id, user_id, trust_score in rows:
+                    self._apply_locked(user_id, trust_score)
+                if rows:
+                    self.last_score_id = rows[-1][0]
+            applied += len(rows)
+            if len(rows) < chunk_size:
+                return applied
+
+    def to_snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                'score_min': self.score_min,
+                'score_max': self.score_max,
+                'last_score_id': self.last_score_id,
+                'counts': self._tree.counts(),
+                'user_buckets': dict(self._user_bucket)
+            }
+
+    def save(self, path: str):
+        write_json_atomic(path, self.to_snapshot())
+
+    def load(self, path: str) -> bool:
+        """Restore a saved snapshot; False if there is none, its score range differs or its counts are off"""
+        snapshot = read_json(path)
+        if snapshot is None:
+            return False
+        if (snapshot['score_min'], snapshot['score_max']) != (self.score_min, self.score_max):
+            logger.warning("Score distribution snapshot ignored: score range has changed")
+            return False
+        buckets = list(snapshot['user_buckets'].values())
+        histogram = [0] * self._tree.size
+        for bucket in buckets:
+            if 0 <= bucket < len(histogram):
+                histogram[bucket] += 1
+        if sum(histogram) != len(buckets) or histogram != snapshot['counts']:
+            logger.warning("Score distribution snapshot ignored: counts do not match user buckets")
+            return False
+        with self._lock:
+            self._tree = FenwickTree.from_counts(snapshot['counts'])
+            self._user_bucket = snapshot['user_buckets']
+            self.last_score_id = snapshot['last_score_id']
+        return True
+
+    def start(self, engine: Engine, path: Optional[str] = None,
+              sync_interval: float = 5.0, save_interval: float = 300.0):
+        """Load the snapshot, catch up from the table and keep following it"""
+        self._engine = engine
+        self._path = path
+        if path and self.load(path):
+            logger.info(f"Score distribution restored up to score {self.last_score_id}")
+        scores = models.CreditScore.__table__
+        with engine.connect() as conn:
+            max_id = conn.execute(select(func.max(scores.c.id))).scalar() or 0
+        if max_id < self.last_score_id:
+            logger.warning("credit_scores is behind the score distribution; rebuilding")
+            self.reset()
+        applied = self.sync(engine)
+        logger.info(f"Score distribution: {applied} scores applied, {self.population} users")
+        if sync_interval > 0 and self._thread is None:
+            self._stopped.clear()
+            self._thread = threading.Thread(
+                target=self._run, args=(sync_interval, save_interval),
+                name='nexis-score-distribution', daemon=True
+            )
+            self._thread.start()
+
+    def _run(self, sync_interval: float, save_interval: float):
+        last_save = time.monotonic()
+        dirty = False
+        while not self._stopped.wait(sync_interval):
+            try:
+                dirty = self.sync(self._engine) > 0 or dirty
+                if dirty and self._path and time.monotonic() - last_save >= save_interval:
+                    self.save(self._path)
+                    last_save = time.monotonic()
+                    dirty = False
+            except Exception as exc:
+                # Syncing must never take the service down
+                logger.error(f"Score distribution sync failed: {exc}")
+
+    def stop(self, timeout: float = 5.0):
+        """Stop syncing and save the snapshot"""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._path:
+            try:
+                self.save(self._path)
+            except OSError as exc:
+                logger.error(f"Could not save the score distribution: {exc}")
+
+
+score_distribution = ScoreDistribution()
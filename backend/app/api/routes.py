@@ -1,13 +1,17 @@
 """
 API Routes for NEXIS Platform
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Request
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, aliased
 from datetime import datetime, timedelta
 from typing import List
 from slowapi import Limiter
 from slowapi.util import get_remote_address
-import pandas as pd
+import asyncio
+import logging
+import time
 import uuid
 
 from ..db.database import get_db
@@ -16,21 +20,39 @@ from .. import schemas
 from ..rules.scoring_engine import ScoringEngine
 from ..rules.explainability import ExplainabilityEngine
 from ..rules.completion_pathway import CompletionPathwayGenerator
+from ..rules.counterfactual import CounterfactualSolver
 from ..core.config import settings
+from ..core.metrics import stage_timer, HYBRID_FALLBACKS
+from ..ml.feature_engineering import FeatureEngineer
+from ..ml.hybrid import blend_scores, calibrate_model_score, model_factors
+from ..ml.inference_server import inference_server, ModelUnavailableError
+from ..middleware.consent import consent_cache, get_consent_status
+from ..analytics.drift import drift_monitor
+from ..analytics.peers import peer_comparison
+from ..analytics.percentiles import score_distribution
 from ..core.security import (
     create_access_token,
     verify_password,
     get_password_hash,
-    get_current_user
+    get_current_user,
+    get_current_operator
 )
 
 router = APIRouter()
 
+logger = logging.getLogger(__name__)
+
 # Global scoring engine instance
 scoring_engine = ScoringEngine()
 
 # Rate limiter
-limiter = Limiter(key_func=get_remote_address)
+limiter = Limiter(key_func=get_remote_address, enabled=settings.RATE_LIMIT_ENABLED)
+
+
+def _latest_id(model, user_id: str):
+    """Scalar subquery selecting the id of a user's most recent row in model's table"""
+    latest = aliased(model)
+    return select(func.max(latest.id)).where(latest.user_id == user_id).scalar_subquery()
 
 
 # ============= AUTHENTICATION ROUTES =============
@@ -156,8 +178,8 @@ async def get_current_user_profile(
     
     # Get latest score if exists
     latest_score = db.query(models.CreditScore).filter(
-        models.CreditScore.user_id == user.user_id
-    ).order_by(models.CreditScore.scored_at.desc()).first()
+        models.CreditScore.id == _latest_id(models.CreditScore, user.user_id)
+    ).first()
     
     return schemas.UserProfileResponse(
         user_id=user.user_id,
@@ -222,6 +244,7 @@ async def submit_consent(
     user.consent_timestamp = datetime.utcnow()
     user.profile_completed = True
     db.commit()
+    consent_cache.invalidate(user.user_id)
     
     return schemas.ConsentResponse(
         user_id=user.user_id,
@@ -231,65 +254,71 @@ async def submit_consent(
     )
 
 
-@router.post("/score", response_model=schemas.ScoreResponse)
-@limiter.limit("5/minute")
-async def calculate_score(
-    request: Request,
-    score_request: schemas.ScoreRequest,
-    db: Session = Depends(get_db)
-):
-    """
-    Calculate credit trust score using rule-based assessment
-    
-    - Validates user consent
-    - Applies behavioral rules
-    - Stores results
-    - Returns score and assessment metrics
-    """
-    # Verify user exists and has consent
-    user = db.query(models.User).filter(
-        models.User.user_id == score_request.user_id
-    ).first()
+def _require_consent(db: Session, user_id: str, endpoint: str):
+    """Raise 404/403 unless the user exists and has given consent"""
+    with stage_timer(endpoint, "db_read"):
+        consent_given = get_consent_status(db, user_id)
     
-    if not user:
+    if consent_given is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found. Please submit consent first."
         )
     
-    if not user.consent_given:
+    if not consent_given:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User consent not given"
         )
+
+
+def _risk_color(trust_score: int) -> str:
+    if trust_score >= 700:
+        return 'green'
+    elif trust_score >= 550:
+        return 'yellow'
+    return 'red'
+
+
+def _assess_and_store(db: Session, user_id: str, raw_data: dict, endpoint: str) -> dict:
+    """
+    Run the rule-based assessment and persist its records
     
+    Stores the behavioral data, score, explanation and improvement plan.
+    
+    Returns:
+        Dictionary with score_result, assessment_strength, rule_match_level,
+        factors, scored_at and valid_until
+    """
     # Store behavioral data
     behavioral_data = models.BehavioralData(
-        user_id=score_request.user_id,
-        **score_request.behavioral_data.model_dump()
+        user_id=user_id,
+        **raw_data
     )
     db.add(behavioral_data)
-    db.commit()
+    with stage_timer(endpoint, "commit"):
+        db.commit()
     
     # Calculate score using rule-based engine
-    raw_data = score_request.behavioral_data.model_dump()
-    score_result = scoring_engine.calculate_score(raw_data)
-    
-    # Calculate assessment strength
-    documentation_months = raw_data.get('account_tenure_months', 0)
-    assessment_strength = scoring_engine.get_assessment_strength(raw_data, documentation_months)
-    rule_match_level = scoring_engine.get_rule_match_level(
-        score_result['rules_satisfied'],
-        score_result['rules_evaluated']
-    )
+    with stage_timer(endpoint, "calculate_score"):
+        score_result = scoring_engine.calculate_score(raw_data)
+        
+        # Calculate assessment strength
+        documentation_months = raw_data.get('account_tenure_months', 0)
+        assessment_strength = scoring_engine.get_assessment_strength(raw_data, documentation_months)
+        rule_match_level = scoring_engine.get_rule_match_level(
+            score_result['rules_satisfied'],
+            score_result['rules_evaluated']
+        )
     
-    # Determine risk color
-    if score_result['trust_score'] >= 700:
-        risk_color = 'green'
-    elif score_result['trust_score'] >= 550:
-        risk_color = 'yellow'
-    else:
-        risk_color = 'red'
+    # Feed the input drift monitor (lock-free per-thread update)
+    with stage_timer(endpoint, "drift"):
+        drift_monitor.observe(raw_data, score_result['rule_results'])
+    
+    # Rank each rule value against peers seen so far, then add this applicant
+    with stage_timer(endpoint, "peers"):
+        peers = peer_comparison.compare(raw_data)
+        peer_comparison.observe(raw_data)
     
     # Calculate validity period
     scored_at = datetime.utcnow()
@@ -297,7 +326,7 @@ async def calculate_score(
     
     # Store score
     score_record = models.CreditScore(
-        user_id=score_request.user_id,
+        user_id=user_id,
         trust_score=score_result['trust_score'],
         risk_level=score_result['risk_level'],
         risk_category=score_result['risk_level'],
@@ -315,14 +344,15 @@ async def calculate_score(
     db.add(score_record)
     
     # Generate and store explanation
-    factors = ExplainabilityEngine.generate_factors(score_result['rule_results'])
-    
-    positive = [f for f in factors if f['type'] == 'positive']
-    neutral = [f for f in factors if f['type'] == 'neutral']
-    negative = [f for f in factors if f['type'] == 'negative']
+    with stage_timer(endpoint, "factors"):
+        factors = ExplainabilityEngine.generate_factors(score_result['rule_results'], peers=peers)
+        
+        positive = [f for f in factors if f['type'] == 'positive']
+        neutral = [f for f in factors if f['type'] == 'neutral']
+        negative = [f for f in factors if f['type'] == 'negative']
     
     explanation_record = models.Explanation(
-        user_id=score_request.user_id,
+        user_id=user_id,
         score_id=score_record.id,
         positive_factors=positive,
         neutral_factors=neutral,
@@ -332,43 +362,182 @@ async def calculate_score(
     db.add(explanation_record)
     
     # Generate improvement plan
-    recommendations = CompletionPathwayGenerator.generate_recommendations(
-        score_result['rule_results'],
-        score_result['trust_score']
-    )
-    
-    estimated_new_score = CompletionPathwayGenerator.calculate_potential_score(
-        score_result['trust_score'],
-        recommendations
-    )
+    with stage_timer(endpoint, "pathway"):
+        recommendations = CompletionPathwayGenerator.generate_recommendations(
+            score_result['rule_results'],
+            score_result['trust_score']
+        )
+        
+        estimated_new_score = CompletionPathwayGenerator.calculate_potential_score(
+            score_result['trust_score'],
+            recommendations
+        )
     
     total_potential_increase = estimated_new_score - score_result['trust_score']
     
     improvement_record = models.ImprovementPlan(
-        user_id=score_request.user_id,
+        user_id=user_id,
         recommendations=recommendations,
         estimated_score_increase=total_potential_increase
     )
     db.add(improvement_record)
     
-    db.commit()
+    with stage_timer(endpoint, "commit"):
+        db.commit()
+    
+    # Other workers pick the score up from credit_scores on their next sync
+    score_distribution.apply(user_id, score_result['trust_score'])
+    
+    return {
+        'score_result': score_result,
+        'assessment_strength': assessment_strength,
+        'rule_match_level': rule_match_level,
+        'factors': factors,
+        'scored_at': scored_at,
+        'valid_until': valid_until
+    }
+
+
+@router.post("/score", response_model=schemas.ScoreResponse)
+@limiter.limit("5/minute")
+async def calculate_score(
+    request: Request,
+    score_request: schemas.ScoreRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Calculate credit trust score using rule-based assessment
+    
+    - Validates user consent
+    - Applies behavioral rules
+    - Stores results
+    - Returns score and assessment metrics
+    """
+    # Verify user exists and has consent
+    _require_consent(db, score_request.user_id, "score")
+    
+    with stage_timer("score", "validation"):
+        raw_data = score_request.behavioral_data.model_dump()
+    
+    assessment = _assess_and_store(db, score_request.user_id, raw_data, "score")
+    score_result = assessment['score_result']
     
     return schemas.ScoreResponse(
         user_id=score_request.user_id,
         trust_score=score_result['trust_score'],
         risk_level=score_result['risk_level'],
-        risk_color=risk_color,
-        assessment_strength=assessment_strength,
-        rule_match_level=rule_match_level,
+        risk_color=_risk_color(score_result['trust_score']),
+        assessment_strength=assessment['assessment_strength'],
+        rule_match_level=assessment['rule_match_level'],
         rules_evaluated=score_result['rules_evaluated'],
         rules_satisfied=score_result['rules_satisfied'],
         rules_partial=score_result['rules_partial'],
         rules_not_met=score_result['rules_not_met'],
         total_points=score_result['total_points'],
         max_points=score_result['max_points'],
-        scored_at=scored_at,
-        valid_until=valid_until,
-        message=f"Your credit trust assessment has been completed. Assessment Strength: {assessment_strength}."
+        scored_at=assessment['scored_at'],
+        valid_until=assessment['valid_until'],
+        message=f"Your credit trust assessment has been completed. Assessment Strength: {assessment['assessment_strength']}."
+    )
+
+
+async def _score_with_deadline(features) -> tuple:
+    """Model result and its own latency in ms (submission to result)"""
+    started = time.perf_counter()
+    result = await asyncio.wait_for(
+        inference_server.submit(features), settings.HYBRID_MODEL_DEADLINE_MS / 1000.0
+    )
+    return result, (time.perf_counter() - started) * 1000
+
+
+@router.post("/score/hybrid", response_model=schemas.HybridScoreResponse)
+@limiter.limit("5/minute")
+async def calculate_hybrid_score(
+    request: Request,
+    score_request: schemas.ScoreRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Calculate the rule score and the model score in one request
+    
+    The stored assessment is the rule-based one (lender view, explainability
+    and improvement endpoints are unchanged). The model runs on the
+    micro-batching inference server while the rule assessment is stored
+    in a worker thread; its score is calibrated onto the rule scale and blended in. If the
+    model is not loaded or misses HYBRID_MODEL_DEADLINE_MS, the response
+    falls back to the rule score alone.
+    """
+    _require_consent(db, score_request.user_id, "score_hybrid")
+    
+    with stage_timer("score_hybrid", "validation"):
+        raw_data = score_request.behavioral_data.model_dump()
+        features = FeatureEngineer.engineer_features_array(raw_data)[0]
+    
+    # Start the model first, then store the rule assessment off the event
+    # loop so the batch collector and the model run during the DB writes
+    model_task = asyncio.ensure_future(_score_with_deadline(features))
+    
+    try:
+        assessment = await run_in_threadpool(
+            _assess_and_store, db, score_request.user_id, raw_data, "score_hybrid"
+        )
+    except BaseException:
+        model_task.cancel()
+        raise
+    score_result = assessment['score_result']
+    rule_score = score_result['trust_score']
+    
+    model_result = None
+    model_latency_ms = None
+    fallback_reason = None
+    with stage_timer("score_hybrid", "model"):
+        try:
+            model_result, model_latency_ms = await model_task
+        except asyncio.TimeoutError:
+            fallback_reason = 'timeout'
+        except ModelUnavailableError:
+            fallback_reason = 'model_unavailable'
+        except Exception as exc:
+            # The rule assessment is already stored; a model failure only
+            # costs the blend
+            logger.error(f"Hybrid model scoring failed: {exc}")
+            fallback_reason = 'model_error'
+    if fallback_reason:
+        HYBRID_FALLBACKS.labels(fallback_reason).inc()
+    
+    model_fields = {}
+    if model_result:
+        model_fields = {
+            'model_score': model_result.trust_score,
+            'model_calibrated_score': calibrate_model_score(model_result.trust_score),
+            'model_risk_level': model_result.risk_level,
+            'model_confidence': model_result.confidence,
+            'model_version': model_result.model_version,
+            'model_latency_ms': model_latency_ms,
+            'model_factors': model_factors(features, model_result.contributions, model_result.predicted_class)
+        }
+    
+    trust_score = blend_scores(rule_score, model_result.trust_score if model_result else None)
+    
+    return schemas.HybridScoreResponse(
+        user_id=score_request.user_id,
+        trust_score=trust_score,
+        risk_level=scoring_engine.classify_risk(trust_score),
+        risk_color=_risk_color(trust_score),
+        scoring_mode='hybrid' if model_result else 'rule_only',
+        fallback_reason=fallback_reason,
+        rule_score=rule_score,
+        rule_risk_level=score_result['risk_level'],
+        assessment_strength=assessment['assessment_strength'],
+        rule_match_level=assessment['rule_match_level'],
+        rules_evaluated=score_result['rules_evaluated'],
+        rules_satisfied=score_result['rules_satisfied'],
+        rule_factors=assessment['factors'],
+        model_weight=settings.HYBRID_MODEL_WEIGHT if model_result else 0.0,
+        scored_at=assessment['scored_at'],
+        valid_until=assessment['valid_until'],
+        message="Your credit trust assessment has been completed.",
+        **model_fields
     )
 
 
@@ -386,8 +555,8 @@ async def get_explainability(
     """
     # Get latest explanation
     explanation = db.query(models.Explanation).filter(
-        models.Explanation.user_id == user_id
-    ).order_by(models.Explanation.created_at.desc()).first()
+        models.Explanation.id == _latest_id(models.Explanation, user_id)
+    ).first()
     
     if not explanation:
         raise HTTPException(
@@ -397,8 +566,8 @@ async def get_explainability(
     
     # Get latest score
     score = db.query(models.CreditScore).filter(
-        models.CreditScore.user_id == user_id
-    ).order_by(models.CreditScore.scored_at.desc()).first()
+        models.CreditScore.id == _latest_id(models.CreditScore, user_id)
+    ).first()
     
     # Combine all factors
     all_factors = (
@@ -438,8 +607,8 @@ async def get_improvement_plan(
     """
     # Get latest improvement plan
     plan = db.query(models.ImprovementPlan).filter(
-        models.ImprovementPlan.user_id == user_id
-    ).order_by(models.ImprovementPlan.generated_at.desc()).first()
+        models.ImprovementPlan.id == _latest_id(models.ImprovementPlan, user_id)
+    ).first()
     
     if not plan:
         raise HTTPException(
@@ -449,8 +618,8 @@ async def get_improvement_plan(
     
     # Get current score
     score = db.query(models.CreditScore).filter(
-        models.CreditScore.user_id == user_id
-    ).order_by(models.CreditScore.scored_at.desc()).first()
+        models.CreditScore.id == _latest_id(models.CreditScore, user_id)
+    ).first()
     
     target_score = min(score.trust_score + plan.estimated_score_increase, 900)
     estimated_new_score = min(score.trust_score + plan.estimated_score_increase, 900)
@@ -476,8 +645,8 @@ async def get_roadmap(
     """
     # Get improvement plan
     plan = db.query(models.ImprovementPlan).filter(
-        models.ImprovementPlan.user_id == user_id
-    ).order_by(models.ImprovementPlan.generated_at.desc()).first()
+        models.ImprovementPlan.id == _latest_id(models.ImprovementPlan, user_id)
+    ).first()
     
     if not plan:
         raise HTTPException(
@@ -501,6 +670,86 @@ async def get_roadmap(
     )
 
 
+def _rule_results(behavioral: models.BehavioralData) -> List[dict]:
+    """Rule evaluation of a stored behavioral record"""
+    data = {rule['field']: getattr(behavioral, rule['field']) or 0 for rule in ScoringEngine.RULES.values()}
+    return scoring_engine.calculate_score(data)['rule_results']
+
+
+@router.get("/counterfactual/{user_id}", response_model=schemas.CounterfactualResponse)
+async def get_counterfactual_plans(
+    user_id: str,
+    target_band: str = Query("Low", description="Moderate or Low"),
+    top_k: int = Query(3, ge=1, le=10),
+    db: Session = Depends(get_db)
+):
+    """
+    Least-effort rule upgrades that move the user into a target risk band
+    
+    - Optimal plan and the next cheapest alternatives
+    - Effort in months per change (time-to-achieve)
+    - Fixed point gains from the rule tables
+    """
+    behavioral = db.query(models.BehavioralData).filter(
+        models.BehavioralData.id == _latest_id(models.BehavioralData, user_id)
+    ).first()
+    
+    if not behavioral:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No behavioral data found. Please calculate score first."
+        )
+    
+    try:
+        # CPU-bound search: keep it off the event loop
+        result = await run_in_threadpool(
+            CounterfactualSolver.solve, _rule_results(behavioral), target_band, top_k
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    
+    return schemas.CounterfactualResponse(user_id=user_id, **result)
+
+
+@router.post("/counterfactual/portfolio", response_model=schemas.CounterfactualPortfolioResponse)
+async def get_portfolio_counterfactual_plans(
+    request: schemas.CounterfactualPortfolioRequest,
+    current_user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Least-effort plans for a portfolio of applicants
+    
+    Latest behavioral records are read in one query; applicants sharing
+    the same rule levels and time gaps are solved once.
+    """
+    if request.target_band not in CounterfactualSolver.TARGET_BANDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown target band: {request.target_band}"
+        )
+    
+    latest = select(func.max(models.BehavioralData.id)).where(
+        models.BehavioralData.user_id.in_(request.user_ids)
+    ).group_by(models.BehavioralData.user_id)
+    records = db.query(models.BehavioralData).filter(models.BehavioralData.id.in_(latest)).all()
+    
+    portfolio = {record.user_id: _rule_results(record) for record in records}
+    # CPU-bound (milliseconds per distinct applicant): keep it off the event loop
+    solved = await run_in_threadpool(
+        CounterfactualSolver.solve_portfolio, portfolio, request.target_band, request.top_k
+    )
+    
+    return schemas.CounterfactualPortfolioResponse(
+        target_band=request.target_band,
+        results=[
+            schemas.CounterfactualResponse(user_id=user_id, **solved[user_id])
+            for user_id in request.user_ids if user_id in solved
+        ],
+        missing=[user_id for user_id in request.user_ids if user_id not in solved]
+    )
+
+
 @router.get("/lender-view/{user_id}", response_model=schemas.LenderViewResponse)
 async def get_lender_view(
     user_id: str,
@@ -514,21 +763,31 @@ async def get_lender_view(
     - Behavioral metrics
     - Human-in-the-loop required
     """
-    # Get user
-    user = db.query(models.User).filter(
+    # Get user with latest score, explanation and behavioral data in one query
+    row = db.query(
+        models.User,
+        models.CreditScore,
+        models.Explanation,
+        models.BehavioralData
+    ).select_from(
+        models.User
+    ).outerjoin(
+        models.CreditScore, models.CreditScore.id == _latest_id(models.CreditScore, user_id)
+    ).outerjoin(
+        models.Explanation, models.Explanation.id == _latest_id(models.Explanation, user_id)
+    ).outerjoin(
+        models.BehavioralData, models.BehavioralData.id == _latest_id(models.BehavioralData, user_id)
+    ).filter(
         models.User.user_id == user_id
     ).first()
     
-    if not user:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
     
-    # Get latest score
-    score = db.query(models.CreditScore).filter(
-        models.CreditScore.user_id == user_id
-    ).order_by(models.CreditScore.scored_at.desc()).first()
+    user, score, explanation, behavioral = row
     
     if not score:
         raise HTTPException(
@@ -536,16 +795,6 @@ async def get_lender_view(
             detail="No score found for user"
         )
     
-    # Get explanation
-    explanation = db.query(models.Explanation).filter(
-        models.Explanation.user_id == user_id
-    ).order_by(models.Explanation.created_at.desc()).first()
-    
-    # Get behavioral data
-    behavioral = db.query(models.BehavioralData).filter(
-        models.BehavioralData.user_id == user_id
-    ).order_by(models.BehavioralData.created_at.desc()).first()
-    
     # Generate assessment classification (advisory only)
     if score.trust_score >= 700:
         assessment_class = "Low Risk"
@@ -557,6 +806,9 @@ async def get_lender_view(
         assessment_class = "High Risk"
         ai_rec_text = "High Risk - Proceed with Caution"
     
+    # Population percentile (O(log n) Fenwick lookup, no query)
+    rank = score_distribution.rank(score.trust_score) or {}
+    
     # Top signals
     positive_factors = explanation.positive_factors if explanation else []
     negative_factors = explanation.negative_factors if explanation else []
@@ -588,6 +840,9 @@ async def get_lender_view(
         name=user.name,
         trust_score=score.trust_score,
         risk_level=score.risk_level,
+        population_percentile=rank.get('percentile'),
+        population_top_percent=rank.get('top_percent'),
+        population_size=rank.get('population'),
         assessment_classification=assessment_class,
         assessment_strength=score.assessment_strength,
         rule_match_level=score.rule_match_level,
@@ -619,8 +874,8 @@ async def submit_lender_decision(
     """
     # Get latest score for assessment classification
     score = db.query(models.CreditScore).filter(
-        models.CreditScore.user_id == decision.user_id
-    ).order_by(models.CreditScore.scored_at.desc()).first()
+        models.CreditScore.id == _latest_id(models.CreditScore, decision.user_id)
+    ).first()
     
     if not score:
         raise HTTPException(
@@ -660,3 +915,34 @@ async def submit_lender_decision(
         message="Decision recorded successfully. Audit trail created.",
         recorded_at=decision_record.decided_at
     )
+
+
+# ============= DRIFT MONITORING =============
+
+@router.get("/drift", response_model=schemas.DriftReportResponse)
+async def get_drift_report():
+    """
+    Input drift of assessments since the reference snapshot
+    
+    - PSI and KS per behavioral field
+    - PSI of each rule's level distribution
+    - Status: stable, moderate or significant (worst entry overall)
+    
+    Public like /metrics: the report holds aggregate statistics only, no
+    per-applicant values.
+    """
+    return schemas.DriftReportResponse(**drift_monitor.report())
+
+
+@router.post("/drift/reference", response_model=schemas.DriftReportResponse)
+async def freeze_drift_reference(current_user: dict = Depends(get_current_operator)):
+    """
+    Make the assessments seen so far the drift reference
+    
+    Operators only (OPERATOR_USER_IDS). The snapshot is saved to
+    DRIFT_REFERENCE_PATH (loaded again at startup) and a new comparison
+    window starts.
+    """
+    snapshot = drift_monitor.freeze_reference(settings.DRIFT_REFERENCE_PATH)
+    logger.info(f"Drift reference frozen by {current_user.get('user_id')} from {snapshot['n']} assessments")
+    return schemas.DriftReportResponse(**drift_monitor.report())
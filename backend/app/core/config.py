@@ -28,6 +28,34 @@ class Settings(BaseSettings):
     MIN_SCORE: int = 420  # Realistic minimum for demo
     MAX_SCORE: int = 860  # Realistic maximum for demo
     
+    # Rate limiting (disable only for load testing)
+    RATE_LIMIT_ENABLED: bool = True
+    
+    # Consent cache
+    CONSENT_CACHE_TTL_SECONDS: int = 300
+    CONSENT_CACHE_MAX_ENTRIES: int = 100000
+    
+    # Logging
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "text"  # text or json
+    LOG_ASYNC: bool = True  # format and mask on a background thread
+    LOG_ACCESS_SAMPLE_RATE: float = 1.0  # fraction of per-request INFO lines kept
+    
+    # Tracing (sample rate 0 disables span export; trace IDs are always logged)
+    TRACE_SAMPLE_RATE: float = 0.0
+    TRACE_EXPORTER: str = "jsonl"  # jsonl, otlp or none
+    TRACE_EXPORT_PATH: str = "logs/traces.jsonl"
+    TRACE_OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"
+    
+    # Log the duration of each startup step (python -m app.core.startup_profile
+    # also breaks down import time per module)
+    PROFILE_STARTUP: bool = False
+    
+    # Query diagnostics (per-request checks run in development/test only)
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0
+    QUERY_COUNT_WARN_THRESHOLD: int = 10
+    REPEATED_QUERY_WARN_THRESHOLD: int = 3
+    
     # Environment
     ENVIRONMENT: str = "development"
     
@@ -46,6 +74,62 @@ class Settings(BaseSettings):
     SCALER_PATH: str = "models/feature_scaler.pkl"
     EXPLAINER_PATH: str = "models/shap_explainer.pkl"
     
+    # Model registry: versioned artifacts plus an ACTIVE pointer, polled by
+    # every worker (0 disables polling; the version is read at startup only)
+    MODEL_REGISTRY_PATH: str = "models/registry"
+    MODEL_REGISTRY_POLL_SECONDS: float = 5.0
+    
+    # Model backend for newly trained models: "random_forest" or
+    # "hist_gradient_boosting" (loaded artifacts keep their own backend)
+    MODEL_BACKEND: str = "random_forest"
+    
+    # Model explanations: "path" (fast per-node attribution) or "shap" (exact TreeExplainer)
+    ML_ATTRIBUTION_METHOD: str = "path"
+    
+    # Inference micro-batching: concurrent scoring requests are collected for
+    # up to ML_BATCH_MAX_WAIT_MS or ML_BATCH_MAX_SIZE rows and run as one batch.
+    # Executor: "inline" (event loop), "thread" or "process" (own GIL per worker)
+    ML_BATCH_MAX_SIZE: int = 64
+    ML_BATCH_MAX_WAIT_MS: float = 2.0
+    ML_BATCH_EXECUTOR: str = "thread"
+    ML_BATCH_WORKERS: int = 1
+    
+    # Hybrid scoring (/score/hybrid): the model score is calibrated onto the
+    # rule scale (scale * score + offset; defaults map 300-900 onto 420-860)
+    # and blended with weight HYBRID_MODEL_WEIGHT. If the model has not
+    # answered within HYBRID_MODEL_DEADLINE_MS the response is rule-only.
+    HYBRID_MODEL_WEIGHT: float = 0.3
+    HYBRID_MODEL_SCALE: float = 0.7333
+    HYBRID_MODEL_OFFSET: float = 200.0
+    HYBRID_MODEL_DEADLINE_MS: float = 25.0
+    
+    # Input drift monitoring: every assessment updates running statistics that
+    # GET /drift compares with the reference snapshot stored at this path
+    # (frozen from live traffic with POST /drift/reference). Fewer than
+    # DRIFT_MIN_SAMPLES assessments in the window report insufficient_data.
+    DRIFT_REFERENCE_PATH: str = "models/drift_reference.json"
+    DRIFT_MIN_SAMPLES: int = 100
+    
+    # Operators: user_ids allowed to run maintenance endpoints such as
+    # POST /drift/reference (empty: nobody, the endpoints answer 403)
+    OPERATOR_USER_IDS: list = []
+    
+    # Population percentile of trust scores (lender view): synced from
+    # credit_scores every SCORE_PERCENTILE_SYNC_SECONDS and saved to
+    # SCORE_PERCENTILE_PATH every SCORE_PERCENTILE_SAVE_SECONDS (empty path:
+    # never saved, rebuilt from the table at every start)
+    SCORE_PERCENTILE_PATH: str = "models/score_distribution.json"
+    SCORE_PERCENTILE_SYNC_SECONDS: float = 5.0
+    SCORE_PERCENTILE_SAVE_SECONDS: float = 300.0
+    
+    # Peer comparison per rule (explanations): ranks against applicants in
+    # the same PEER_COHORT_KEY band (tenure_band, income_stability_band or
+    # empty for all applicants) once the band has PEER_MIN_COHORT_SIZE
+    # values; warmed from the latest PEER_WARMUP_ROWS behavioral records
+    PEER_COHORT_KEY: str = "tenure_band"
+    PEER_MIN_COHORT_SIZE: int = 50
+    PEER_WARMUP_ROWS: int = 20000
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
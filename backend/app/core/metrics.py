@@ -0,0 +1,342 @@
+"""
+Prometheus-compatible metrics
+
+Metric updates happen on the request hot path, so observations never take
+a lock: each thread writes to its own shard and shards are only summed when
+/metrics is scraped. Locks are taken only when a new label set or a new
+thread shard is first created.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .tracing import tracer
+
+
+DEFAULT_LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 4, 5, 6, 8, 10, 15, 20, 50)
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+
+
+class ThreadShards:
+    """
+    Per-thread storage for lock-free accumulation
+
+    Each thread gets its own list from factory(); readers merge all shards.
+    """
+
+    def __init__(self, factory: Callable[[], list]):
+        self._factory = factory
+        self._shards: Dict[int, list] = {}
+        self._lock = threading.Lock()
+
+    def local(self) -> list:
+        """Shard owned by the calling thread"""
+        ident = threading.get_ident()
+        shard = self._shards.get(ident)
+        if shard is None:
+            with self._lock:
+                shard = self._shards.setdefault(ident, self._factory())
+        return shard
+
+    def all(self) -> List[list]:
+        """Snapshot of all shards"""
+        return list(self._shards.values())
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Base class for labelled metrics"""
+
+    type_name = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values):
+        """Child metric for a label set"""
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def collect(self) -> List[str]:
+        """Prometheus text exposition lines"""
+        lines = [
+            f'# HELP {self.name} {self.documentation}',
+            f'# TYPE {self.name} {self.type_name}'
+        ]
+        for key, child in sorted(self._children.items()):
+            lines.extend(child.collect(self.name, self.labelnames, key))
+        return lines
+
+
+class _CounterChild:
+    __slots__ = ('_shards',)
+
+    def __init__(self):
+        self._shards = ThreadShards(lambda: [0.0])
+
+    def inc(self, amount: float = 1.0):
+        self._shards.local()[0] += amount
+
+    @property
+    def value(self) -> float:
+        return sum(shard[0] for shard in self._shards.all())
+
+    def collect(self, name, labelnames, key):
+        return [f'{name}{_format_labels(labelnames, key)} {_format_value(self.value)}']
+
+
+class Counter(_Metric):
+    """Monotonic counter"""
+
+    type_name = 'counter'
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        """Increment the unlabelled counter"""
+        self.labels().inc(amount)
+
+
+class _HistogramChild:
+    __slots__ = ('_buckets', '_shards')
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self._buckets = buckets
+        # Layout: one count per bucket (+Inf last), then sum
+        size = len(buckets) + 1
+        self._shards = ThreadShards(lambda: [0] * size + [0.0])
+
+    def observe(self, value: float):
+        shard = self._shards.local()
+        shard[bisect_left(self._buckets, value)] += 1
+        shard[-1] += value
+
+    def snapshot(self) -> Tuple[List[int], float]:
+        """Per-bucket (non-cumulative) counts and the sum of observations"""
+        counts = [0] * (len(self._buckets) + 1)
+        total = 0.0
+        for shard in self._shards.all():
+            for i in range(len(counts)):
+                counts[i] += shard[i]
+            total += shard[-1]
+        return counts, total
+
+    def collect(self, name, labelnames, key):
+        counts, total = self.snapshot()
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self._buckets + (float('inf'),), counts):
+            cumulative += count
+            le = f'le="{_format_value(bound)}"'
+            lines.append(f'{name}_bucket{_format_labels(labelnames, key, le)} {cumulative}')
+        labels = _format_labels(labelnames, key)
+        lines.append(f'{name}_sum{labels} {_format_value(total)}')
+        lines.append(f'{name}_count{labels} {cumulative}')
+        return lines
+
+
+class Histogram(_Metric):
+    """Fixed-bucket histogram"""
+
+    type_name = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        """Observe a value on the unlabelled histogram"""
+        self.labels().observe(value)
+
+
+class CallbackGauge(_Metric):
+    """Gauge whose values are computed at scrape time"""
+
+    type_name = 'gauge'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str],
+                 callback: Callable[[], Dict[Tuple[str, ...], float]]):
+        super().__init__(name, documentation, labelnames)
+        self._callback = callback
+
+    def collect(self) -> List[str]:
+        lines = [
+            f'# HELP {self.name} {self.documentation}',
+            f'# TYPE {self.name} {self.type_name}'
+        ]
+        for key, value in sorted(self._callback().items()):
+            lines.append(f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}')
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together at /metrics"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric already registered: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def gauge_callback(self, name: str, documentation: str, labelnames: Sequence[str],
+                       callback: Callable[[], Dict[Tuple[str, ...], float]]) -> CallbackGauge:
+        return self.register(CallbackGauge(name, documentation, labelnames, callback))
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Render all metrics in Prometheus text format (version 0.0.4)"""
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.collect())
+        return '\n'.join(lines) + '\n'
+
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+metrics = MetricsRegistry()
+
+REQUEST_LATENCY = metrics.histogram(
+    'nexis_http_request_duration_seconds',
+    'HTTP request latency by route template',
+    ['method', 'route', 'status']
+)
+
+STAGE_LATENCY = metrics.histogram(
+    'nexis_stage_duration_seconds',
+    'Latency of engine stages inside an endpoint',
+    ['endpoint', 'stage']
+)
+
+DB_QUERIES_PER_REQUEST = metrics.histogram(
+    'nexis_db_queries_per_request',
+    'Number of SQL statements issued per request',
+    ['route'],
+    buckets=QUERY_COUNT_BUCKETS
+)
+
+INFERENCE_BATCH_SIZE = metrics.histogram(
+    'nexis_inference_batch_size',
+    'Rows per micro-batch run by the inference server',
+    ['executor'],
+    buckets=BATCH_SIZE_BUCKETS
+)
+
+INFERENCE_QUEUE_WAIT = metrics.histogram(
+    'nexis_inference_queue_wait_seconds',
+    'Time a scoring request waits before its micro-batch starts',
+    ['executor']
+)
+
+INFERENCE_BATCH_LATENCY = metrics.histogram(
+    'nexis_inference_batch_duration_seconds',
+    'Model predict and explain time per micro-batch',
+    ['executor']
+)
+
+
+HYBRID_FALLBACKS = metrics.counter(
+    'nexis_hybrid_fallbacks_total',
+    'Hybrid scores answered rule-only, by reason',
+    ['reason']
+)
+
+
+_cache_stats: Dict[str, Callable[[], Dict]] = {}
+
+
+def register_cache(name: str, stats: Callable[[], Dict]):
+    """
+    Expose hit/miss counters of an in-process cache
+
+    Args:
+        name: Cache label, e.g. "consent"
+        stats: Callable returning a dict with 'hits', 'misses' and 'hit_ratio'
+    """
+    _cache_stats[name] = stats
+
+
+def _cache_values(field: str) -> Callable[[], Dict[Tuple[str, ...], float]]:
+    return lambda: {(name,): stats()[field] for name, stats in list(_cache_stats.items())}
+
+
+metrics.gauge_callback('nexis_cache_hits', 'Cache hits since start', ['cache'], _cache_values('hits'))
+metrics.gauge_callback('nexis_cache_misses', 'Cache misses since start', ['cache'], _cache_values('misses'))
+metrics.gauge_callback('nexis_cache_hit_ratio', 'Cache hit ratio since start', ['cache'], _cache_values('hit_ratio'))
+
+
+@contextmanager
+def stage_timer(endpoint: str, stage: str):
+    """
+    Time an engine stage
+
+    The stage is also traced as a child span of the current request.
+
+    Usage:
+        with stage_timer("score", "calculate_score"):
+            ...
+    """
+    child = STAGE_LATENCY.labels(endpoint, stage)
+    start = time.perf_counter()
+    try:
+        with tracer.span(f'{endpoint}.{stage}'):
+            yield
+    finally:
+        child.observe(time.perf_counter() - start)
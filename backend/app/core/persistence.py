@@ -0,0 +1,32 @@
+"""
+Atomic JSON files: model registry manifests and pointer, analytics snapshots
+"""
+import json
+import os
+import uuid
+from typing import Dict, Optional
+
+
+def write_json_atomic(path: str, data: Dict, **dump_kwargs):
+    """
+    Write data as JSON; readers see the old or the new file, never a partial one
+
+    dump_kwargs are passed to json.dump (e.g. indent for human-read files).
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, **dump_kwargs)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def read_json(path: str) -> Optional[Dict]:
+    """Snapshot at path, or None if there is none"""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
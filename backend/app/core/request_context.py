@@ -0,0 +1,61 @@
+"""
+Per-request context shared by middleware, database hooks and engine stages
+"""
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+
+class RequestContext:
+    """
+    Mutable per-request state
+
+    The HTTP middleware binds one instance per request. Code running inside
+    the request (route bodies, SQLAlchemy event hooks, thread-pool
+    dependencies) sees the same object through the context variable and
+    updates it in place.
+    """
+
+    __slots__ = ('method', 'path', 'scope', 'query_count', 'trace_id', 'statement_shapes')
+
+    def __init__(self, method: str = '', path: str = '', scope: Optional[Dict] = None,
+                 trace_id: str = '-', track_statements: bool = False):
+        self.method = method
+        self.path = path
+        self.scope = scope
+        self.query_count = 0
+        self.trace_id = trace_id
+        # Statement shape -> count, only tracked when query diagnostics are on
+        self.statement_shapes: Optional[Dict[str, int]] = {} if track_statements else None
+
+    @property
+    def route(self) -> str:
+        """Route template once routing has happened, e.g. /api/v1/lender-view/{user_id}"""
+        return route_template(self.scope) if self.scope is not None else self.path
+
+
+_current_request: ContextVar[Optional[RequestContext]] = ContextVar(
+    'nexis_request_context', default=None
+)
+
+
+def route_template(scope: Dict) -> str:
+    """Resolve the matched route template for an ASGI scope"""
+    route = scope.get('route')
+    if route is not None and getattr(route, 'path', None):
+        return route.path
+    return 'unmatched'
+
+
+def get_request_context() -> Optional[RequestContext]:
+    """Current request context, or None outside a request"""
+    return _current_request.get()
+
+
+def bind_request_context(context: RequestContext):
+    """Bind a request context; returns a token for unbind_request_context"""
+    return _current_request.set(context)
+
+
+def unbind_request_context(token):
+    """Restore the previous request context"""
+    _current_request.reset(token)
@@ -70,3 +70,16 @@ async def get_current_user(
         )
     
     return {"user_id": user_id, "email": payload.get("email")}
+
+
+async def get_current_operator(
+    current_user: dict = Depends(get_current_user)
+):
+    """Get current user if listed in OPERATOR_USER_IDS"""
+    if current_user["user_id"] not in settings.OPERATOR_USER_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Operator access required"
+        )
+    
+    return current_user
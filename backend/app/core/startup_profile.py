@@ -0,0 +1,148 @@
+"""
+Startup profiling
+
+Worker boot time is import time plus the lifespan steps (table creation,
+model load and warmup). Lifespan steps are timed with startup_step() on
+every start and logged when PROFILE_STARTUP is set. Import time per
+module is measured in a fresh interpreter with python -X importtime:
+
+    python -m app.core.startup_profile [--module app.main] [--top 15] [--skip-lifespan]
+
+The heavy ML dependencies (HEAVY_MODULES) are imported on first ML use or
+at model warmup, never by importing app.main.
+"""
+import asyncio
+import logging
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, List, NamedTuple, Tuple
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+HEAVY_MODULES = ('pandas', 'sklearn', 'shap', 'joblib', 'scipy')
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# (step, seconds) for the lifespan steps of this process, in order
+STARTUP_STEPS: List[Tuple[str, float]] = []
+
+
+@contextmanager
+def startup_step(name: str):
+    """Time one lifespan step"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        STARTUP_STEPS.append((name, elapsed))
+        if settings.PROFILE_STARTUP:
+            logger.info(f"Startup step {name}: {elapsed * 1000:.1f} ms")
+
+
+class ImportTiming(NamedTuple):
+    """One line of python -X importtime output"""
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(output: str) -> List[ImportTiming]:
+    """
+    Parse python -X importtime output (stderr)
+
+    Lines look like "import time:  <self> | <cumulative> | <indent><module>",
+    with two spaces of indent per nesting level.
+    """
+    timings = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # header line
+        name = parts[2][1:]
+        timings.append(ImportTiming(
+            module=name.strip(),
+            self_us=int(parts[0]),
+            cumulative_us=int(parts[1]),
+            depth=(len(name) - len(name.lstrip(' '))) // 2
+        ))
+    return timings
+
+
+def time_by_package(timings: List[ImportTiming]) -> Dict[str, int]:
+    """Self import time (us) summed per top-level package, largest first"""
+    totals = defaultdict(int)
+    for timing in timings:
+        totals[timing.module.split('.')[0]] += timing.self_us
+    return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+
+def measure_imports(module: str = 'app.main') -> Tuple[float, List[ImportTiming]]:
+    """
+    Import a module in a fresh interpreter with -X importtime
+
+    Returns:
+        (wall-clock import seconds, per-module timings)
+    """
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=BACKEND_DIR, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+    return float(result.stdout.strip().splitlines()[-1]), parse_importtime(result.stderr)
+
+
+async def profile_lifespan() -> List[Tuple[str, float]]:
+    """Run the app's startup and shutdown once and return the startup steps"""
+    from ..main import app
+
+    async with app.router.lifespan_context(app):
+        steps = list(STARTUP_STEPS)
+    return steps
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Startup profiler')
+    parser.add_argument('--module', default='app.main', help='module to import')
+    parser.add_argument('--top', type=int, default=15, help='packages and modules to list')
+    parser.add_argument('--skip-lifespan', action='store_true', help='only measure imports')
+    args = parser.parse_args()
+
+    wall, timings = measure_imports(args.module)
+    print(f"Import {args.module}: {wall * 1000:.1f} ms wall, {len(timings)} modules")
+
+    print(f"\nSelf import time by package (top {args.top}):")
+    for package, self_us in list(time_by_package(timings).items())[:args.top]:
+        print(f"   {package:<28} {self_us / 1000:8.1f} ms")
+
+    print(f"\nSlowest modules by cumulative time (top {args.top}):")
+    for timing in sorted(timings, key=lambda t: t.cumulative_us, reverse=True)[:args.top]:
+        print(f"   {timing.module:<40} {timing.cumulative_us / 1000:8.1f} ms")
+
+    imported = {timing.module.split('.')[0] for timing in timings}
+    heavy = [name for name in HEAVY_MODULES if name in imported]
+    print(f"\nHeavy ML modules imported: {', '.join(heavy) if heavy else 'none'}")
+
+    if not args.skip_lifespan:
+        steps = asyncio.run(profile_lifespan())
+        print("\nLifespan steps:")
+        for step, seconds in steps:
+            print(f"   {step:<28} {seconds * 1000:8.1f} ms")
+        print(f"   {'total':<28} {sum(seconds for _, seconds in steps) * 1000:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,403 @@
+"""
+Lightweight in-process tracing
+
+Spans are opened per request, per SQL statement (from the engine hooks in
+app/db/database.py) and per engine stage (via core.metrics.stage_timer).
+Sampling is decided once per request; unsampled requests still get a trace
+ID so log lines can be correlated, but create no span objects.
+
+Finished spans are handed to a background thread and exported either to a
+local JSONL file or to an OTLP/HTTP (JSON encoding) endpoint. A minimal
+stand-in collector is included for local use:
+
+    python -m app.core.tracing --port 4318 --output logs/collected_traces.jsonl
+"""
+import json
+import os
+import queue
+import random
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from .config import settings
+
+
+class Span:
+    """A timed operation within a trace"""
+
+    __slots__ = (
+        'trace_id', 'span_id', 'parent_id', 'name', 'kind',
+        'start_ns', 'end_ns', 'attributes', 'error'
+    )
+
+    def __init__(self, trace_id: str, name: str, parent_id: Optional[str] = None,
+                 kind: str = 'internal', attributes: Optional[Dict] = None):
+        self.trace_id = trace_id
+        self.span_id = new_span_id()
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.attributes = attributes or {}
+        self.error = None
+
+    def set_attribute(self, key: str, value):
+        self.attributes[key] = value
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        if self.end_ns is None:
+            return None
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def to_dict(self) -> Dict:
+        return {
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'name': self.name,
+            'kind': self.kind,
+            'start_ns': self.start_ns,
+            'end_ns': self.end_ns,
+            'duration_ms': self.duration_ms,
+            'attributes': self.attributes,
+            'error': self.error
+        }
+
+
+def new_trace_id() -> str:
+    return f'{random.getrandbits(128):032x}'
+
+
+def new_span_id() -> str:
+    return f'{random.getrandbits(64):016x}'
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[Tuple[str, str, bool]]:
+    """
+    Parse a W3C traceparent header
+
+    Returns:
+        (trace_id, parent_span_id, sampled) or None if absent/invalid
+    """
+    if not header:
+        return None
+    parts = header.strip().split('-')
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        flags = int(parts[3], 16)
+        int(parts[1], 16)
+        int(parts[2], 16)
+    except ValueError:
+        return None
+    if parts[1] == '0' * 32:
+        return None
+    return parts[1], parts[2], bool(flags & 0x01)
+
+
+# ============= EXPORTERS =============
+
+class JsonlSpanExporter:
+    """Append spans to a local JSON-lines file"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def export(self, spans: List[Span]):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for span in spans:
+                f.write(json.dumps(span.to_dict(), default=str) + '\n')
+
+
+class OTLPJsonSpanExporter:
+    """Post spans to an OTLP/HTTP collector using the JSON encoding"""
+
+    SPAN_KINDS = {'internal': 1, 'server': 2, 'client': 3}
+
+    def __init__(self, endpoint: str, service_name: str = 'nexis-backend', timeout: float = 2.0):
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.timeout = timeout
+
+    def export(self, spans: List[Span]):
+        body = json.dumps(self.encode(spans)).encode('utf-8')
+        request = urllib.request.Request(
+            self.endpoint, data=body, headers={'Content-Type': 'application/json'}
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout):
+            pass
+
+    def encode(self, spans: List[Span]) -> Dict:
+        return {
+            'resourceSpans': [{
+                'resource': {'attributes': [_otlp_attribute('service.name', self.service_name)]},
+                'scopeSpans': [{
+                    'scope': {'name': 'nexis'},
+                    'spans': [self._encode_span(span) for span in spans]
+                }]
+            }]
+        }
+
+    def _encode_span(self, span: Span) -> Dict:
+        encoded = {
+            'traceId': span.trace_id,
+            'spanId': span.span_id,
+            'name': span.name,
+            'kind': self.SPAN_KINDS.get(span.kind, 1),
+            'startTimeUnixNano': str(span.start_ns),
+            'endTimeUnixNano': str(span.end_ns),
+            'attributes': [_otlp_attribute(k, v) for k, v in span.attributes.items()],
+            'status': {'code': 2, 'message': span.error} if span.error else {'code': 0}
+        }
+        if span.parent_id:
+            encoded['parentSpanId'] = span.parent_id
+        return encoded
+
+
+def _otlp_attribute(key: str, value) -> Dict:
+    if isinstance(value, bool):
+        return {'key': key, 'value': {'boolValue': value}}
+    if isinstance(value, int):
+        return {'key': key, 'value': {'intValue': str(value)}}
+    if isinstance(value, float):
+        return {'key': key, 'value': {'doubleValue': value}}
+    return {'key': key, 'value': {'stringValue': str(value)}}
+
+
+class BatchSpanProcessor:
+    """Export finished spans from a background thread"""
+
+    def __init__(self, exporter, max_batch_size: int = 512, flush_interval: float = 1.0,
+                 max_queue_size: int = 10000):
+        self.exporter = exporter
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self.dropped = 0
+
+    def on_end(self, span: Span):
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name='nexis-span-exporter', daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._export_batch(timeout=self.flush_interval)
+        while not self._queue.empty():
+            self._export_batch(timeout=0)
+
+    def _export_batch(self, timeout: float):
+        batch = []
+        try:
+            batch.append(self._queue.get(timeout=timeout) if timeout else self._queue.get_nowait())
+            while len(batch) < self.max_batch_size:
+                batch.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        if batch:
+            try:
+                self.exporter.export(batch)
+            except Exception:
+                # Tracing must never break the service
+                self.dropped += len(batch)
+
+    def shutdown(self, timeout: float = 5.0):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+# ============= TRACER =============
+
+_current_span: ContextVar[Optional[Span]] = ContextVar('nexis_current_span', default=None)
+
+
+class Tracer:
+    """Creates spans and hands finished ones to the processor"""
+
+    def __init__(self, sample_rate: float = 0.0, processor: Optional[BatchSpanProcessor] = None):
+        self.sample_rate = sample_rate
+        self.processor = processor
+
+    @property
+    def enabled(self) -> bool:
+        return self.processor is not None and self.sample_rate > 0
+
+    def start_request(self, name: str, traceparent: Optional[str] = None,
+                      attributes: Optional[Dict] = None) -> Tuple[str, Optional[Span]]:
+        """
+        Start the root span for an incoming request
+
+        An incoming traceparent header keeps the caller's trace ID and
+        sampling decision.
+
+        Returns:
+            (trace_id, span) where span is None if the request is not sampled
+        """
+        parent = parse_traceparent(traceparent)
+        if parent is not None:
+            trace_id, parent_id, sampled = parent
+        else:
+            trace_id, parent_id = new_trace_id(), None
+            sampled = self.sample_rate > 0 and random.random() < self.sample_rate
+
+        if not (sampled and self.processor is not None):
+            return trace_id, None
+        return trace_id, Span(trace_id, name, parent_id, kind='server', attributes=attributes)
+
+    def start_span(self, name: str, kind: str = 'internal',
+                   attributes: Optional[Dict] = None) -> Optional[Span]:
+        """Start a child of the current span; None when the request is not sampled"""
+        parent = _current_span.get()
+        if parent is None:
+            return None
+        return Span(parent.trace_id, name, parent.span_id, kind=kind, attributes=attributes)
+
+    def end_span(self, span: Optional[Span], error: Optional[BaseException] = None):
+        if span is None:
+            return
+        span.end_ns = time.time_ns()
+        if error is not None:
+            span.error = f'{type(error).__name__}: {error}'
+        if self.processor is not None:
+            self.processor.on_end(span)
+
+    def activate(self, span: Optional[Span]):
+        """Make span the parent of spans started in this context"""
+        return _current_span.set(span)
+
+    def deactivate(self, token):
+        _current_span.reset(token)
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        """
+        Trace a block as a child of the current span
+
+        Usage:
+            with tracer.span("score.calculate_score"):
+                ...
+        """
+        span = self.start_span(name, attributes=attributes)
+        if span is None:
+            yield None
+            return
+        token = self.activate(span)
+        try:
+            yield span
+        except BaseException as exc:
+            self.end_span(span, exc)
+            raise
+        else:
+            self.end_span(span)
+        finally:
+            self.deactivate(token)
+
+    def shutdown(self):
+        if self.processor is not None:
+            self.processor.shutdown()
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def create_tracer() -> Tracer:
+    """Build the tracer from settings"""
+    if settings.TRACE_SAMPLE_RATE <= 0 or settings.TRACE_EXPORTER == 'none':
+        return Tracer(sample_rate=0.0)
+
+    if settings.TRACE_EXPORTER == 'otlp':
+        exporter = OTLPJsonSpanExporter(settings.TRACE_OTLP_ENDPOINT)
+    elif settings.TRACE_EXPORTER == 'jsonl':
+        exporter = JsonlSpanExporter(settings.TRACE_EXPORT_PATH)
+    else:
+        raise ValueError(f"Unknown TRACE_EXPORTER: {settings.TRACE_EXPORTER}")
+
+    return Tracer(sample_rate=settings.TRACE_SAMPLE_RATE, processor=BatchSpanProcessor(exporter))
+
+
+tracer = create_tracer()
+
+
+# ============= STAND-IN COLLECTOR =============
+
+def run_collector(port: int = 4318, output: str = 'logs/collected_traces.jsonl'):
+    """
+    Minimal OTLP/HTTP (JSON) collector stand-in
+
+    Accepts POST /v1/traces and appends each span as a JSON line.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    exporter = JsonlSpanExporter(output)
+    write_lock = threading.Lock()
+
+    class CollectorHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            if self.path != '/v1/traces':
+                self.send_response(404)
+                self.end_headers()
+                return
+            length = int(self.headers.get('Content-Length', 0))
+            payload = json.loads(self.rfile.read(length) or b'{}')
+            spans = [
+                span
+                for resource in payload.get('resourceSpans', [])
+                for scope in resource.get('scopeSpans', [])
+                for span in scope.get('spans', [])
+            ]
+            with write_lock:
+                with open(exporter.path, 'a', encoding='utf-8') as f:
+                    for span in spans:
+                        f.write(json.dumps(span) + '\n')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.end_headers()
+            self.wfile.write(b'{}')
+
+        def log_message(self, format, *args):
+            pass
+
+    directory = os.path.dirname(output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    server = ThreadingHTTPServer(('127.0.0.1', port), CollectorHandler)
+    print(f"Collecting OTLP traces on http://127.0.0.1:{port}/v1/traces -> {output}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='OTLP/HTTP collector stand-in')
+    parser.add_argument('--port', type=int, default=4318)
+    parser.add_argument('--output', default='logs/collected_traces.jsonl')
+    args = parser.parse_args()
+    run_collector(args.port, args.output)
@@ -1,16 +1,57 @@
 """
 Database connection and session management
 """
-from sqlalchemy import create_engine
+import time
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from ..core.config import settings
+from ..core.request_context import get_request_context
+from ..core.tracing import tracer
+from . import query_monitor
 
 engine = create_engine(
     settings.DATABASE_URL,
     connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
 )
 
+
+@event.listens_for(engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """Count SQL statements issued by the current request, open a span and start the timer"""
+    request_context = get_request_context()
+    if request_context is not None:
+        request_context.query_count += 1
+    
+    span = tracer.start_span("db.query", kind="client", attributes={
+        "db.system": conn.dialect.name,
+        "db.statement": statement,
+        "db.executemany": executemany
+    })
+    conn.info.setdefault("nexis_statements", []).append((time.perf_counter(), span))
+
+
+@event.listens_for(engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """Close the statement span and report the statement timing"""
+    pending = conn.info.get("nexis_statements")
+    if not pending:
+        return
+    start, span = pending.pop()
+    tracer.end_span(span)
+    query_monitor.on_statement(statement, time.perf_counter() - start, get_request_context())
+
+
+@event.listens_for(engine, "handle_error")
+def _handle_error(exception_context):
+    """Close the statement span of a failed statement"""
+    conn = exception_context.connection
+    pending = conn.info.get("nexis_statements") if conn is not None else None
+    if pending:
+        _, span = pending.pop()
+        tracer.end_span(span, exception_context.original_exception)
+
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
@@ -0,0 +1,183 @@
+"""
+Slow-query log and N+1 detection for the SQLAlchemy layer
+
+The engine hooks in app/db/database.py report every statement here with its
+duration. Statements over SLOW_QUERY_THRESHOLD_MS are always logged with the
+originating route. In development and test mode each request additionally
+tracks statement shapes, and requests that issue more than
+QUERY_COUNT_WARN_THRESHOLD statements or repeat one shape
+REPEATED_QUERY_WARN_THRESHOLD times are flagged.
+
+Bulk jobs (the database seeder) run inside suppress_diagnostics(), which
+skips all of the above for statements issued in that context.
+
+Tests can assert query budgets per endpoint:
+
+    with assert_max_queries(2, route="/api/v1/lender-view/{user_id}"):
+        client.get(f"/api/v1/lender-view/{user_id}")
+"""
+import logging
+import re
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, NamedTuple, Optional
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r'\s+')
+_PLACEHOLDER = r'(?:\?|%\(\w+\)s|%s|:\w+|\$\d+)'
+_PLACEHOLDER_LIST = re.compile(r'\(\s*' + _PLACEHOLDER + r'(?:\s*,\s*' + _PLACEHOLDER + r')+\s*\)')
+_LITERAL = re.compile(r"'(?:[^']|'')*'|(?<![\w$])\d+(?:\.\d+)?\b")
+
+
+def statement_shape(statement: str) -> str:
+    """
+    Normalize a statement so repeats with different parameters compare equal
+
+    Collapses whitespace, inlined literals and expanded IN lists.
+    """
+    shape = _WHITESPACE.sub(' ', statement).strip()
+    shape = _LITERAL.sub('?', shape)
+    return _PLACEHOLDER_LIST.sub('(?)', shape)
+
+
+def diagnostics_enabled() -> bool:
+    """Per-request query analysis runs in development and test mode only"""
+    return settings.ENVIRONMENT in ('development', 'test')
+
+
+class QueryRecord(NamedTuple):
+    route: str
+    statement: str
+    duration_ms: float
+
+    @property
+    def shape(self) -> str:
+        return statement_shape(self.statement)
+
+
+class QueryRecorder:
+    """Collects statements issued while active (see record_queries)"""
+
+    def __init__(self):
+        self.records: List[QueryRecord] = []
+
+    def for_route(self, route: Optional[str] = None) -> List[QueryRecord]:
+        if route is None:
+            return list(self.records)
+        return [r for r in self.records if r.route == route]
+
+    def count(self, route: Optional[str] = None) -> int:
+        """Number of statements, optionally restricted to one route template"""
+        return len(self.for_route(route))
+
+    def repeated_shapes(self, threshold: int = 2, route: Optional[str] = None) -> Dict[str, int]:
+        """Statement shapes issued at least threshold times"""
+        counts = Counter(r.shape for r in self.for_route(route))
+        return {shape: n for shape, n in counts.items() if n >= threshold}
+
+    def report(self, route: Optional[str] = None) -> str:
+        return '\n'.join(
+            f'  [{r.duration_ms:.2f} ms] {r.route}: {_WHITESPACE.sub(" ", r.statement)}'
+            for r in self.for_route(route)
+        )
+
+
+_active_recorders: List[QueryRecorder] = []
+_suppressed: ContextVar[bool] = ContextVar('query_diagnostics_suppressed', default=False)
+
+
+@contextmanager
+def record_queries():
+    """Record every statement executed on the engine while the block runs"""
+    recorder = QueryRecorder()
+    _active_recorders.append(recorder)
+    try:
+        yield recorder
+    finally:
+        _active_recorders.remove(recorder)
+
+
+@contextmanager
+def suppress_diagnostics():
+    """Skip slow-query logging, N+1 tracking and recording while the block runs"""
+    token = _suppressed.set(True)
+    try:
+        yield
+    finally:
+        _suppressed.reset(token)
+
+
+@contextmanager
+def assert_max_queries(max_queries: int, route: Optional[str] = None):
+    """
+    Fail if the block issues more than max_queries statements
+
+    Args:
+        max_queries: Query budget
+        route: Only count statements issued by this route template
+    """
+    with record_queries() as recorder:
+        yield recorder
+    issued = recorder.count(route)
+    if issued > max_queries:
+        raise AssertionError(
+            f"Query budget exceeded for {route or 'block'}: {issued} > {max_queries}\n"
+            f"{recorder.report(route)}"
+        )
+
+
+def on_statement(statement: str, duration: float, request_context=None):
+    """
+    Called by the engine hooks after each statement
+
+    Args:
+        statement: SQL text
+        duration: Execution time in seconds
+        request_context: Current RequestContext, if any
+    """
+    if _suppressed.get():
+        return
+
+    duration_ms = duration * 1000
+    route = request_context.route if request_context is not None else 'background'
+
+    if duration_ms >= settings.SLOW_QUERY_THRESHOLD_MS:
+        logger.warning(f"Slow query ({duration_ms:.1f} ms) on {route}: {_WHITESPACE.sub(' ', statement)}")
+
+    if request_context is not None and request_context.statement_shapes is not None:
+        shape = statement_shape(statement)
+        request_context.statement_shapes[shape] = request_context.statement_shapes.get(shape, 0) + 1
+
+    if _active_recorders:
+        record = QueryRecord(route, statement, duration_ms)
+        for recorder in list(_active_recorders):
+            recorder.records.append(record)
+
+
+def check_request_queries(request_context):
+    """
+    Flag excessive or repeated statements at the end of a request
+
+    Returns:
+        List of warning messages (also logged)
+    """
+    warnings = []
+    route = request_context.route
+
+    if request_context.query_count > settings.QUERY_COUNT_WARN_THRESHOLD:
+        warnings.append(
+            f"{route} issued {request_context.query_count} queries "
+            f"(threshold {settings.QUERY_COUNT_WARN_THRESHOLD})"
+        )
+
+    for shape, count in (request_context.statement_shapes or {}).items():
+        if count >= settings.REPEATED_QUERY_WARN_THRESHOLD:
+            warnings.append(f"Possible N+1 on {route}: {count}x {shape}")
+
+    for message in warnings:
+        logger.warning(message)
+    return warnings
@@ -0,0 +1,509 @@
+"""
+Bulk synthetic database seeder for performance testing
+
+Generates users with a realistic history of behavioral snapshots and credit
+scores, plus explanations, improvement plans and lender decisions. Profiles
+are drawn column-wise with the synthetic training-data sampler, rule
+scoring is vectorized over whole chunks, and rows are built column-wise
+as tuples and written with one DBAPI executemany per table and chunk
+(COPY FROM STDIN on PostgreSQL with psycopg2). Query diagnostics (slow
+query log, statement recording) are suppressed while seeding.
+
+Explanation and plan JSON goes through the real ExplainabilityEngine and
+CompletionPathwayGenerator so the read routes see production-shaped
+payloads; by default only for each user's latest score, which is what
+those routes read.
+"""
+import csv
+import io
+import json
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.engine import Connection, Engine
+
+from ..core.config import settings
+from ..core.security import get_password_hash
+from ..ml.synthetic_data import BEHAVIORAL_FIELDS, PROFILE_WEIGHTS, sample_profiles
+from ..rules.scoring_engine import ScoringEngine
+from ..rules.explainability import ExplainabilityEngine
+from ..rules.completion_pathway import CompletionPathwayGenerator
+from . import models, query_monitor
+
+logger = logging.getLogger(__name__)
+
+SEED_PASSWORD = "SeedUser123!"
+SEED_LENDER_ID = "SEED-LENDER"
+HISTORY_INTERVAL_DAYS = 30
+
+LEVELS = ('high', 'medium', 'low', 'minimum')
+STATUSES = ('Fully Satisfied', 'Partially Satisfied', 'Partially Satisfied', 'Not Satisfied')
+DECISIONS = ('approve', 'request_more_data', 'decline')
+
+
+# ---------------------------------------------------------------------------
+# Vectorized generation
+# ---------------------------------------------------------------------------
+
+def apply_history(columns: Dict[str, np.ndarray], months_ago: np.ndarray,
+                  rng: np.random.Generator) -> Dict[str, np.ndarray]:
+    """
+    Age snapshots into the past
+
+    Duration fields shrink by the elapsed time and behavior scores are
+    slightly worse the further back a snapshot is, so each user's history
+    trends towards their latest profile.
+    """
+    n = len(months_ago)
+    drift = months_ago * 0.01 + rng.normal(0.0, 0.02, n)
+    aged = {}
+    for field, values in columns.items():
+        if field in ('utility_payment_months', 'income_stability_months'):
+            aged[field] = np.maximum(values - months_ago, 0)
+        elif field == 'account_tenure_months':
+            aged[field] = np.maximum(values - months_ago, 1)
+        elif field == 'address_stability_years':
+            aged[field] = np.maximum(values - months_ago / 12, 0.0)
+        elif field == 'monthly_transaction_count':
+            aged[field] = np.maximum(values - rng.poisson(months_ago), 0)
+        elif field == 'spending_volatility':
+            aged[field] = np.clip(values + drift, 0.0, 1.0)
+        elif field == 'avg_month_end_balance':
+            aged[field] = np.maximum(values * (1 - drift), 0.0)
+        elif field in ('savings_growth_rate', 'discretionary_income_ratio'):
+            aged[field] = values - drift / 2
+        else:
+            aged[field] = np.clip(values - drift, 0.0, 1.0)
+    return aged
+
+
+def score_columns(columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Vectorized equivalent of ScoringEngine.calculate_score and the
+    assessment strength / rule match level helpers
+
+    Returns:
+        Column arrays: level codes per rule (0=high .. 3=minimum), points,
+        trust score, risk level and rule counts
+    """
+    n = len(columns[BEHAVIORAL_FIELDS[0]])
+    rules = list(ScoringEngine.RULES.values())
+    level_codes = np.empty((n, len(rules)), dtype=np.int8)
+    points = np.empty((n, len(rules)), dtype=np.int64)
+
+    for j, rule in enumerate(rules):
+        values = columns[rule['field']]
+        thresholds = rule['thresholds']
+        if rule.get('inverse', False):
+            conditions = [values <= thresholds['high'], values <= thresholds['medium'], values <= thresholds['low']]
+        else:
+            conditions = [values >= thresholds['high'], values >= thresholds['medium'], values >= thresholds['low']]
+        level_codes[:, j] = np.select(conditions, [0, 1, 2], default=3)
+        points[:, j] = np.array([rule['points'][level] for level in LEVELS])[level_codes[:, j]]
+
+    total_points = points.sum(axis=1)
+    point_ratio = total_points / ScoringEngine.MAX_POINTS
+    trust_score = ScoringEngine.SCORE_MIN + (point_ratio * (ScoringEngine.SCORE_MAX - ScoringEngine.SCORE_MIN)).astype(np.int64)
+    trust_score = np.clip(trust_score, ScoringEngine.SCORE_MIN, ScoringEngine.SCORE_MAX)
+    risk_level = np.select([trust_score >= 700, trust_score >= 550], ['Low', 'Moderate'], default='High')
+
+    rules_satisfied = (level_codes == 0).sum(axis=1)
+    rules_partial = ((level_codes == 1) | (level_codes == 2)).sum(axis=1)
+    rules_not_met = (level_codes == 3).sum(axis=1)
+
+    documentation_months = columns['account_tenure_months']
+    provided = sum((columns[rule['field']] > 0).astype(np.int64) for rule in rules)
+    completeness = provided / len(rules)
+    assessment_strength = np.select(
+        [(documentation_months >= 18) & (completeness >= 0.95), (documentation_months >= 12) & (completeness >= 0.80)],
+        ['Strong', 'Moderate'],
+        default='Weak'
+    )
+    satisfaction_rate = rules_satisfied / len(rules)
+    rule_match_level = np.select([satisfaction_rate >= 0.80, satisfaction_rate >= 0.50], ['High', 'Medium'], default='Low')
+
+    return {
+        'level_codes': level_codes,
+        'points': points,
+        'total_points': total_points,
+        'trust_score': trust_score,
+        'risk_level': risk_level,
+        'rules_satisfied': rules_satisfied,
+        'rules_partial': rules_partial,
+        'rules_not_met': rules_not_met,
+        'assessment_strength': assessment_strength,
+        'rule_match_level': rule_match_level
+    }
+
+
+def build_rule_results(values: Dict, level_codes) -> List[Dict]:
+    """Rebuild the rule_results list calculate_score would return for one row"""
+    results = []
+    for (rule_id, rule), code in zip(ScoringEngine.RULES.items(), level_codes):
+        level = LEVELS[code]
+        user_value = values[rule['field']]
+        required_threshold = rule['thresholds']['medium']
+        if rule.get('inverse', False):
+            threshold_met = user_value <= required_threshold
+        else:
+            threshold_met = user_value >= required_threshold
+        results.append({
+            'rule_id': rule_id,
+            'rule_name': rule['name'],
+            'category': rule['category'],
+            'user_value': user_value,
+            'required_threshold': required_threshold,
+            'threshold_met': threshold_met,
+            'points_earned': rule['points'][level],
+            'max_points': rule['points']['high'],
+            'status': STATUSES[code],
+            'level': level
+        })
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Bulk writers
+# ---------------------------------------------------------------------------
+
+def _copy_value(value):
+    if value is None:
+        return None
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _placeholders(dialect, n: int) -> str:
+    if dialect.paramstyle == 'qmark':
+        return ', '.join(['?'] * n)
+    if dialect.paramstyle == 'numeric':
+        return ', '.join(f':{i + 1}' for i in range(n))
+    return ', '.join(['%s'] * n)
+
+
+def bulk_insert(conn: Connection, table, columns: Dict[str, Sequence],
+                processed_cache: Optional[Dict] = None):
+    """
+    Insert rows with COPY on psycopg2, otherwise a single DBAPI executemany
+
+    Values go through each column type's bind processor once per column
+    and are zipped into tuples, bypassing per-row parameter dictionaries.
+
+    Args:
+        conn: Open connection (inside a transaction)
+        table: SQLAlchemy Table
+        columns: Equal-length value lists per column name
+        processed_cache: Shared between calls so value lists reused across
+            columns and tables (timestamps) are converted once
+    """
+    names = list(columns)
+    if not names or not len(columns[names[0]]):
+        return
+    if conn.dialect.name == 'postgresql' and conn.dialect.driver == 'psycopg2':
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(zip(*(map(_copy_value, columns[c]) for c in names)))
+        buffer.seek(0)
+        cursor = conn.connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {table.name} ({', '.join(names)}) FROM STDIN WITH (FORMAT csv)",
+                buffer
+            )
+        finally:
+            cursor.close()
+    else:
+        if processed_cache is None:
+            processed_cache = {}
+        processed = []
+        for name in names:
+            values = columns[name]
+            impl = table.c[name].type.dialect_impl(conn.dialect)
+            key = (id(values), type(impl))
+            if key not in processed_cache:
+                processor = impl.bind_processor(conn.dialect)
+                processed_cache[key] = list(map(processor, values)) if processor else values
+            processed.append(processed_cache[key])
+        conn.exec_driver_sql(
+            f"INSERT INTO {table.name} ({', '.join(names)}) "
+            f"VALUES ({_placeholders(conn.dialect, len(names))})",
+            list(zip(*processed))
+        )
+
+
+def _next_id(conn: Connection, model) -> int:
+    return (conn.execute(select(func.max(model.id))).scalar() or 0) + 1
+
+
+def _sync_sequences(conn: Connection):
+    """Move PostgreSQL id sequences past the explicitly assigned ids"""
+    if conn.dialect.name != 'postgresql':
+        return
+    for model in (models.User, models.BehavioralData, models.CreditScore,
+                  models.Explanation, models.ImprovementPlan, models.LenderDecision):
+        table = model.__tablename__
+        conn.exec_driver_sql(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+            f"COALESCE((SELECT MAX(id) FROM {table}), 1))"
+        )
+
+
+# ---------------------------------------------------------------------------
+# Seeding
+# ---------------------------------------------------------------------------
+
+def iter_user_chunks(n_users: int, chunk_size: int) -> Iterator[int]:
+    remaining = n_users
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        yield size
+        remaining -= size
+
+
+def seed_chunk(conn: Connection, n_users: int, rng: np.random.Generator, now: datetime,
+               mean_history: float, max_history: int, decision_rate: float,
+               explain_history: bool, hashed_password: str) -> Dict[str, int]:
+    """Generate and insert one chunk of users with their full history"""
+    user_base = _next_id(conn, models.User)
+    behavioral_base = _next_id(conn, models.BehavioralData)
+    score_base = _next_id(conn, models.CreditScore)
+
+    # Per-user profile and history depth
+    labels = rng.choice(3, size=n_users, p=PROFILE_WEIGHTS)
+    depth = np.minimum(1 + rng.poisson(max(mean_history - 1, 0), n_users), max_history)
+    total = int(depth.sum())
+
+    # Expand to one row per snapshot, oldest first within each user
+    owner = np.repeat(np.arange(n_users), depth)
+    starts = np.cumsum(depth) - depth
+    position = np.arange(total) - np.repeat(starts, depth)
+    months_ago = depth[owner] - 1 - position
+    is_latest = months_ago == 0
+
+    latest = sample_profiles(labels, rng)
+    snapshots = apply_history({f: v[owner] for f, v in latest.items()}, months_ago, rng)
+    scores = score_columns(snapshots)
+
+    jitter_hours = rng.uniform(0, 24 * 7, total)
+    scored_at = [
+        now - timedelta(days=HISTORY_INTERVAL_DAYS * int(m), hours=float(h))
+        for m, h in zip(months_ago, jitter_hours)
+    ]
+    validity = timedelta(days=settings.ASSESSMENT_VALIDITY_DAYS)
+
+    # Native Python values for the drivers and JSON encoders
+    values = {f: snapshots[f].tolist() for f in BEHAVIORAL_FIELDS}
+    user_ids = [f"NEX-S{user_base + i:07X}" for i in range(n_users)]
+    row_user_ids = [user_ids[i] for i in owner.tolist()]
+
+    user_pks = list(range(user_base, user_base + n_users))
+    created_at = [scored_at[s] - timedelta(days=1) for s in starts.tolist()]
+    users = {
+        'id': user_pks,
+        'user_id': user_ids,
+        'name': [f"Seed User {pk}" for pk in user_pks],
+        'email': [f"seed{pk}@nexis.test" for pk in user_pks],
+        'phone': [None] * n_users,
+        'hashed_password': [hashed_password] * n_users,
+        'is_active': [True] * n_users,
+        'is_verified': [False] * n_users,
+        'consent_given': [True] * n_users,
+        'consent_timestamp': created_at,
+        'profile_completed': [True] * n_users,
+        'last_login': [None] * n_users,
+        'created_at': created_at,
+        'updated_at': [None] * n_users
+    }
+
+    behavioral = {
+        'id': list(range(behavioral_base, behavioral_base + total)),
+        'user_id': row_user_ids,
+        **values,
+        'data_collection_date': scored_at,
+        'created_at': scored_at
+    }
+
+    trust_scores = scores['trust_score'].tolist()
+    risk_levels = scores['risk_level'].tolist()
+    assessment_strengths = scores['assessment_strength'].tolist()
+    rule_match_levels = scores['rule_match_level'].tolist()
+    credit_scores = {
+        'id': list(range(score_base, score_base + total)),
+        'user_id': row_user_ids,
+        'trust_score': trust_scores,
+        'risk_level': risk_levels,
+        'risk_category': risk_levels,
+        'assessment_strength': assessment_strengths,
+        'rule_match_level': rule_match_levels,
+        'rules_evaluated': [len(ScoringEngine.RULES)] * total,
+        'rules_satisfied': scores['rules_satisfied'].tolist(),
+        'rules_partial': scores['rules_partial'].tolist(),
+        'rules_not_met': scores['rules_not_met'].tolist(),
+        'total_points': scores['total_points'].tolist(),
+        'max_points': [ScoringEngine.MAX_POINTS] * total,
+        'scored_at': scored_at,
+        'valid_until': [at + validity for at in scored_at]
+    }
+
+    # Explanations and plans through the real engines
+    explained_rows = list(range(total)) if explain_history else np.flatnonzero(is_latest).tolist()
+    explained_user_ids = [row_user_ids[r] for r in explained_rows]
+    explained_at = [scored_at[r] for r in explained_rows]
+    positive, neutral, negative, audit = [], [], [], []
+    recommendation_lists, score_increases = [], []
+    level_codes = scores['level_codes'].tolist()
+    for r in explained_rows:
+        row = {f: values[f][r] for f in BEHAVIORAL_FIELDS}
+        rule_results = build_rule_results(row, level_codes[r])
+        trust_score = trust_scores[r]
+
+        factors = ExplainabilityEngine.generate_factors(rule_results)
+        positive.append([f for f in factors if f['type'] == 'positive'])
+        neutral.append([f for f in factors if f['type'] == 'neutral'])
+        negative.append([f for f in factors if f['type'] == 'negative'])
+        audit.append(rule_results)
+
+        recommendations = CompletionPathwayGenerator.generate_recommendations(rule_results, trust_score)
+        estimated_new_score = CompletionPathwayGenerator.calculate_potential_score(trust_score, recommendations)
+        recommendation_lists.append(recommendations)
+        score_increases.append(estimated_new_score - trust_score)
+
+    explanation_base = _next_id(conn, models.Explanation)
+    explanations = {
+        'id': list(range(explanation_base, explanation_base + len(explained_rows))),
+        'user_id': explained_user_ids,
+        'score_id': [score_base + r for r in explained_rows],
+        'positive_factors': positive,
+        'neutral_factors': neutral,
+        'negative_factors': negative,
+        'rule_results': audit,
+        'created_at': explained_at
+    }
+    plan_base = _next_id(conn, models.ImprovementPlan)
+    plans = {
+        'id': list(range(plan_base, plan_base + len(explained_rows))),
+        'user_id': explained_user_ids,
+        'recommendations': recommendation_lists,
+        'estimated_score_increase': score_increases,
+        'generated_at': explained_at
+    }
+
+    # Lender decisions against each user's latest score
+    decided_users = np.flatnonzero(rng.random(n_users) < decision_rate).tolist()
+    latest_rows = np.flatnonzero(is_latest).tolist()
+    classifications, human_decisions, decided_at = [], [], []
+    for i in decided_users:
+        r = latest_rows[i]
+        trust_score = trust_scores[r]
+        if trust_score >= 700:
+            classification, decision = "Low Risk", 'approve'
+        elif trust_score >= 550:
+            classification, decision = "Moderate Risk", DECISIONS[int(rng.integers(0, 3))]
+        else:
+            classification, decision = "High Risk", 'decline'
+        classifications.append(classification)
+        human_decisions.append(decision)
+        decided_at.append(scored_at[r] + timedelta(days=2))
+
+    n_decisions = len(decided_users)
+    decision_base = _next_id(conn, models.LenderDecision)
+    decisions = {
+        'id': list(range(decision_base, decision_base + n_decisions)),
+        'user_id': [user_ids[i] for i in decided_users],
+        'lender_id': [SEED_LENDER_ID] * n_decisions,
+        'assessment_classification': classifications,
+        'assessment_strength': [assessment_strengths[latest_rows[i]] for i in decided_users],
+        'rule_match_level': [rule_match_levels[latest_rows[i]] for i in decided_users],
+        'human_decision': human_decisions,
+        'decision_justification': [
+            f"Seeded decision based on {classification.lower()} assessment and documented history."
+            for classification in classifications
+        ],
+        'loan_amount': [None] * n_decisions,
+        'interest_rate': [None] * n_decisions,
+        'term_months': [None] * n_decisions,
+        'reviewed_at': decided_at,
+        'decided_at': decided_at
+    }
+
+    # Value lists stay alive until the inserts are done, so their ids are stable keys
+    processed_cache: Dict = {}
+    bulk_insert(conn, models.User.__table__, users, processed_cache)
+    bulk_insert(conn, models.BehavioralData.__table__, behavioral, processed_cache)
+    bulk_insert(conn, models.CreditScore.__table__, credit_scores, processed_cache)
+    bulk_insert(conn, models.Explanation.__table__, explanations, processed_cache)
+    bulk_insert(conn, models.ImprovementPlan.__table__, plans, processed_cache)
+    bulk_insert(conn, models.LenderDecision.__table__, decisions, processed_cache)
+
+    return {
+        'users': n_users,
+        'behavioral_data': total,
+        'credit_scores': total,
+        'explanations': len(explained_rows),
+        'improvement_plans': len(explained_rows),
+        'lender_decisions': n_decisions
+    }
+
+def seed_database(
+    engine: Engine,
+    n_users: int,
+    chunk_size: int = 20000,
+    mean_history: float = 4.0,
+    max_history: int = 24,
+    decision_rate: float = 0.3,
+    explain_history: bool = False,
+    seed: int = 42,
+    progress: Optional[Callable[[Dict[str, int], float], None]] = None
+) -> Dict[str, int]:
+    """
+    Seed the database with synthetic users and their history
+
+    Args:
+        engine: Target engine (tables are created if missing)
+        n_users: Number of users to add
+        chunk_size: Users generated and committed per transaction
+        mean_history: Average number of scored snapshots per user
+        max_history: Cap on snapshots per user
+        decision_rate: Fraction of users with a lender decision
+        explain_history: Generate explanations and plans for every score,
+            not just each user's latest
+        seed: RNG seed
+        progress: Called after each chunk with running totals and elapsed seconds
+
+    Returns:
+        Row counts inserted per table
+    """
+    models.Base.metadata.create_all(bind=engine)
+    rng = np.random.default_rng(seed)
+    # One bcrypt hash shared by every seeded user (password: SEED_PASSWORD)
+    hashed_password = get_password_hash(SEED_PASSWORD)
+    now = datetime.utcnow()
+
+    totals: Dict[str, int] = {}
+    start = time.perf_counter()
+    # Bulk statements are slow by design; keep them out of the slow-query log
+    with query_monitor.suppress_diagnostics():
+        for size in iter_user_chunks(n_users, chunk_size):
+            with engine.begin() as conn:
+                if conn.dialect.name == 'sqlite':
+                    conn.exec_driver_sql("PRAGMA synchronous = OFF")
+                counts = seed_chunk(
+                    conn, size, rng, now, mean_history, max_history,
+                    decision_rate, explain_history, hashed_password
+                )
+            for table, count in counts.items():
+                totals[table] = totals.get(table, 0) + count
+            if progress is not None:
+                progress(totals, time.perf_counter() - start)
+
+        with engine.begin() as conn:
+            _sync_sequences(conn)
+
+    logger.info(f"Seeded {totals.get('users', 0)} users in {time.perf_counter() - start:.1f}s")
+    return totals
@@ -1,7 +1,7 @@
 """
 NEXIS Credit Trust Platform - Main Application
 """
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
 from sqlalchemy.exc import SQLAlchemyError
@@ -9,6 +9,7 @@ from contextlib import asynccontextmanager
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
+import logging
 import os
 import time
 
@@ -21,13 +22,34 @@ from .middleware.error_handler import (
     database_exception_handler,
     general_exception_handler
 )
-from .middleware.logging import setup_logging
+from .middleware.logging import setup_logging, ACCESS_LOGGER_NAME
+from .core.metrics import (
+    metrics,
+    REQUEST_LATENCY,
+    DB_QUERIES_PER_REQUEST,
+    PROMETHEUS_CONTENT_TYPE
+)
+from .core.tracing import tracer
+from .core.startup_profile import STARTUP_STEPS, startup_step
+from .db import query_monitor
+from .ml.registry import model_loader
+from .ml.inference_server import inference_server
+from .analytics.drift import drift_monitor
+from .analytics.peers import peer_comparison
+from .analytics.percentiles import score_distribution
+from .core.request_context import (
+    RequestContext,
+    bind_request_context,
+    unbind_request_context,
+    route_template
+)
 
 # Setup logging
 logger = setup_logging()
+access_logger = logging.getLogger(ACCESS_LOGGER_NAME)
 
 # Setup rate limiter
-limiter = Limiter(key_func=get_remote_address)
+limiter = Limiter(key_func=get_remote_address, enabled=settings.RATE_LIMIT_ENABLED)
 
 
 @asynccontextmanager
@@ -37,6 +59,7 @@ async def lifespan(app: FastAPI):
     """
     # Startup: Validate environment and create tables
     print("🚀 Starting NEXIS Platform...")
+    STARTUP_STEPS.clear()
     
     # Validate required environment variables
     required_vars = ["DATABASE_URL", "SECRET_KEY"]
@@ -49,7 +72,8 @@ async def lifespan(app: FastAPI):
         print("✅ Environment variables validated")
     
     # Create database tables
-    models.Base.metadata.create_all(bind=engine)
+    with startup_step("create_tables"):
+        models.Base.metadata.create_all(bind=engine)
     print("✅ Database tables created")
     
     # Initialize scoring engine
@@ -58,12 +82,51 @@ async def lifespan(app: FastAPI):
     print(f"   - Maximum Points: {scoring_engine.MAX_POINTS}")
     print("   - Assessment Type: Deterministic Rule-Based")
     
+    with startup_step("drift_reference"):
+        has_reference = drift_monitor.load_reference(settings.DRIFT_REFERENCE_PATH)
+    if has_reference:
+        print(f"✅ Drift reference loaded ({drift_monitor.reference['n']} assessments)")
+    else:
+        print("⚠️  No drift reference (freeze one with POST /api/v1/drift/reference)")
+    
+    with startup_step("score_distribution"):
+        score_distribution.start(
+            engine,
+            settings.SCORE_PERCENTILE_PATH or None,
+            sync_interval=settings.SCORE_PERCENTILE_SYNC_SECONDS,
+            save_interval=settings.SCORE_PERCENTILE_SAVE_SECONDS
+        )
+    print(f"✅ Score distribution ready ({score_distribution.population} applicants)")
+    
+    with startup_step("peer_warmup"):
+        peer_rows = peer_comparison.warm(engine, settings.PEER_WARMUP_ROWS)
+    print(f"✅ Peer comparison warmed ({peer_rows} applicants)")
+    
+    # Load and warm the active model version, then follow the registry pointer
+    # (ML dependencies beyond NumPy are imported here at the earliest)
+    with startup_step("model_load"):
+        model_loader.start()
+    with startup_step("inference_warmup"):
+        inference_server.start()
+        warmed = await inference_server.warmup()
+    if warmed:
+        print(f"✅ Model version {model_loader.version} loaded and warmed ({inference_server.executor} executor)")
+    else:
+        print("⚠️  No active model version in the registry (run python train_model.py)")
+        print("   - /score/hybrid answers rule-only until a version is activated")
+    
+    if settings.PROFILE_STARTUP:
+        logger.info(f"Startup took {sum(seconds for _, seconds in STARTUP_STEPS) * 1000:.1f} ms")
     print("✅ NEXIS Platform ready!")
     
     yield
     
     # Shutdown
     print("👋 Shutting down NEXIS Platform...")
+    await inference_server.stop()
+    model_loader.stop()
+    score_distribution.stop()
+    tracer.shutdown()
 
 
 # Create FastAPI app
@@ -86,11 +149,43 @@ app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 # Request timing middleware
 @app.middleware("http")
 async def add_process_time_header(request: Request, call_next):
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
+    start_time = time.perf_counter()
+    trace_id, span = tracer.start_request(
+        f"{request.method} {request.url.path}",
+        request.headers.get("traceparent"),
+        {"http.method": request.method, "http.target": request.url.path}
+    )
+    request_context = RequestContext(
+        request.method, request.url.path, request.scope, trace_id,
+        track_statements=query_monitor.diagnostics_enabled()
+    )
+    token = bind_request_context(request_context)
+    span_token = tracer.activate(span)
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+    finally:
+        process_time = time.perf_counter() - start_time
+        route = route_template(request.scope)
+        REQUEST_LATENCY.labels(request.method, route, status_code).observe(process_time)
+        DB_QUERIES_PER_REQUEST.labels(route).observe(request_context.query_count)
+        # Log while the request context is bound so every line carries the trace ID
+        if request_context.statement_shapes is not None:
+            query_monitor.check_request_queries(request_context)
+        access_logger.info(
+            "%s %s - %s - %.3fs", request.method, request.url.path, status_code, process_time
+        )
+        if span is not None:
+            span.name = f"{request.method} {route}"
+            span.set_attribute("http.route", route)
+            span.set_attribute("http.status_code", status_code)
+            span.set_attribute("db.query_count", request_context.query_count)
+            tracer.end_span(span)
+        tracer.deactivate(span_token)
+        unbind_request_context(token)
     response.headers["X-Process-Time"] = str(process_time)
-    logger.info(f"{request.method} {request.url.path} - {response.status_code} - {process_time:.3f}s")
+    response.headers["X-Trace-Id"] = trace_id
     return response
 
 # CORS middleware - Must be added BEFORE routes
@@ -130,6 +225,8 @@ async def health_check():
         "database": "connected",
         "scoring_engine": "ready" if scoring_engine_ready else "not_initialized",
         "assessment_type": "rule-based",
+        "ml_model": "ready" if model_loader.version else "not_loaded",
+        "model_version": model_loader.version,
         "environment": settings.ENVIRONMENT
     }
 
@@ -152,6 +249,12 @@ async def engine_health_check():
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Prometheus scrape endpoint"""
+    return Response(content=metrics.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
 @app.get("/health/cors")
 async def cors_check():
     """CORS configuration check"""
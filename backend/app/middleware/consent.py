@@ -1,10 +1,168 @@
 """
 Consent enforcement middleware
 """
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+
 from fastapi import Request, HTTPException, status
 from sqlalchemy.orm import Session
 from ..db.database import SessionLocal
 from ..db import models
+from ..core.config import settings
+from ..core.metrics import register_cache
+
+
+class ConsentCache:
+    """
+    In-process cache of per-user consent status
+
+    Consent changes rarely but is checked on every score, so lookups are
+    served from memory and only fall through to the database on a miss or
+    after the entry expires. Only granted consent is cached: a refusal is
+    read again every time, so a grant recorded by another worker (workers
+    do not share the cache) takes effect at once. Entries are invalidated
+    by the consent route, and the TTL bounds how long other workers keep
+    serving a revoked grant.
+    """
+
+    def __init__(self, ttl_seconds: float = 300, max_entries: int = 100_000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: str) -> Optional[bool]:
+        """Return cached consent status, or None on a miss"""
+        entry = self._entries.get(user_id)
+        if entry is None or entry[1] < time.monotonic():
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[0]
+
+    def generation(self) -> int:
+        """Invalidation counter; read it before the database lookup passed to set()"""
+        return self._generation
+
+    def set(self, user_id: str, consent_given: bool, generation: Optional[int] = None):
+        """
+        Cache consent status for a user (refusals are not cached)
+
+        With generation, nothing is cached if an invalidation happened
+        since it was read: the looked-up value may predate it.
+        """
+        if not consent_given:
+            return
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[user_id] = (bool(consent_given), expires_at)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: str):
+        """Drop the cached status for a user"""
+        with self._lock:
+            self._entries.pop(user_id, None)
+            self._generation += 1
+
+    def clear(self):
+        """Drop all cached entries and reset counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict:
+        """Hit/miss counters for monitoring"""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else 0.0
+        }
+
+
+# Shared by the scoring routes and verify_consent
+consent_cache = ConsentCache(
+    ttl_seconds=settings.CONSENT_CACHE_TTL_SECONDS,
+    max_entries=settings.CONSENT_CACHE_MAX_ENTRIES
+)
+register_cache('consent', consent_cache.stats)
+
+
+def get_consent_status(db: Session, user_id: str) -> Optional[bool]:
+    """
+    Look up consent status through the cache
+
+    Args:
+        db: Database session used on a cache miss
+        user_id: User identifier
+
+    Returns:
+        True/False for consent, None if the user does not exist
+    """
+    cached = consent_cache.get(user_id)
+    if cached is not None:
+        return cached
+
+    generation = consent_cache.generation()
+    row = db.query(models.User.consent_given).filter(
+        models.User.user_id == user_id
+    ).first()
+
+    if row is None:
+        return None
+
+    consent_given = bool(row.consent_given)
+    consent_cache.set(user_id, consent_given, generation)
+    return consent_given
+
+
+def get_consent_statuses(db: Session, user_ids: Iterable[str]) -> Dict[str, Optional[bool]]:
+    """
+    Batch variant of get_consent_status for multi-user scoring
+
+    Cache misses are resolved with a single IN query.
+
+    Args:
+        db: Database session used for cache misses
+        user_ids: User identifiers
+
+    Returns:
+        Mapping of user_id to consent status (None if the user does not exist)
+    """
+    statuses: Dict[str, Optional[bool]] = {}
+    missing = []
+    for user_id in dict.fromkeys(user_ids):
+        cached = consent_cache.get(user_id)
+        if cached is None:
+            missing.append(user_id)
+        else:
+            statuses[user_id] = cached
+
+    if missing:
+        generation = consent_cache.generation()
+        rows = db.query(models.User.user_id, models.User.consent_given).filter(
+            models.User.user_id.in_(missing)
+        ).all()
+        found = {row.user_id: bool(row.consent_given) for row in rows}
+        for user_id in missing:
+            if user_id in found:
+                consent_cache.set(user_id, found[user_id], generation)
+                statuses[user_id] = found[user_id]
+            else:
+                statuses[user_id] = None
+
+    return statuses
 
 
 async def verify_consent(user_id: str) -> bool:
@@ -17,24 +175,50 @@ async def verify_consent(user_id: str) -> bool:
     Returns:
         True if consent given, raises HTTPException otherwise
     """
+    # The session only checks out a connection on a cache miss
     db = SessionLocal()
     try:
-        user = db.query(models.User).filter(
-            models.User.user_id == user_id
-        ).first()
-        
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found"
-            )
-        
-        if not user.consent_given:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="User consent required. Please submit consent first."
-            )
-        
-        return True
+        consent_given = get_consent_status(db, user_id)
     finally:
         db.close()
+
+    if consent_given is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+
+    if not consent_given:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User consent required. Please submit consent first."
+        )
+
+    return True
+
+
+async def verify_consent_batch(user_ids: Iterable[str]) -> Dict[str, bool]:
+    """
+    Verify consent for several users at once
+
+    Args:
+        user_ids: User identifiers
+
+    Returns:
+        Mapping of user_id to consent status; raises HTTPException if any
+        user does not exist
+    """
+    db = SessionLocal()
+    try:
+        statuses = get_consent_statuses(db, user_ids)
+    finally:
+        db.close()
+
+    unknown = [user_id for user_id, consent_given in statuses.items() if consent_given is None]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Users not found: {', '.join(unknown)}"
+        )
+
+    return statuses
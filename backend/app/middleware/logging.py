@@ -1,44 +1,175 @@
 """
 Structured logging with PII masking
+
+Records are enqueued on the request path and formatted, masked and written
+by a QueueListener thread, so the event loop only pays for building the
+record. PII masking uses one precompiled pattern in a single pass.
 """
+import atexit
+import json
 import logging
+import queue
 import re
-from typing import Any, Dict
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Iterable, Optional
+
+from ..core.config import settings
+from ..core.request_context import get_request_context
+
+ACCESS_LOGGER_NAME = 'nexis.access'
 
 
 class PIIMaskingFormatter(logging.Formatter):
     """Formatter that masks PII in log messages"""
-    
+
     # Patterns to mask
     EMAIL_PATTERN = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
     PHONE_PATTERN = r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b'
     SSN_PATTERN = r'\b\d{3}-\d{2}-\d{4}\b'
-    
+
+    # Combined in the order the masks were historically applied
+    PII_REGEX = re.compile(
+        f'(?P<email>{EMAIL_PATTERN})|(?P<phone>{PHONE_PATTERN})|(?P<ssn>{SSN_PATTERN})'
+    )
+    MASKS = {
+        'email': '[EMAIL_MASKED]',
+        'phone': '[PHONE_MASKED]',
+        'ssn': '[SSN_MASKED]'
+    }
+
+    @classmethod
+    def mask(cls, text: str) -> str:
+        """Mask emails, phone numbers and SSNs in one pass"""
+        return cls.PII_REGEX.sub(lambda match: cls.MASKS[match.lastgroup], text)
+
     def format(self, record: logging.LogRecord) -> str:
         """Format log record with PII masking"""
-        original = super().format(record)
-        
-        # Mask email addresses
-        masked = re.sub(self.EMAIL_PATTERN, '[EMAIL_MASKED]', original)
-        
-        # Mask phone numbers
-        masked = re.sub(self.PHONE_PATTERN, '[PHONE_MASKED]', masked)
-        
-        # Mask SSN
-        masked = re.sub(self.SSN_PATTERN, '[SSN_MASKED]', masked)
-        
-        return masked
-
-
-def setup_logging():
+        return self.mask(super().format(record))
+
+
+class JSONFormatter(PIIMaskingFormatter):
+    """One JSON object per line, with PII masked in the message"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: Dict[str, Any] = {
+            'timestamp': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': self.mask(record.getMessage()),
+            'trace_id': getattr(record, 'trace_id', '-')
+        }
+        if record.exc_info:
+            payload['exception'] = self.mask(self.formatException(record.exc_info))
+        return json.dumps(payload, ensure_ascii=False)
+
+
+class TraceIdFilter(logging.Filter):
+    """Attach the current request's trace ID to every record"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        request_context = get_request_context()
+        record.trace_id = request_context.trace_id if request_context is not None else '-'
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep only a fraction of high-volume INFO records
+
+    Applies to records at or below INFO from the given loggers; warnings and
+    errors always pass. Sampling is deterministic (every Nth record).
+    """
+
+    def __init__(self, rate: float, logger_names: Iterable[str] = (ACCESS_LOGGER_NAME,)):
+        super().__init__()
+        self.logger_names = tuple(logger_names)
+        self.every = max(1, round(1 / rate)) if rate > 0 else 0
+        self._seen = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO or record.name not in self.logger_names:
+            return True
+        if self.every == 0:
+            return False
+        self._seen += 1
+        return self._seen % self.every == 0
+
+
+class DeferredFormattingQueueHandler(QueueHandler):
+    """
+    QueueHandler that leaves formatting to the listener thread
+
+    The stock prepare() formats the record on the calling thread; here only
+    the message arguments are merged so later mutation cannot change them.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+_listener: Optional[QueueListener] = None
+_installed_handlers = []
+
+
+def build_formatter(log_format: str) -> logging.Formatter:
+    if log_format == 'json':
+        return JSONFormatter()
+    return PIIMaskingFormatter(
+        '%(asctime)s - %(name)s - %(levelname)s - trace_id=%(trace_id)s - %(message)s'
+    )
+
+
+def setup_logging(
+    log_format: Optional[str] = None,
+    access_sample_rate: Optional[float] = None,
+    asynchronous: Optional[bool] = None,
+    stream=None
+):
     """Configure logging with PII masking"""
-    handler = logging.StreamHandler()
-    handler.setFormatter(PIIMaskingFormatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    ))
-    
+    global _listener
+    log_format = log_format or settings.LOG_FORMAT
+    access_sample_rate = settings.LOG_ACCESS_SAMPLE_RATE if access_sample_rate is None else access_sample_rate
+    asynchronous = settings.LOG_ASYNC if asynchronous is None else asynchronous
+
+    shutdown_logging()
+
+    output_handler = logging.StreamHandler(stream or sys.stderr)
+    output_handler.setFormatter(build_formatter(log_format))
+
+    if asynchronous:
+        handler = DeferredFormattingQueueHandler(queue.SimpleQueue())
+        _listener = QueueListener(handler.queue, output_handler, respect_handler_level=True)
+        _listener.start()
+    else:
+        handler = output_handler
+
+    # Filters run on the calling thread: trace IDs live in its context, and
+    # sampled-out records are never enqueued
+    handler.addFilter(TraceIdFilter())
+    if access_sample_rate < 1.0:
+        handler.addFilter(SamplingFilter(access_sample_rate))
+
     logger = logging.getLogger()
     logger.addHandler(handler)
-    logger.setLevel(logging.INFO)
-    
+    logger.setLevel(settings.LOG_LEVEL)
+    _installed_handlers.append(handler)
+
     return logger
+
+
+def shutdown_logging():
+    """Flush queued records and remove handlers installed by setup_logging"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    root = logging.getLogger()
+    while _installed_handlers:
+        root.removeHandler(_installed_handlers.pop())
+
+
+atexit.register(shutdown_logging)
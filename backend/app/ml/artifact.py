@@ -0,0 +1,176 @@
+"""
+Single-file, memory-mappable model artifact
+
+Layout:
+    magic (8 bytes) | format version (uint32) | header length (uint32)
+    | JSON header | padding | data section
+
+The data section holds raw, uncompressed arrays at 64-byte aligned
+offsets. Readers map the file read-only, so every worker process that
+loads the same artifact shares one copy of the arrays through the page
+cache instead of unpickling a private copy. Opaque blobs (e.g. the
+pickled sklearn estimator for exact-SHAP fallback) are stored the same
+way and only deserialized on demand.
+
+The header carries the feature schema, the array directory and a SHA-256
+checksum of the data section.
+"""
+import hashlib
+import json
+import os
+import struct
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+MAGIC = b'NEXISMDL'
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+_PREAMBLE = struct.Struct('<8sII')
+_HASH_BLOCK = 16 * 1024 * 1024
+
+
+class ArtifactError(ValueError):
+    """Raised for unreadable, incompatible or corrupted artifacts"""
+
+
+def _align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def write_artifact(path: str, arrays: Dict[str, np.ndarray], header: Dict[str, Any],
+                   blobs: Optional[Dict[str, bytes]] = None) -> Dict[str, Any]:
+    """
+    Write arrays and blobs into one artifact file
+
+    The file is written next to its destination and renamed into place, so
+    readers never observe a partial artifact.
+
+    Args:
+        path: Destination file
+        arrays: Named numeric arrays (stored C-contiguous, native dtype)
+        header: Extra header fields (feature schema, model metadata)
+        blobs: Named opaque byte strings
+
+    Returns:
+        The complete header that was written
+    """
+    entries = {}
+    payloads = []
+    offset = 0
+    for kind, items in (('arrays', arrays), ('blobs', blobs or {})):
+        for name, value in items.items():
+            if kind == 'arrays':
+                data = np.ascontiguousarray(value)
+                if data.dtype.hasobject:
+                    raise ArtifactError(f"Array {name} has object dtype")
+                entry = {'dtype': data.dtype.str, 'shape': list(data.shape)}
+                raw = data.reshape(-1).view(np.uint8)
+            else:
+                raw = np.frombuffer(value, dtype=np.uint8)
+                entry = {}
+            entry.update({'kind': kind, 'offset': offset, 'nbytes': int(raw.nbytes)})
+            entries[name] = entry
+            payloads.append((offset, raw))
+            offset = _align(offset + raw.nbytes)
+    data_size = offset
+
+    # Checksum over the exact data section bytes, padding included
+    digest = hashlib.sha256()
+    position = 0
+    for start, raw in payloads:
+        digest.update(b'\0' * (start - position))
+        digest.update(memoryview(raw))
+        position = start + raw.nbytes
+    digest.update(b'\0' * (data_size - position))
+
+    full_header = {
+        **header,
+        'format_version': FORMAT_VERSION,
+        'created_at': header.get('created_at', datetime.now(timezone.utc).isoformat()),
+        'entries': entries,
+        'data_size': data_size,
+        'checksum': {'algorithm': 'sha256', 'digest': digest.hexdigest()}
+    }
+    header_bytes = json.dumps(full_header, sort_keys=True).encode('utf-8')
+    data_start = _align(_PREAMBLE.size + len(header_bytes))
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with open(tmp_path, 'wb') as f:
+        f.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header_bytes)))
+        f.write(header_bytes)
+        f.write(b'\0' * (data_start - _PREAMBLE.size - len(header_bytes)))
+        position = 0
+        for start, raw in payloads:
+            f.write(b'\0' * (start - position))
+            f.write(memoryview(raw))
+            position = start + raw.nbytes
+        f.write(b'\0' * (data_size - position))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return full_header
+
+
+def read_header(path: str) -> Dict[str, Any]:
+    """Read and validate the artifact header without mapping the data"""
+    with open(path, 'rb') as f:
+        preamble = f.read(_PREAMBLE.size)
+        if len(preamble) != _PREAMBLE.size:
+            raise ArtifactError(f"{path}: truncated artifact")
+        magic, version, header_length = _PREAMBLE.unpack(preamble)
+        if magic != MAGIC:
+            raise ArtifactError(f"{path}: not a NEXIS model artifact")
+        if version != FORMAT_VERSION:
+            raise ArtifactError(f"{path}: unsupported artifact format {version}")
+        header = json.loads(f.read(header_length).decode('utf-8'))
+    header['data_start'] = _align(_PREAMBLE.size + header_length)
+    return header
+
+
+class Artifact:
+    """
+    Read-only view of an artifact file
+
+    Arrays are zero-copy views into a shared read-only memory map.
+    """
+
+    def __init__(self, path: str, verify: bool = True):
+        self.path = path
+        self.header = read_header(path)
+        data_start = self.header['data_start']
+        data_size = self.header['data_size']
+        if os.path.getsize(path) < data_start + data_size:
+            raise ArtifactError(f"{path}: truncated artifact")
+
+        self._data = np.memmap(path, dtype=np.uint8, mode='r', offset=data_start, shape=(data_size,))
+        if verify:
+            self.verify()
+
+        self.arrays: Dict[str, np.ndarray] = {}
+        for name, entry in self.header['entries'].items():
+            if entry['kind'] == 'arrays':
+                raw = self._data[entry['offset']:entry['offset'] + entry['nbytes']]
+                self.arrays[name] = raw.view(np.dtype(entry['dtype'])).reshape(entry['shape'])
+
+    def verify(self):
+        """Recompute the data checksum and compare it with the header"""
+        digest = hashlib.sha256()
+        for start in range(0, len(self._data), _HASH_BLOCK):
+            digest.update(memoryview(self._data[start:start + _HASH_BLOCK]))
+        expected = self.header['checksum']['digest']
+        if digest.hexdigest() != expected:
+            raise ArtifactError(f"{self.path}: checksum mismatch (artifact corrupted)")
+
+    def blob(self, name: str) -> bytes:
+        """Copy a stored blob out of the map"""
+        entry = self.header['entries'][name]
+        if entry['kind'] != 'blobs':
+            raise KeyError(name)
+        return bytes(self._data[entry['offset']:entry['offset'] + entry['nbytes']])
+
+    def has_blob(self, name: str) -> bool:
+        entry = self.header['entries'].get(name)
+        return entry is not None and entry['kind'] == 'blobs'
@@ -0,0 +1,298 @@
+"""
+Out-of-core model training from the production database
+
+Training rows are lender decisions joined with the applicant's behavioral
+snapshot as it was when the decision was made (the latest behavioral_data
+row created at or before it). The human decision is the label:
+approve -> Low (0), request_more_data -> Moderate (1), decline -> High (2).
+
+Rows are streamed in keyset-paginated chunks (lender_decisions.id > last
+id, ordered by id), so no query holds more than one chunk and resuming is
+a single WHERE clause. Features are engineered column-wise per chunk with
+FeatureEngineer.engineer_features_array. Training takes two passes:
+
+1. Statistics: class counts, the StandardScaler (partial_fit) and a
+   capped validation sample (every VALIDATION_EVERY-th decision).
+2. Fit: the forest grows by warm-started tree additions. Each step fits a
+   few new trees on the next block of rows only, so memory is bounded by
+   one block (max(chunk_size, training rows / n_estimators) rows, up to
+   MAX_BLOCK_STEPS times that while waiting for a rare outcome) plus the
+   trees.
+
+Progress is checkpointed after every chunk or step, and an interrupted
+run resumes from its last checkpoint.
+"""
+import logging
+import math
+import os
+import time
+import uuid
+from typing import Callable, Dict, Iterator, NamedTuple, Optional
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.engine import Engine
+
+from ..db import models
+from .feature_engineering import FeatureEngineer
+from .model import CreditTrustModel
+from .synthetic_data import BEHAVIORAL_FIELDS
+
+logger = logging.getLogger(__name__)
+
+DECISION_LABELS = {'approve': 0, 'request_more_data': 1, 'decline': 2}
+
+# Every n-th decision (by id) is held out for evaluation
+VALIDATION_EVERY = 10
+
+# A block still missing a decision outcome after this many steps' worth of
+# rows is skipped, so a rare outcome cannot grow one block without bound
+MAX_BLOCK_STEPS = 4
+
+
+class LabelledChunk(NamedTuple):
+    """One keyset page of training rows"""
+    last_id: int
+    ids: np.ndarray
+    X: np.ndarray
+    y: np.ndarray
+
+
+def labelled_rows_query(after_id: int, limit: int):
+    """Decisions after `after_id` joined with their point-in-time snapshot"""
+    decision = models.LenderDecision.__table__
+    behavioral = models.BehavioralData.__table__
+    snapshot_id = (
+        select(func.max(behavioral.c.id))
+        .where(
+            behavioral.c.user_id == decision.c.user_id,
+            behavioral.c.created_at <= func.coalesce(decision.c.decided_at, decision.c.reviewed_at)
+        )
+        .correlate(decision)
+        .scalar_subquery()
+    )
+    return (
+        select(
+            decision.c.id,
+            decision.c.human_decision,
+            *[func.coalesce(behavioral.c[field], 0).label(field) for field in BEHAVIORAL_FIELDS]
+        )
+        .select_from(decision.join(behavioral, behavioral.c.id == snapshot_id))
+        .where(decision.c.id > after_id, decision.c.human_decision.in_(list(DECISION_LABELS)))
+        .order_by(decision.c.id)
+        .limit(limit)
+    )
+
+
+def iter_labelled_chunks(engine: Engine, chunk_size: int = 50000,
+                         after_id: int = 0) -> Iterator[LabelledChunk]:
+    """
+    Stream engineered, labelled training rows in decision id order
+
+    Args:
+        engine: Source database
+        chunk_size: Rows per query
+        after_id: Resume after this lender_decisions.id
+    """
+    while True:
+        with engine.connect() as conn:
+            rows = conn.execute(labelled_rows_query(after_id, chunk_size)).all()
+        if not rows:
+            return
+        ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+        y = np.fromiter((DECISION_LABELS[row[1]] for row in rows), dtype=np.int64, count=len(rows))
+        raw = np.array([row[2:] for row in rows], dtype=np.float64)
+        X = FeatureEngineer.engineer_features_array(
+            {field: raw[:, j] for j, field in enumerate(BEHAVIORAL_FIELDS)}, dtype=np.float64
+        )
+        after_id = int(ids[-1])
+        yield LabelledChunk(after_id, ids, X, y)
+        if len(rows) < chunk_size:
+            return
+
+
+def _save_checkpoint(path: str, state: Dict):
+    import joblib
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+    joblib.dump(state, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def train_from_database(
+    engine: Engine,
+    chunk_size: int = 50000,
+    n_estimators: int = 100,
+    max_validation_rows: int = 100000,
+    checkpoint_path: Optional[str] = None,
+    resume: bool = True,
+    n_jobs: int = -1,
+    progress: Optional[Callable[[Dict], None]] = None
+) -> Dict:
+    """
+    Train a CreditTrustModel on labelled database rows in bounded memory
+
+    Args:
+        engine: Source database
+        chunk_size: Rows per query (and minimum rows per fit step)
+        n_estimators: Trees in the final forest (approximately; every fit
+            step adds at least one)
+        max_validation_rows: Cap on the held-out sample kept in memory
+        checkpoint_path: Checkpoint file written after every chunk/step
+        resume: Continue from checkpoint_path if it exists
+        n_jobs: Parallel tree fitting (joblib semantics)
+        progress: Called with the training state summary after every chunk/step
+
+    Returns:
+        Dictionary with the trained 'model' and its 'metrics'
+    """
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.preprocessing import StandardScaler
+
+    state = None
+    if checkpoint_path and resume and os.path.exists(checkpoint_path):
+        import joblib
+        state = joblib.load(checkpoint_path)
+        logger.info(f"Resuming {state['phase']} pass after decision {state['last_id']}")
+    if state is None:
+        state = {
+            'phase': 'stats',
+            'last_id': 0,
+            'scaler': StandardScaler(),
+            'class_counts': np.zeros(len(DECISION_LABELS), dtype=np.int64),
+            'validation_X': np.empty((0, len(FeatureEngineer.FEATURE_NAMES))),
+            'validation_y': np.empty(0, dtype=np.int64),
+            'forest': None,
+            'step': 0,
+            'skipped_rows': 0
+        }
+
+    def checkpoint():
+        if checkpoint_path:
+            _save_checkpoint(checkpoint_path, state)
+        if progress is not None:
+            progress({
+                'phase': state['phase'],
+                'last_id': state['last_id'],
+                'step': state['step'],
+                'n_trees': len(getattr(state['forest'], 'estimators_', []))
+            })
+
+    started = time.perf_counter()
+
+    # Pass 1: class counts, scaler and validation sample
+    if state['phase'] == 'stats':
+        for chunk in iter_labelled_chunks(engine, chunk_size, state['last_id']):
+            held_out = chunk.ids % VALIDATION_EVERY == 0
+            train_X, train_y = chunk.X[~held_out], chunk.y[~held_out]
+            if len(train_y):
+                state['scaler'].partial_fit(train_X)
+                state['class_counts'] += np.bincount(train_y, minlength=len(DECISION_LABELS))
+            room = max_validation_rows - len(state['validation_y'])
+            if room > 0 and held_out.any():
+                state['validation_X'] = np.concatenate([state['validation_X'], chunk.X[held_out][:room]])
+                state['validation_y'] = np.concatenate([state['validation_y'], chunk.y[held_out][:room]])
+            state['last_id'] = chunk.last_id
+            checkpoint()
+
+        n_train = int(state['class_counts'].sum())
+        if n_train == 0:
+            raise ValueError("No labelled training rows (lender decisions joined with behavioral data)")
+        classes = np.flatnonzero(state['class_counts'])
+        if len(classes) < 2:
+            raise ValueError("Training rows contain a single decision outcome")
+
+        # Class weights as class_weight='balanced' would compute them on all rows
+        counts = state['class_counts'][classes]
+        state.update({
+            'phase': 'fit',
+            'last_id': 0,
+            'classes': classes,
+            'class_weight': {int(c): float(n_train / (len(classes) * n)) for c, n in zip(classes, counts)},
+            'n_train': n_train,
+            'n_estimators': n_estimators,
+            'rows_per_step': max(chunk_size, math.ceil(n_train / n_estimators)),
+            'rows_fitted': 0
+        })
+        checkpoint()
+
+    # Pass 2: warm-started tree additions, one block of rows per step
+    if state['phase'] == 'fit':
+        if state['forest'] is None:
+            state['forest'] = RandomForestClassifier(
+                n_estimators=0,
+                **CreditTrustModel.FOREST_PARAMS,
+                class_weight=state['class_weight'],
+                warm_start=True
+            )
+        forest = state['forest']
+        forest.n_jobs = n_jobs
+        scaler = state['scaler']
+        classes = set(state['classes'].tolist())
+
+        def fit_step(X, y, last_id):
+            if set(np.unique(y).tolist()) != classes:
+                # Every step must see every class, or the new trees would
+                # disagree with the existing ones on the class layout
+                logger.warning(f"Skipping {len(y)} rows without every decision outcome")
+                state['skipped_rows'] += len(y)
+            else:
+                # Trees proportional to the rows seen, so the forest ends at
+                # about n_estimators whatever the block sizes
+                state['rows_fitted'] += len(y)
+                target = round(state['n_estimators'] * state['rows_fitted'] / state['n_train'])
+                forest.n_estimators += max(1, target - forest.n_estimators)
+                forest.fit(scaler.transform(X), y)
+                state['step'] += 1
+            state['last_id'] = last_id
+            checkpoint()
+
+        block_X, block_y, block_classes = [], [], set()
+        block_rows = block_last_id = 0
+        for chunk in iter_labelled_chunks(engine, chunk_size, state['last_id']):
+            held_out = chunk.ids % VALIDATION_EVERY == 0
+            block_X.append(chunk.X[~held_out])
+            block_y.append(chunk.y[~held_out])
+            block_classes.update(np.unique(block_y[-1]).tolist())
+            block_rows += len(block_y[-1])
+            block_last_id = chunk.last_id
+            if block_rows >= state['rows_per_step'] and (
+                block_classes == classes or block_rows >= MAX_BLOCK_STEPS * state['rows_per_step']
+            ):
+                fit_step(np.concatenate(block_X), np.concatenate(block_y), block_last_id)
+                block_X, block_y, block_classes = [], [], set()
+                block_rows = 0
+        if block_rows:
+            # The last partial block joins the forest as one more step
+            fit_step(np.concatenate(block_X), np.concatenate(block_y), block_last_id)
+
+        state['phase'] = 'done'
+        checkpoint()
+
+    forest = state['forest']
+    if forest is None or not hasattr(forest, 'estimators_'):
+        raise ValueError("No training step completed")
+
+    model = CreditTrustModel.from_estimators(forest, state['scaler'])
+    validation_X, validation_y = state['validation_X'], state['validation_y']
+    test_accuracy = None
+    if len(validation_y):
+        predicted = model.forest.classes[model.predict_proba(validation_X).argmax(axis=1)]
+        test_accuracy = float(np.mean(predicted == validation_y))
+
+    metrics = {
+        'source': 'database',
+        'test_accuracy': test_accuracy,
+        'n_features': len(model.feature_names),
+        'n_samples': int(state['class_counts'].sum()),
+        'n_validation': int(len(validation_y)),
+        'n_trees': len(forest.estimators_),
+        'fit_steps': int(state['step']),
+        'skipped_rows': int(state['skipped_rows']),
+        'class_counts': {str(c): int(n) for c, n in enumerate(state['class_counts'])},
+        'training_seconds': round(time.perf_counter() - started, 1)
+    }
+    return {'model': model, 'metrics': metrics}
@@ -1,8 +1,10 @@
 """
 Explainability Engine - Convert SHAP values to human-readable explanations
 """
-from typing import List, Dict, Tuple
-import pandas as pd
+from typing import TYPE_CHECKING, List, Dict, Tuple
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 class ExplainabilityEngine:
@@ -138,14 +140,14 @@ class ExplainabilityEngine:
     @staticmethod
     def generate_factors(
         shap_explanation: Dict,
-        feature_values: pd.Series,
+        feature_values: 'pd.Series',
         top_n: int = 4
     ) -> List[Dict]:
         """
         Generate user-friendly factor explanations
         
         Args:
-            shap_explanation: SHAP explanation from model
+            shap_explanation: Model explanation (explain_prediction)
             feature_values: Actual feature values
             top_n: Number of top factors to return
             
@@ -158,18 +160,18 @@ class ExplainabilityEngine:
         for idx, exp in enumerate(explanations):
             feature = exp['feature']
             value = exp['value']
-            shap_value = exp['shap_value']
+            contribution = exp['contribution']
             
             # Determine impact type
-            if abs(shap_value) < 0.1:
+            if abs(contribution) < 0.1:
                 factor_type = 'neutral'
                 impact = 'Low'
-            elif shap_value > 0:
+            elif contribution > 0:
                 factor_type = 'positive'
-                impact = 'High' if abs(shap_value) > 0.5 else 'Medium'
+                impact = 'High' if abs(contribution) > 0.5 else 'Medium'
             else:
                 factor_type = 'negative'
-                impact = 'High' if abs(shap_value) > 0.5 else 'Medium'
+                impact = 'High' if abs(contribution) > 0.5 else 'Medium'
             
             # Get explanation template
             if feature in ExplainabilityEngine.FEATURE_EXPLANATIONS:
@@ -196,7 +198,7 @@ class ExplainabilityEngine:
                 'description': description,
                 'impact': impact,
                 'icon': icon,
-                'shap_value': shap_value
+                'contribution': contribution
             })
         
         return factors
@@ -1,9 +1,14 @@
 """
 Feature engineering for credit trust scoring
+
+The DataFrame variants import pandas on first use; the request path
+(engineer_features_array) needs only NumPy.
 """
 import numpy as np
-import pandas as pd
-from typing import Dict, List
+from typing import TYPE_CHECKING, Dict, List, Mapping, Optional, Sequence, Union
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 class FeatureEngineer:
@@ -34,7 +39,7 @@ class FeatureEngineer:
     ]
     
     @staticmethod
-    def engineer_features(raw_data: Dict) -> pd.DataFrame:
+    def engineer_features(raw_data: Dict) -> 'pd.DataFrame':
         """
         Convert raw behavioral data into engineered features
         
@@ -44,69 +49,126 @@ class FeatureEngineer:
         Returns:
             DataFrame with engineered features
         """
-        features = raw_data.copy()
+        return FeatureEngineer.engineer_features_batch(
+            {name: [value] for name, value in raw_data.items()}
+        )
+    
+    @staticmethod
+    def engineer_features_batch(raw_data: Union['pd.DataFrame', Mapping[str, Sequence]]) -> 'pd.DataFrame':
+        """
+        Convert N rows of raw behavioral data into engineered features
+        
+        All engineered features are computed column-wise; row i of the
+        result equals engineer_features() on row i of the input.
+        
+        Args:
+            raw_data: DataFrame or mapping of column arrays of raw metrics
+            
+        Returns:
+            DataFrame with engineered features (one row per input row)
+        """
+        import pandas as pd
+        
+        features = FeatureEngineer._engineer_columns(
+            {name: np.asarray(values) for name, values in raw_data.items()}
+        )
+        
+        # Ensure all expected features are present
+        n_rows = len(features['utility_payment_months'])
+        df = pd.DataFrame({
+            feature: features[feature] if feature in features else np.zeros(n_rows)
+            for feature in FeatureEngineer.FEATURE_NAMES
+        })
+        if isinstance(raw_data, pd.DataFrame):
+            df.index = raw_data.index
+        
+        return df
+    
+    @staticmethod
+    def engineer_features_array(raw_data: Mapping[str, Union[float, Sequence[float]]],
+                                out: Optional[np.ndarray] = None,
+                                dtype=np.float32) -> np.ndarray:
+        """
+        Convert raw behavioral data into a feature matrix without pandas
         
+        This is the request-path variant of engineer_features_batch: the
+        result is a plain array in FEATURE_NAMES order that the model
+        consumes directly.
+        
+        Args:
+            raw_data: Raw metrics, scalars (one row) or column sequences
+            out: Preallocated (N, n_features) buffer to fill, e.g. reused
+                across requests; (n_features,) for a single row
+            dtype: Result dtype when out is not given
+            
+        Returns:
+            out, or a new (N, n_features) array
+        """
+        features = FeatureEngineer._engineer_columns(
+            {name: np.asarray(values, dtype=np.float64) for name, values in raw_data.items()}
+        )
+        n_rows = np.size(features['utility_payment_months'])
+        if out is None:
+            out = np.empty((n_rows, len(FeatureEngineer.FEATURE_NAMES)), dtype=dtype)
+        matrix = out.reshape(-1, len(FeatureEngineer.FEATURE_NAMES))
+        for j, feature in enumerate(FeatureEngineer.FEATURE_NAMES):
+            matrix[:, j] = features.get(feature, 0.0)
+        return out
+    
+    @staticmethod
+    def _engineer_columns(features: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Add the engineered feature columns to a dict of raw column arrays"""
         # 1. Payment Consistency Score (0-100)
         payment_score = (
             features['utility_payment_months'] * 2 +  # Months weight
             features['utility_payment_consistency'] * 50  # Consistency weight
         )
-        features['payment_consistency_score'] = min(payment_score, 100)
+        features['payment_consistency_score'] = np.minimum(payment_score, 100)
         
         # 2. Transaction Stability Score (0-100)
         # Normalize transaction count (assume 50 is good)
-        tx_normalized = min(features['monthly_transaction_count'] / 50, 1.0)
-        transaction_score = (
+        tx_normalized = np.minimum(features['monthly_transaction_count'] / 50, 1.0)
+        features['transaction_stability_score'] = (
             tx_normalized * 40 +
             features['transaction_regularity_score'] * 40 +
             (1 - features['spending_volatility']) * 20  # Lower volatility is better
         )
-        features['transaction_stability_score'] = transaction_score
         
         # 3. Savings Discipline Index (0-100)
         # Normalize balance (assume 5000 is good baseline)
-        balance_normalized = min(features['avg_month_end_balance'] / 5000, 1.0)
-        savings_score = (
+        balance_normalized = np.minimum(features['avg_month_end_balance'] / 5000, 1.0)
+        features['savings_discipline_index'] = (
             balance_normalized * 40 +
-            max(features['savings_growth_rate'], 0) * 30 +  # Only positive growth
+            np.maximum(features['savings_growth_rate'], 0) * 30 +  # Only positive growth
             features['withdrawal_discipline_score'] * 30
         )
-        features['savings_discipline_index'] = savings_score
         
         # 4. Volatility Index (0-100, lower is better, so invert)
         features['volatility_index'] = (1 - features['spending_volatility']) * 100
         
         # 5. Income Regularity Flag (binary)
-        features['income_regularity_flag'] = 1 if (
-            features['income_regularity_score'] >= 0.7 and
-            features['income_stability_months'] >= 6
-        ) else 0
+        features['income_regularity_flag'] = np.where(
+            (features['income_regularity_score'] >= 0.7) &
+            (features['income_stability_months'] >= 6),
+            1, 0
+        )
         
         # 6. Tenure Score (0-100)
         # Longer tenure is better
-        account_score = min(features['account_tenure_months'] / 60, 1.0) * 50
-        address_score = min(features['address_stability_years'] / 5, 1.0) * 50
+        account_score = np.minimum(features['account_tenure_months'] / 60, 1.0) * 50
+        address_score = np.minimum(features['address_stability_years'] / 5, 1.0) * 50
         features['tenure_score'] = account_score + address_score
         
         # 7. Financial Health Score (composite, 0-100)
-        health_score = (
+        features['financial_health_score'] = (
             features['payment_consistency_score'] * 0.25 +
             features['transaction_stability_score'] * 0.20 +
             features['savings_discipline_index'] * 0.25 +
             features['volatility_index'] * 0.15 +
             features['tenure_score'] * 0.15
         )
-        features['financial_health_score'] = health_score
-        
-        # Convert to DataFrame
-        df = pd.DataFrame([features])
-        
-        # Ensure all expected features are present
-        for feature in FeatureEngineer.FEATURE_NAMES:
-            if feature not in df.columns:
-                df[feature] = 0.0
         
-        return df[FeatureEngineer.FEATURE_NAMES]
+        return features
     
     @staticmethod
     def get_feature_descriptions() -> Dict[str, str]:
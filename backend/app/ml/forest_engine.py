@@ -0,0 +1,329 @@
+"""
+Flattened random-forest inference engine
+
+Exports a fitted RandomForestClassifier (plus its StandardScaler) into flat
+node arrays and evaluates all trees with vectorized level-by-level
+traversal, avoiding sklearn's per-call validation and joblib dispatch.
+
+Numerical identity with sklearn:
+- sklearn scales features in float64, casts them to float32 and tests
+  float32(x_scaled) <= threshold. That predicate is monotone in the raw
+  value, so each threshold is folded into the largest raw float64 value
+  that still goes left, found by exact bisection over float64 ordering.
+- Leaf class distributions are normalized exactly as
+  DecisionTreeClassifier.predict_proba does, summed tree by tree in
+  estimator order and divided by the number of trees, as the forest does.
+
+Path attribution (Saabas): every edge parent -> child changes the class
+distribution by value[child] - value[parent], credited to the parent's
+split feature. These deltas are precomputed per node, so a row's
+attribution is the sum of deltas along its decision paths, averaged over
+trees. Bias plus contributions equals the predicted probabilities.
+"""
+from typing import Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+_SIGN_BIT = np.uint64(1 << 63)
+_FINITE_MIN = np.finfo(np.float64).min
+_FINITE_MAX = np.finfo(np.float64).max
+
+
+def _ordered_keys(values: np.ndarray) -> np.ndarray:
+    """Map float64 values to uint64 keys with the same ordering"""
+    bits = np.ascontiguousarray(values, dtype=np.float64).view(np.uint64)
+    return np.where(bits & _SIGN_BIT, ~bits, bits | _SIGN_BIT)
+
+
+def _from_ordered_keys(keys: np.ndarray) -> np.ndarray:
+    bits = np.where(keys & _SIGN_BIT, keys & ~_SIGN_BIT, ~keys)
+    return bits.view(np.float64)
+
+
+def fold_thresholds(thresholds: np.ndarray, mean: np.ndarray, scale: np.ndarray,
+                    dtype=np.float32) -> np.ndarray:
+    """
+    Fold a StandardScaler into split thresholds
+
+    For each split returns the largest float64 raw value x with
+    dtype((x - mean) / scale) <= threshold, so x_raw <= folded reproduces
+    sklearn's decision exactly (-inf / +inf when no / every value goes left).
+
+    Args:
+        thresholds: Split thresholds in scaled space
+        mean: Scaler mean per split
+        scale: Scaler scale per split (positive)
+        dtype: Precision the estimator compares scaled features in
+            (float32 for decision trees, float64 for histogram boosting)
+    """
+    thresholds = np.asarray(thresholds, dtype=np.float64)
+
+    def goes_left(keys):
+        x = _from_ordered_keys(keys)
+        return ((x - mean) / scale).astype(dtype) <= thresholds
+
+    with np.errstate(over='ignore', invalid='ignore'):
+        lo = _ordered_keys(np.full(thresholds.shape, _FINITE_MIN))
+        hi = _ordered_keys(np.full(thresholds.shape, _FINITE_MAX))
+        all_left = goes_left(hi)
+        none_left = ~goes_left(lo)
+
+        # Invariant: goes_left(lo) and not goes_left(hi)
+        active = ~(all_left | none_left)
+        while True:
+            gap = hi - lo
+            pending = active & (gap > 1)
+            if not pending.any():
+                break
+            mid = lo + gap // np.uint64(2)
+            left = goes_left(mid)
+            lo = np.where(pending & left, mid, lo)
+            hi = np.where(pending & ~left, mid, hi)
+
+    folded = _from_ordered_keys(lo)
+    folded = np.where(all_left, np.inf, folded)
+    return np.where(none_left, -np.inf, folded)
+
+
+def path_deltas(feature: np.ndarray, left: np.ndarray, right: np.ndarray,
+                value: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Per-node contribution deltas for path attribution
+
+    Returns:
+        delta: value[node] - value[parent] (zero for roots), (n_nodes, n_classes)
+        edge_feature: split feature of the parent (-1 for roots)
+    """
+    node_ids = np.arange(len(feature))
+    internal = left != node_ids
+    parent = np.full(len(feature), -1, dtype=np.int64)
+    parent[left[internal]] = node_ids[internal]
+    parent[right[internal]] = node_ids[internal]
+
+    has_parent = parent >= 0
+    delta = np.zeros_like(value)
+    delta[has_parent] = value[has_parent] - value[parent[has_parent]]
+    edge_feature = np.where(has_parent, feature[np.maximum(parent, 0)], -1).astype(np.int32)
+    return delta, edge_feature
+
+
+class FlatForest:
+    """
+    Random forest stored as flat node arrays
+
+    Node arrays are global across trees. Leaves point to themselves with
+    an infinite threshold, so every row can take max_depth steps.
+    """
+
+    ARRAY_NAMES = ('feature', 'threshold', 'left', 'right', 'value', 'roots', 'classes')
+    ATTRIBUTION_ARRAY_NAMES = ('delta', 'edge_feature')
+
+    def __init__(self, feature: np.ndarray, threshold: np.ndarray, left: np.ndarray, right: np.ndarray,
+                 value: np.ndarray, roots: np.ndarray, classes: np.ndarray, max_depth: int,
+                 delta: Optional[np.ndarray] = None, edge_feature: Optional[np.ndarray] = None,
+                 n_features: Optional[int] = None, block_rows: int = 4096):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.classes = classes
+        self.max_depth = int(max_depth)
+        self.n_features = int(n_features) if n_features is not None else int(feature.max()) + 1
+        self.block_rows = block_rows
+        if delta is None or edge_feature is None:
+            delta, edge_feature = path_deltas(feature, left, right, value)
+        self.delta = delta
+        self.edge_feature = edge_feature
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @classmethod
+    def from_sklearn(cls, forest, scaler=None) -> 'FlatForest':
+        """
+        Flatten a fitted RandomForestClassifier
+
+        Args:
+            forest: Fitted RandomForestClassifier (single output)
+            scaler: Fitted StandardScaler applied before the forest, folded
+                into the thresholds; None if the forest sees raw features
+        """
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            n_nodes = tree.node_count
+            is_leaf = tree.children_left == -1
+            node_ids = np.arange(n_nodes)
+
+            # Normalized class distribution per node, as predict_proba computes it
+            value = tree.value[:, 0, :forest.n_classes_].astype(np.float64)
+            normalizer = value.sum(axis=1)
+            normalizer[normalizer == 0.0] = 1.0
+            value = value / normalizer[:, np.newaxis]
+
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+            lefts.append(np.where(is_leaf, node_ids, tree.children_left) + offset)
+            rights.append(np.where(is_leaf, node_ids, tree.children_right) + offset)
+            values.append(value)
+            roots.append(offset)
+            offset += n_nodes
+            max_depth = max(max_depth, tree.max_depth)
+
+        feature = np.concatenate(features).astype(np.int32)
+        threshold = np.concatenate(thresholds).astype(np.float64)
+        if scaler is not None:
+            internal = np.isfinite(threshold)
+            threshold[internal] = fold_thresholds(
+                threshold[internal],
+                scaler.mean_[feature[internal]],
+                scaler.scale_[feature[internal]]
+            )
+
+        return cls(
+            feature=feature,
+            threshold=threshold,
+            left=np.concatenate(lefts).astype(np.int32),
+            right=np.concatenate(rights).astype(np.int32),
+            value=np.concatenate(values),
+            roots=np.array(roots, dtype=np.int32),
+            classes=np.asarray(forest.classes_),
+            max_depth=max_depth,
+            n_features=forest.n_features_in_
+        )
+
+    def _descend(self, block: np.ndarray) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """Yield (node, next_node) arrays of shape (rows, n_trees) for each level"""
+        if len(block) == 1:
+            # Single row: plain gathers, no row broadcasting
+            x = block[0]
+            nodes = self.roots
+            for _ in range(self.max_depth):
+                go_left = x[self.feature[nodes]] <= self.threshold[nodes]
+                next_nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+                yield nodes[np.newaxis, :], next_nodes[np.newaxis, :]
+                nodes = next_nodes
+            return
+
+        rows = np.arange(len(block))[:, np.newaxis]
+        nodes = np.broadcast_to(self.roots, (len(block), self.n_trees))
+        for _ in range(self.max_depth):
+            go_left = block[rows, self.feature[nodes]] <= self.threshold[nodes]
+            next_nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+            yield nodes, next_nodes
+            nodes = next_nodes
+
+    def _blocks(self, X: np.ndarray) -> Iterator[Tuple[int, np.ndarray]]:
+        # float32 input is compared against the float64 thresholds without a
+        # copy; results equal the float64 path on the float32-rounded values
+        X = np.asarray(X)
+        if X.dtype != np.float32:
+            X = X.astype(np.float64, copy=False)
+        if X.ndim == 1:
+            X = X[np.newaxis, :]
+        for start in range(0, len(X), self.block_rows):
+            yield start, X[start:start + self.block_rows]
+
+    def apply(self, X: np.ndarray) -> np.ndarray:
+        """
+        Leaf node (global index) reached in every tree
+
+        Args:
+            X: Raw feature matrix (n_rows, n_features), float64 or float32
+
+        Returns:
+            (n_rows, n_trees) array of leaf indices
+        """
+        blocks = []
+        for _, block in self._blocks(X):
+            nodes = np.broadcast_to(self.roots, (len(block), self.n_trees))
+            for _, nodes in self._descend(block):
+                pass
+            blocks.append(nodes)
+        return np.concatenate(blocks) if len(blocks) != 1 else blocks[0]
+
+    @property
+    def tree_normalizer(self) -> float:
+        """Divisor of the per-tree sums (the forest averages its trees)"""
+        return self.n_trees
+
+    @property
+    def bias(self) -> np.ndarray:
+        """Forest-average root class distribution (the attribution base value)"""
+        return np.cumsum(self.value[self.roots], axis=0)[-1] / self.n_trees
+
+    def contributions(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Saabas path attribution for every row and class
+
+        Args:
+            X: Raw feature matrix (n_rows, n_features), float64 or float32
+
+        Returns:
+            bias: (n_classes,) base value per class
+            contributions: (n_rows, n_features, n_classes); bias plus the
+                sum over features equals predict_proba up to rounding
+        """
+        n_features, n_classes = self.n_features, self.value.shape[1]
+        results = []
+        for _, block in self._blocks(X):
+            n_rows = len(block)
+            row_ids = np.arange(n_rows)[:, np.newaxis]
+            flat_index = [np.empty(0, dtype=np.int64)]
+            weights = [np.empty((0, n_classes))]
+            for nodes, next_nodes in self._descend(block):
+                moved = next_nodes != nodes  # leaves loop onto themselves
+                stepped = next_nodes[moved]
+                flat_index.append((np.broadcast_to(row_ids, moved.shape)[moved] * n_features
+                                   + self.edge_feature[stepped]))
+                weights.append(self.delta[stepped])
+            flat_index = np.concatenate(flat_index)
+            weights = np.concatenate(weights)
+            block_contributions = np.empty((n_rows, n_features, n_classes))
+            for c in range(n_classes):
+                block_contributions[:, :, c] = np.bincount(
+                    flat_index, weights=weights[:, c], minlength=n_rows * n_features
+                ).reshape(n_rows, n_features)
+            results.append(block_contributions / self.tree_normalizer)
+        return self.bias, np.concatenate(results)
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Class probabilities, bit-identical to RandomForestClassifier.predict_proba"""
+        leaf_values = self.value[self.apply(X)]  # (n_rows, n_trees, n_classes)
+        # cumsum accumulates strictly in tree order, like the forest's running sum
+        return np.cumsum(leaf_values, axis=1)[:, -1, :] / self.n_trees
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.classes[self.predict_proba(X).argmax(axis=1)]
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        arrays = {name: getattr(self, name) for name in self.ARRAY_NAMES + self.ATTRIBUTION_ARRAY_NAMES}
+        arrays['max_depth'] = np.array(self.max_depth)
+        arrays['n_features'] = np.array(self.n_features)
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays) -> 'FlatForest':
+        """Rebuild from to_arrays() output (attribution deltas are recomputed if absent)"""
+        optional = {name: arrays[name] for name in cls.ATTRIBUTION_ARRAY_NAMES if name in arrays}
+        if 'n_features' in arrays:
+            optional['n_features'] = int(arrays['n_features'])
+        return cls(
+            max_depth=int(arrays['max_depth']),
+            **{name: arrays[name] for name in cls.ARRAY_NAMES},
+            **optional
+        )
+
+    def save(self, path: str):
+        """Write the node arrays to an uncompressed .npz file"""
+        np.savez(path, **self.to_arrays())
+
+    @classmethod
+    def load(cls, path: str, mmap_mode: Optional[str] = None) -> 'FlatForest':
+        with np.load(path, mmap_mode=mmap_mode) as arrays:
+            return cls.from_arrays({name: arrays[name] for name in arrays.files})
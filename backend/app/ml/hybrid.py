@@ -0,0 +1,80 @@
+"""
+Hybrid rule + model scoring
+Calibrates the model's 300-900 trust score onto the rule engine's scale
+and blends the two into one advisory score
+"""
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ..core.config import settings
+from ..rules.scoring_engine import ScoringEngine
+from .explainability import ExplainabilityEngine
+from .feature_engineering import FeatureEngineer
+
+
+def calibrate_model_score(model_score: float, scale: Optional[float] = None,
+                          offset: Optional[float] = None) -> float:
+    """
+    Map a model trust score onto the rule engine's score range
+
+    Args:
+        model_score: Model trust score (300-900)
+        scale: Linear calibration slope (default: settings.HYBRID_MODEL_SCALE)
+        offset: Linear calibration intercept (default: settings.HYBRID_MODEL_OFFSET)
+    """
+    scale = settings.HYBRID_MODEL_SCALE if scale is None else scale
+    offset = settings.HYBRID_MODEL_OFFSET if offset is None else offset
+    return float(np.clip(scale * model_score + offset, ScoringEngine.SCORE_MIN, ScoringEngine.SCORE_MAX))
+
+
+def blend_scores(rule_score: int, model_score: Optional[float], weight: Optional[float] = None,
+                 scale: Optional[float] = None, offset: Optional[float] = None) -> int:
+    """
+    Weighted blend of the rule score and the calibrated model score
+
+    Without a model score (rule-only fallback) the rule score is returned.
+
+    Args:
+        rule_score: Rule engine trust score
+        model_score: Model trust score (uncalibrated), or None
+        weight: Model weight in [0, 1] (default: settings.HYBRID_MODEL_WEIGHT)
+    """
+    if model_score is None:
+        return int(rule_score)
+    weight = settings.HYBRID_MODEL_WEIGHT if weight is None else weight
+    calibrated = calibrate_model_score(model_score, scale, offset)
+    return int(round((1.0 - weight) * rule_score + weight * calibrated))
+
+
+def model_factors(features: np.ndarray, contributions: np.ndarray, predicted_class: int,
+                  top_n: int = 4) -> List[Dict]:
+    """
+    User-facing factors from the model's feature contributions
+
+    Contributions explain the predicted risk class; for the moderate and
+    high risk classes they are negated, so a positive factor always
+    supports a better score.
+
+    Args:
+        features: Engineered feature row in FeatureEngineer.FEATURE_NAMES order
+            (float32 or float64)
+        contributions: Per-feature contributions for the predicted class
+        predicted_class: 0=Low, 1=Moderate, 2=High risk
+        top_n: Number of factors to return
+    """
+    direction = 1.0 if predicted_class == 0 else -1.0
+    # str() gives the shortest repr of the row's dtype, so float32 rows
+    # read 0.95 rather than 0.949999988
+    values = [float(str(value)) for value in features]
+    explanations = [
+        {
+            'feature': name,
+            # Counts read better as "14 months" than "14.0 months"
+            'value': int(value) if value.is_integer() else value,
+            'contribution': direction * float(contribution)
+        }
+        for name, value, contribution in zip(FeatureEngineer.FEATURE_NAMES, values, contributions)
+    ]
+    explanations.sort(key=lambda e: abs(e['contribution']), reverse=True)
+    return ExplainabilityEngine.generate_factors({'explanations': explanations}, None, top_n=top_n)
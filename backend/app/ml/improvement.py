@@ -1,8 +1,10 @@
 """
 Improvement Recommendation Engine
 """
-from typing import List, Dict
-import pandas as pd
+from typing import TYPE_CHECKING, List, Dict
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 class ImprovementEngine:
@@ -12,7 +14,7 @@ class ImprovementEngine:
     
     @staticmethod
     def generate_recommendations(
-        feature_values: pd.Series,
+        feature_values: 'pd.Series',
         shap_explanation: Dict,
         current_score: int
     ) -> List[Dict]:
@@ -21,7 +23,7 @@ class ImprovementEngine:
         
         Args:
             feature_values: User's feature values
-            shap_explanation: SHAP explanation
+            shap_explanation: Model explanation (explain_prediction)
             current_score: Current trust score
             
         Returns:
@@ -29,14 +31,14 @@ class ImprovementEngine:
         """
         recommendations = []
         
-        # Analyze weak points from SHAP
+        # Analyze weak points from the feature contributions
         weak_features = [
             exp for exp in shap_explanation['explanations']
-            if exp['shap_value'] < 0  # Negative contributors
+            if exp['contribution'] < 0  # Negative contributors
         ]
         
         # Sort by impact (most negative first)
-        weak_features.sort(key=lambda x: x['shap_value'])
+        weak_features.sort(key=lambda x: x['contribution'])
         
         # Generate specific recommendations
         for weak in weak_features[:5]:  # Top 5 weak points
@@ -0,0 +1,308 @@
+"""
+Micro-batching inference server for the credit trust model
+
+Scoring one row at a time pays the full per-call overhead of prediction
+and attribution for every request. The server queues concurrent requests,
+collects them for up to max_wait_ms or max_batch_size rows, runs a single
+batched predict and explain, and resolves each request's future with its
+own row of the result.
+
+Batches run on one of three executors:
+    inline   on the event loop (lowest latency for tiny models)
+    thread   in a thread pool (numpy releases the GIL for most of the work)
+    process  in a spawned process pool; workers memory-map the same model
+             artifact, so they add little memory and never contend for the
+             API's GIL
+"""
+import asyncio
+import logging
+import multiprocessing as mp
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, List, Mapping, NamedTuple, Optional, Sequence, Union
+
+import numpy as np
+
+from ..core.config import settings
+from ..core.metrics import INFERENCE_BATCH_LATENCY, INFERENCE_BATCH_SIZE, INFERENCE_QUEUE_WAIT
+from .feature_engineering import FeatureEngineer
+from .model import CreditTrustModel
+from .registry import model_loader
+
+logger = logging.getLogger(__name__)
+
+EXECUTORS = ('inline', 'thread', 'process')
+
+
+class ModelUnavailableError(RuntimeError):
+    """Raised when no model version is loaded"""
+
+
+class InferenceResult(NamedTuple):
+    """Model output for one request"""
+    trust_score: int
+    risk_level: str
+    confidence: float
+    contributions: Optional[np.ndarray]
+    base_value: Optional[float]
+    predicted_class: Optional[int]
+    method: Optional[str]
+    model_version: Optional[str]
+
+
+class _Pending(NamedTuple):
+    row: np.ndarray
+    explain: bool
+    future: asyncio.Future
+    enqueued_at: float
+
+
+def score_batch(model: CreditTrustModel, X: np.ndarray, explain: bool = True,
+                method: Optional[str] = None) -> Dict[str, np.ndarray]:
+    """
+    Score and optionally explain N rows in one pass
+
+    Args:
+        model: Loaded model
+        X: Raw features (N x n_features) in FeatureEngineer.FEATURE_NAMES order
+        explain: Also compute per-feature contributions
+        method: Attribution method (default: settings.ML_ATTRIBUTION_METHOD)
+    """
+    return model.predict_array(X, explain, method)
+
+
+# Model held by each process-pool worker, keyed by its artifact path
+_worker_model: Optional[CreditTrustModel] = None
+
+
+def _score_in_worker(artifact_path: str, X: np.ndarray, explain: bool,
+                     method: Optional[str]) -> Dict[str, np.ndarray]:
+    global _worker_model
+    if _worker_model is None or _worker_model.artifact.path != artifact_path:
+        # The parent verified the checksum before serving this version
+        _worker_model = CreditTrustModel.load_artifact(artifact_path, verify=False)
+    return score_batch(_worker_model, X, explain, method)
+
+
+class InferenceServer:
+    """
+    Collects concurrent scoring requests into micro-batches
+
+    Must be started and used from the same event loop.
+    """
+
+    def __init__(self, model_source: Callable[[], Optional[CreditTrustModel]],
+                 max_batch_size: int = 64, max_wait_ms: float = 2.0,
+                 executor: str = 'thread', workers: int = 1, method: Optional[str] = None):
+        """
+        Args:
+            model_source: Returns the model to use for the next batch
+                (e.g. the hot-swap loader's current model)
+            max_batch_size: Upper bound on rows per batch
+            max_wait_ms: How long the first request of a batch waits for company
+            executor: "inline", "thread" or "process"
+            workers: Batches in flight at once (pool size for thread/process)
+            method: Attribution method (default: settings.ML_ATTRIBUTION_METHOD)
+        """
+        if executor not in EXECUTORS:
+            raise ValueError(f"Unknown inference executor: {executor}")
+        self.model_source = model_source
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.executor = executor
+        self.workers = workers if executor != 'inline' else 1
+        self.method = method
+        self._queue: Optional[asyncio.Queue] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._collector: Optional[asyncio.Task] = None
+        self._batches: set = set()
+        self._pool: Optional[Executor] = None
+        self._buffers: List[np.ndarray] = []
+
+    @property
+    def running(self) -> bool:
+        return self._collector is not None and not self._collector.done()
+
+    def start(self):
+        """Start collecting batches on the running event loop"""
+        if self.running:
+            return
+        if self._pool is None and self.executor == 'thread':
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='nexis-inference')
+        elif self._pool is None and self.executor == 'process':
+            # spawn: forking a process that runs threads is unsafe
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=mp.get_context('spawn'))
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.workers)
+        # One preallocated float32 batch buffer per slot; a batch returns its
+        # buffer when it finishes
+        self._buffers = [
+            np.empty((self.max_batch_size, len(FeatureEngineer.FEATURE_NAMES)), dtype=np.float32)
+            for _ in range(self.workers)
+        ]
+        self._collector = asyncio.get_running_loop().create_task(self._collect())
+
+    async def stop(self):
+        """Finish in-flight batches and release the pool"""
+        if self._collector is not None:
+            self._collector.cancel()
+            try:
+                await self._collector
+            except asyncio.CancelledError:
+                pass
+            self._collector = None
+        if self._batches:
+            await asyncio.gather(*self._batches, return_exceptions=True)
+        while self._queue is not None and not self._queue.empty():
+            pending = self._queue.get_nowait()
+            if not pending.future.done():
+                pending.future.set_exception(ModelUnavailableError("Inference server stopped"))
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    async def warmup(self) -> bool:
+        """
+        Run one request end to end (starts pool threads or processes and
+        maps the model in them)
+
+        Returns:
+            False if no model is loaded
+        """
+        if self.model_source() is None:
+            return False
+        await self.submit(np.zeros(len(FeatureEngineer.FEATURE_NAMES)))
+        return True
+
+    async def submit(self, features: Union[Mapping[str, float], Sequence[float], np.ndarray],
+                     explain: bool = True) -> InferenceResult:
+        """
+        Score one row, batched with whatever else arrives meanwhile
+
+        Args:
+            features: Engineered features by name, or a row in
+                FeatureEngineer.FEATURE_NAMES order
+            explain: Also return per-feature contributions
+        """
+        if not self.running:
+            self.start()
+        if isinstance(features, Mapping):
+            row = np.array([features[name] for name in FeatureEngineer.FEATURE_NAMES], dtype=np.float32)
+        else:
+            row = np.asarray(features, dtype=np.float32).reshape(-1)
+        if len(row) != len(FeatureEngineer.FEATURE_NAMES):
+            raise ValueError(f"Expected {len(FeatureEngineer.FEATURE_NAMES)} features, got {len(row)}")
+
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait(_Pending(row, explain, future, time.perf_counter()))
+        return await future
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            # Wait for a free worker first: while all are busy, requests keep
+            # queueing and the next batch grows instead of waiting in line
+            await self._slots.acquire()
+            batch: List[_Pending] = []
+            try:
+                batch.append(await self._queue.get())
+                deadline = loop.time() + self.max_wait
+                while len(batch) < self.max_batch_size:
+                    if not self._queue.empty():
+                        batch.append(self._queue.get_nowait())
+                        continue
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+            except BaseException:
+                # Cancelled (stop()) with a half-collected batch: its requests
+                # are no longer in the queue, so fail them here
+                for pending in batch:
+                    if not pending.future.done():
+                        pending.future.set_exception(ModelUnavailableError("Inference server stopped"))
+                self._slots.release()
+                raise
+            task = loop.create_task(self._run_batch(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    @staticmethod
+    def _fail(batch: List[_Pending], exc: Exception):
+        for pending in batch:
+            if not pending.future.done():
+                pending.future.set_exception(exc)
+
+    async def _run_batch(self, batch: List[_Pending]):
+        buffer = None
+        try:
+            model = self.model_source()
+            if model is None:
+                raise ModelUnavailableError("No model version is loaded")
+            buffer = self._buffers.pop()
+            X = buffer[:len(batch)]
+            for i, pending in enumerate(batch):
+                X[i] = pending.row
+            explain = any(pending.explain for pending in batch)
+
+            started = time.perf_counter()
+            INFERENCE_BATCH_SIZE.labels(self.executor).observe(len(batch))
+            queue_wait = INFERENCE_QUEUE_WAIT.labels(self.executor)
+            for pending in batch:
+                queue_wait.observe(started - pending.enqueued_at)
+
+            if self.executor == 'inline':
+                result = score_batch(model, X, explain, self.method)
+            elif self.executor == 'thread':
+                result = await asyncio.get_running_loop().run_in_executor(
+                    self._pool, score_batch, model, X, explain, self.method
+                )
+            else:
+                if model.artifact is None:
+                    raise ModelUnavailableError("Process executor needs an artifact-loaded model")
+                result = await asyncio.get_running_loop().run_in_executor(
+                    self._pool, _score_in_worker, model.artifact.path, X, explain, self.method
+                )
+            INFERENCE_BATCH_LATENCY.labels(self.executor).observe(time.perf_counter() - started)
+
+            for i, pending in enumerate(batch):
+                if pending.future.done():
+                    continue
+                pending.future.set_result(InferenceResult(
+                    trust_score=int(result['trust_score'][i]),
+                    risk_level=str(result['risk_level'][i]),
+                    confidence=float(result['confidence'][i]),
+                    contributions=result['contributions'][i] if explain else None,
+                    base_value=float(result['base_values'][i]) if explain else None,
+                    predicted_class=int(result['predicted_class'][i]) if explain else None,
+                    method=result['method'] if explain else None,
+                    model_version=model.version
+                ))
+        except ModelUnavailableError as exc:
+            # Expected while no model is trained or loaded: callers fall back
+            logger.debug(f"Inference batch of {len(batch)} skipped: {exc}")
+            self._fail(batch, exc)
+        except Exception as exc:
+            logger.error(f"Inference batch of {len(batch)} failed: {exc}")
+            self._fail(batch, exc)
+        finally:
+            if buffer is not None:
+                self._buffers.append(buffer)
+            self._slots.release()
+
+
+def create_inference_server() -> InferenceServer:
+    """Inference server over the registry's active model, configured from settings"""
+    return InferenceServer(
+        lambda: model_loader.model,
+        max_batch_size=settings.ML_BATCH_MAX_SIZE,
+        max_wait_ms=settings.ML_BATCH_MAX_WAIT_MS,
+        executor=settings.ML_BATCH_EXECUTOR,
+        workers=settings.ML_BATCH_WORKERS
+    )
+
+
+inference_server = create_inference_server()
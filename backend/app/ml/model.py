@@ -1,40 +1,193 @@
 """
 Credit Trust Scoring Model
+
+Two backends share one API: a random forest and multiclass histogram
+gradient boosting (settings.MODEL_BACKEND). Either is served from flat
+node arrays (FlatForest / FlatBoosting) with path attribution. Boosted
+contributions are computed in raw-score (log-odds) space and rescaled to
+the predicted class's probability, so both backends explain on one scale.
+Large batches go to the sklearn estimator when it is available, whose
+compiled traversal overtakes the NumPy engines (SKLEARN_MIN_ROWS).
+
+pandas, scikit-learn, SHAP and joblib are imported on first use (training,
+exact SHAP, pickled models); serving a flattened or artifact-loaded model
+needs only NumPy.
 """
 import numpy as np
-import pandas as pd
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import train_test_split
-import joblib
-import shap
-from typing import Tuple, Dict
+import importlib.util
+import io
+import sys
+from typing import TYPE_CHECKING, Tuple, Dict, Optional
 import os
+from datetime import datetime, timezone
+
+from ..core.config import settings
+from .artifact import Artifact, ArtifactError, write_artifact
+from .feature_engineering import FeatureEngineer
+from .boosting_engine import FlatBoosting
+from .forest_engine import FlatForest
+
+# Re-exported for existing imports (train_model.py, scripts)
+from .synthetic_data import (
+    PROFILE_DISTRIBUTIONS,
+    PROFILE_WEIGHTS,
+    generate_synthetic_training_data
+)
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def _is_dataframe(X) -> bool:
+    """isinstance(X, pd.DataFrame) without importing pandas"""
+    pd = sys.modules.get('pandas')
+    return pd is not None and isinstance(X, pd.DataFrame)
+
+
+# Flat inference engine per model backend
+FLAT_ENGINES = {
+    'random_forest': FlatForest,
+    'hist_gradient_boosting': FlatBoosting
+}
+
+
+def _backend_of(estimator) -> str:
+    """Model backend of a fitted sklearn estimator"""
+    if type(estimator).__name__ == 'HistGradientBoostingClassifier':
+        return 'hist_gradient_boosting'
+    return 'random_forest'
+
+
+def _raw_to_probability(contributions: np.ndarray, raw_base: np.ndarray, probabilities: np.ndarray,
+                        predicted_index: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Rescale predicted-class raw-score (log-odds) contributions to probability
+    
+    Each row is scaled by (p - p0) / (z - z0): z and p are the predicted
+    class's raw score and probability, z0 and p0 the same at the base
+    value. The contributions then sum to p - p0, like the forest's. Where
+    softmax moves the probability against the class's own raw score (other
+    classes moved more), the local slope p * (1 - p) is used instead.
+    
+    Args:
+        contributions: Predicted-class raw contributions (N x n_features)
+        raw_base: Base raw score per class (n_classes,)
+        probabilities: Class probabilities (N x n_classes)
+        predicted_index: Predicted class column per row (N,)
+    
+    Returns:
+        Tuple of (contributions, base_values) on the probability scale
+    """
+    rows = np.arange(len(predicted_index))
+    base_probabilities = np.exp(raw_base - raw_base.max())
+    base_probabilities /= base_probabilities.sum()
+    p = probabilities[rows, predicted_index]
+    p0 = base_probabilities[predicted_index]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scale = (p - p0) / contributions.sum(axis=1)
+    scale = np.where(np.isfinite(scale) & (scale > 0), scale, p * (1 - p))
+    return contributions * scale[:, np.newaxis], p0
 
 
 class CreditTrustModel:
     """
     Explainable credit trust scoring model
-    Uses Random Forest for interpretability and stability
+    Uses Random Forest (default) or histogram gradient boosting
     """
     
-    def __init__(self):
-        self.model = None
-        self.scaler = None
+    # Trust score band per risk category: base score and width within the band
+    BAND_BASE_SCORES = np.array([700, 500, 300])
+    BAND_SCORE_RANGES = np.array([200, 199, 199])
+    
+    # Tree parameters shared by train() and the out-of-core trainer
+    FOREST_PARAMS = {
+        'max_depth': 10,
+        'min_samples_split': 20,
+        'min_samples_leaf': 10,
+        'random_state': 42
+    }
+    
+    # Batch size from which predict_proba uses the sklearn estimator instead
+    # of the flat engine, per backend: the crossovers measured with
+    # benchmarks/forest_inference.py (boosting has many more trees to walk)
+    SKLEARN_MIN_ROWS = {
+        'random_forest': 640,
+        'hist_gradient_boosting': 32
+    }
+    
+    # Histogram gradient boosting defaults (multiclass: one tree per class
+    # and iteration)
+    BOOSTING_PARAMS = {
+        'max_iter': 200,
+        'learning_rate': 0.1,
+        'max_leaf_nodes': 31,
+        'min_samples_leaf': 20,
+        'early_stopping': False,
+        'random_state': 42
+    }
+    
+    def __init__(self, backend: Optional[str] = None):
+        """
+        Args:
+            backend: "random_forest" or "hist_gradient_boosting"
+                (default: settings.MODEL_BACKEND)
+        """
+        self.backend = backend or settings.MODEL_BACKEND
+        if self.backend not in FLAT_ENGINES:
+            raise ValueError(f"Unknown model backend: {self.backend}")
+        self._model = None
+        self._scaler = None
         self.explainer = None
         self.feature_names = None
+        self.forest = None
+        self.artifact = None
+        self.version = None
+    
+    # The sklearn estimator and scaler are only needed for exact SHAP and
+    # the non-flattened fallback; artifact-loaded models deserialize them
+    # from the embedded blob on first access.
+    @property
+    def model(self):
+        if self._model is None and self.artifact is not None:
+            self._load_embedded_estimators()
+        return self._model
+    
+    @model.setter
+    def model(self, value):
+        self._model = value
+    
+    @property
+    def scaler(self):
+        if self._scaler is None and self.artifact is not None:
+            self._load_embedded_estimators()
+        return self._scaler
+    
+    @scaler.setter
+    def scaler(self, value):
+        self._scaler = value
+    
+    def _load_embedded_estimators(self):
+        import joblib
+        estimators = joblib.load(io.BytesIO(self.artifact.blob('sklearn')))
+        self._model = estimators['model']
+        self._scaler = estimators['scaler']
         
-    def train(self, X: pd.DataFrame, y: np.ndarray) -> Dict:
+    def train(self, X: 'pd.DataFrame', y: np.ndarray, params: Optional[Dict] = None) -> Dict:
         """
         Train the credit trust model
         
         Args:
             X: Feature DataFrame
             y: Target labels (risk categories: 0=Low, 1=Moderate, 2=High)
+            params: Estimator parameters overriding the backend defaults
+                (e.g. the configuration chosen by app.ml.tuning)
             
         Returns:
             Training metrics
         """
+        from sklearn.model_selection import train_test_split
+        from sklearn.preprocessing import StandardScaler
+        
         self.feature_names = X.columns.tolist()
         
         # Split data
@@ -47,20 +200,32 @@ class CreditTrustModel:
         X_train_scaled = self.scaler.fit_transform(X_train)
         X_test_scaled = self.scaler.transform(X_test)
         
-        # Train Random Forest (interpretable and stable)
-        self.model = RandomForestClassifier(
-            n_estimators=100,
-            max_depth=10,
-            min_samples_split=20,
-            min_samples_leaf=10,
-            random_state=42,
-            class_weight='balanced'  # Handle imbalanced data
-        )
+        if self.backend == 'hist_gradient_boosting':
+            from sklearn.ensemble import HistGradientBoostingClassifier
+            self.model = HistGradientBoostingClassifier(**{
+                **self.BOOSTING_PARAMS,
+                'class_weight': 'balanced',
+                **(params or {})
+            })
+        else:
+            # Train Random Forest (interpretable and stable)
+            from sklearn.ensemble import RandomForestClassifier
+            self.model = RandomForestClassifier(**{
+                'n_estimators': 100,
+                **self.FOREST_PARAMS,
+                'class_weight': 'balanced',  # Handle imbalanced data
+                **(params or {})
+            })
         
         self.model.fit(X_train_scaled, y_train)
         
-        # Create SHAP explainer
-        self.explainer = shap.TreeExplainer(self.model)
+        # Create SHAP explainer (built on first use for boosting)
+        if self.backend == 'random_forest':
+            import shap
+            self.explainer = shap.TreeExplainer(self.model)
+        
+        # Flattened trees for fast inference
+        self.forest = self._flatten()
         
         # Evaluate
         train_score = self.model.score(X_train_scaled, y_train)
@@ -73,7 +238,26 @@ class CreditTrustModel:
             'n_samples': len(X)
         }
     
-    def predict_score(self, X: pd.DataFrame) -> Tuple[int, str, float]:
+    def _flatten(self):
+        """Flat inference engine for the fitted estimator and scaler"""
+        return FLAT_ENGINES[self.backend].from_sklearn(self.model, self.scaler)
+    
+    @classmethod
+    def from_estimators(cls, estimator, scaler, feature_names=None) -> 'CreditTrustModel':
+        """
+        Wrap an already fitted estimator and scaler (e.g. from incremental training)
+        
+        The backend follows the estimator type; the SHAP explainer is built
+        on first use.
+        """
+        model = cls(backend=_backend_of(estimator))
+        model.model = estimator
+        model.scaler = scaler
+        model.feature_names = list(feature_names or FeatureEngineer.FEATURE_NAMES)
+        model.forest = model._flatten()
+        return model
+    
+    def predict_score(self, X: 'pd.DataFrame') -> Tuple[int, str, float]:
         """
         Predict credit trust score
         
@@ -83,90 +267,237 @@ class CreditTrustModel:
         Returns:
             Tuple of (trust_score, risk_level, confidence)
         """
-        if self.model is None or self.scaler is None:
-            raise ValueError("Model not trained or loaded")
+        trust_scores, risk_levels, confidences = self.predict_scores(X.iloc[:1])
+        return int(trust_scores[0]), str(risk_levels[0]), float(confidences[0])
+    
+    def predict_scores(self, X: 'pd.DataFrame') -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Predict credit trust scores for N rows
         
-        # Scale features
-        X_scaled = self.scaler.transform(X)
+        Args:
+            X: Feature DataFrame (N rows)
+            
+        Returns:
+            Tuple of arrays (trust_score, risk_level, confidence), one entry per row
+        """
+        if self.forest is None and (self.model is None or self.scaler is None):
+            raise ValueError("Model not trained or loaded")
         
-        # Predict risk category
-        risk_category = self.model.predict(X_scaled)[0]
-        probabilities = self.model.predict_proba(X_scaled)[0]
-        confidence = float(probabilities[risk_category])
+        # Predict risk category from a single probability pass
+        probabilities = self.predict_proba(X)
+        predicted_index = probabilities.argmax(axis=1)
+        classes = self.forest.classes if self.forest is not None else self.model.classes_
+        risk_category = classes[predicted_index]
+        confidence = probabilities[np.arange(len(probabilities)), predicted_index]
         
         # Convert risk category to trust score (300-900)
         # Low risk (0) -> 700-900
         # Moderate risk (1) -> 500-699
         # High risk (2) -> 300-499
-        
-        if risk_category == 0:  # Low risk
-            base_score = 700
-            score_range = 200
-        elif risk_category == 1:  # Moderate risk
-            base_score = 500
-            score_range = 199
-        else:  # High risk
-            base_score = 300
-            score_range = 199
-        
         # Use confidence to determine position within range
-        trust_score = int(base_score + (confidence * score_range))
+        trust_score = (
+            self.BAND_BASE_SCORES[risk_category] + confidence * self.BAND_SCORE_RANGES[risk_category]
+        ).astype(np.int64)
         
         # Map to risk level string
-        risk_levels = {
-            0: "Low",
-            1: "Low-Moderate" if trust_score >= 600 else "Moderate",
-            2: "High"
-        }
-        risk_level = risk_levels[risk_category]
+        risk_level = np.select(
+            [risk_category == 0, (risk_category == 1) & (trust_score >= 600), risk_category == 1],
+            ["Low", "Low-Moderate", "Moderate"],
+            default="High"
+        ).astype(object)
         
         return trust_score, risk_level, confidence
     
-    def explain_prediction(self, X: pd.DataFrame) -> Dict:
+    def predict_array(self, X: np.ndarray, explain: bool = False,
+                      method: Optional[str] = None) -> Dict[str, np.ndarray]:
         """
-        Generate SHAP-based explanation
+        Score (and optionally explain) a feature matrix without pandas
+        
+        The request-path entry point: X is a float32 or float64 array in
+        FeatureEngineer.FEATURE_NAMES order, e.g. a reused buffer filled by
+        FeatureEngineer.engineer_features_array. float32 input gives the
+        float64 results for the float32-rounded feature values.
         
         Args:
-            X: Feature DataFrame (single row)
+            X: Raw features (N x n_features), or one row (n_features,)
+            explain: Also compute per-feature contributions
+            method: Attribution method (default: settings.ML_ATTRIBUTION_METHOD)
             
         Returns:
-            Dictionary with SHAP values and feature contributions
+            Dictionary with 'trust_score', 'risk_level' and 'confidence' arrays,
+            plus the explain_predictions() entries when explain is set
         """
-        if self.explainer is None:
-            raise ValueError("Explainer not initialized")
-        
-        # Scale features
-        X_scaled = self.scaler.transform(X)
+        X = self._feature_matrix(X)
+        trust_scores, risk_levels, confidences = self.predict_scores(X)
+        result = {
+            'trust_score': trust_scores,
+            'risk_level': risk_levels,
+            'confidence': confidences
+        }
+        if explain:
+            result.update(self.explain_predictions(X, method))
+        return result
+    
+    def predict_proba(self, X: 'pd.DataFrame') -> np.ndarray:
+        """
+        Class probabilities for N rows
         
-        # Get SHAP values
-        shap_values = self.explainer.shap_values(X_scaled)
+        Uses the flattened trees when available (sklearn's results without
+        its per-call overhead), except for batches of SKLEARN_MIN_ROWS or
+        more, which the sklearn estimator scores faster.
+        """
+        X = self._feature_matrix(X)
+        if self.forest is not None and (
+            len(X) < self.SKLEARN_MIN_ROWS[self.backend] or not self._has_estimator()
+        ):
+            return self.forest.predict_proba(X)
+        # StandardScaler.transform arithmetic, without its feature-name checks
+        return self.model.predict_proba((X - self.scaler.mean_) / self.scaler.scale_)
+    
+    def _has_estimator(self) -> bool:
+        """Whether the sklearn estimator is loaded or can be loaded from the artifact"""
+        if self._model is not None:
+            return True
+        return (
+            self.artifact is not None
+            and self.artifact.has_blob('sklearn')
+            and importlib.util.find_spec('sklearn') is not None
+        )
+    
+    def _feature_matrix(self, X) -> np.ndarray:
+        """Raw features in training column order (float32 arrays pass through uncopied)"""
+        if _is_dataframe(X):
+            return X[self.feature_names].to_numpy(dtype=np.float64)
+        X = np.asarray(X)
+        if X.dtype != np.float32:
+            X = X.astype(np.float64, copy=False)
+        return X[np.newaxis, :] if X.ndim == 1 else X
+    
+    def explain_prediction(self, X: 'pd.DataFrame', method: Optional[str] = None) -> Dict:
+        """
+        Generate feature-contribution explanation
         
-        # For multi-class, take the predicted class SHAP values
-        predicted_class = self.model.predict(X_scaled)[0]
-        class_shap_values = shap_values[predicted_class][0]
+        Args:
+            X: Feature DataFrame (single row)
+            method: "path" or "shap" (default: settings.ML_ATTRIBUTION_METHOD)
+            
+        Returns:
+            Dictionary with per-feature 'contribution' entries and the
+            attribution 'method' that produced them ("path": Saabas, "shap": SHAP)
+        """
+        batch = self.explain_predictions(X.iloc[:1], method)
+        class_contributions = batch['contributions'][0]
         
         # Create explanation dictionary
         explanations = []
         for i, feature_name in enumerate(self.feature_names):
-            if i < len(class_shap_values):  # Safety check
+            if i < len(class_contributions):  # Safety check
                 explanations.append({
                     'feature': feature_name,
                     'value': float(X.iloc[0][feature_name]),
-                    'shap_value': float(class_shap_values[i]),
-                    'impact': 'positive' if class_shap_values[i] > 0 else 'negative'
+                    'contribution': float(class_contributions[i]),
+                    'impact': 'positive' if class_contributions[i] > 0 else 'negative'
                 })
         
-        # Sort by absolute SHAP value
-        explanations.sort(key=lambda x: abs(x['shap_value']), reverse=True)
+        # Sort by absolute contribution
+        explanations.sort(key=lambda x: abs(x['contribution']), reverse=True)
         
         return {
             'explanations': explanations,
-            'base_value': float(self.explainer.expected_value[predicted_class]),
-            'predicted_class': int(predicted_class)
+            'base_value': float(batch['base_values'][0]),
+            'predicted_class': int(batch['predicted_class'][0]),
+            'method': batch['method']
         }
     
+    def explain_predictions(self, X: 'pd.DataFrame', method: Optional[str] = None) -> Dict[str, np.ndarray]:
+        """
+        Predicted-class feature contributions for N rows
+        
+        "path" sums precomputed per-node deltas along each row's decision
+        paths (Saabas attribution, one traversal of the flat forest). "shap"
+        runs one exact TreeExplainer call. Path attribution falls back to
+        SHAP when no flattened forest is available. Contributions and base
+        values are on the probability scale for both backends.
+        
+        Args:
+            X: Feature DataFrame (N rows)
+            method: "path" or "shap" (default: settings.ML_ATTRIBUTION_METHOD)
+            
+        Returns:
+            Dictionary with 'contributions' (N x n_features), 'base_values' (N,),
+            'predicted_class' (N,) and the 'method' used
+        """
+        method = method or settings.ML_ATTRIBUTION_METHOD
+        if method not in ('path', 'shap'):
+            raise ValueError(f"Unknown attribution method: {method}")
+        
+        if method == 'path' and self.forest is not None:
+            X = self._feature_matrix(X)
+            probabilities = self.forest.predict_proba(X)
+            predicted_index = probabilities.argmax(axis=1)
+            bias, contributions = self.forest.contributions(X)
+            rows = np.arange(len(predicted_index))
+            contributions = contributions[rows, :, predicted_index]
+            base_values = bias[predicted_index]
+            if self.backend == 'hist_gradient_boosting':
+                contributions, base_values = _raw_to_probability(
+                    contributions, bias, probabilities, predicted_index
+                )
+            return {
+                'contributions': contributions,
+                'base_values': base_values,
+                'predicted_class': self.forest.classes[predicted_index],
+                'method': 'path'
+            }
+        
+        return self._explain_shap(X)
+    
+    def _explain_shap(self, X: 'pd.DataFrame') -> Dict[str, np.ndarray]:
+        """Exact SHAP contributions from one TreeExplainer call"""
+        if self.explainer is None and self.model is not None:
+            import shap
+            self.explainer = shap.TreeExplainer(self.model)
+        if self.explainer is None:
+            raise ValueError("Explainer not initialized")
+        
+        # Scale features
+        X_scaled = self.scaler.transform(X)
+        rows = np.arange(len(X_scaled))
+        
+        # Get SHAP values for every class at once
+        shap_values = self.explainer.shap_values(X_scaled)
+        
+        # Older SHAP releases return one (N, features) array per class, newer
+        # ones a single (N, features, classes) array
+        if isinstance(shap_values, list):
+            shap_values = np.stack(shap_values, axis=-1)
+        
+        # For multi-class, take each row's predicted class SHAP values
+        probabilities = self.predict_proba(X)
+        predicted_index = probabilities.argmax(axis=1)
+        contributions = shap_values[rows, :, predicted_index]
+        expected_value = np.asarray(self.explainer.expected_value)
+        base_values = expected_value[predicted_index]
+        if self.backend == 'hist_gradient_boosting':
+            contributions, base_values = _raw_to_probability(
+                contributions, expected_value, probabilities, predicted_index
+            )
+        
+        return {
+            'contributions': contributions,
+            'base_values': base_values,
+            'predicted_class': self.model.classes_[predicted_index],
+            'method': 'shap'
+        }
+    
+    @staticmethod
+    def flat_forest_path(model_path: str) -> str:
+        """Location of the flattened forest exported next to the model"""
+        return os.path.splitext(model_path)[0] + '_flat.npz'
+    
     def save(self, model_path: str, scaler_path: str, explainer_path: str):
-        """Save model, scaler, and explainer"""
+        """Save model, scaler, explainer and the flattened forest"""
+        import joblib
         os.makedirs(os.path.dirname(model_path), exist_ok=True)
         joblib.dump(self.model, model_path)
         joblib.dump(self.scaler, scaler_path)
@@ -174,98 +505,91 @@ class CreditTrustModel:
             'explainer': self.explainer,
             'feature_names': self.feature_names
         }, explainer_path)
+        if self.forest is None:
+            self.forest = self._flatten()
+        self.forest.save(self.flat_forest_path(model_path))
     
     def load(self, model_path: str, scaler_path: str, explainer_path: str):
-        """Load model, scaler, and explainer"""
+        """Load model, scaler, explainer and the flattened forest"""
+        import joblib
         self.model = joblib.load(model_path)
+        self.backend = _backend_of(self.model)
         self.scaler = joblib.load(scaler_path)
         explainer_data = joblib.load(explainer_path)
         self.explainer = explainer_data['explainer']
         self.feature_names = explainer_data['feature_names']
-
-
-def generate_synthetic_training_data(n_samples: int = 1000) -> Tuple[pd.DataFrame, np.ndarray]:
-    """
-    Generate synthetic training data for model development
-    
-    Args:
-        n_samples: Number of samples to generate
         
-    Returns:
-        Tuple of (features DataFrame, target array)
-    """
-    np.random.seed(42)
-    
-    from .feature_engineering import FeatureEngineer
-    
-    data = []
-    labels = []
+        # Models saved before the flat export are flattened on load
+        flat_path = self.flat_forest_path(model_path)
+        if os.path.exists(flat_path):
+            self.forest = FLAT_ENGINES[self.backend].load(flat_path)
+        else:
+            self.forest = self._flatten()
     
-    for _ in range(n_samples):
-        # Generate correlated behavioral data
-        # Low risk profile (40%)
-        if np.random.random() < 0.4:
-            raw_data = {
-                'utility_payment_months': np.random.randint(12, 36),
-                'utility_payment_consistency': np.random.uniform(0.85, 1.0),
-                'monthly_transaction_count': np.random.randint(30, 80),
-                'transaction_regularity_score': np.random.uniform(0.75, 1.0),
-                'spending_volatility': np.random.uniform(0.0, 0.2),
-                'avg_month_end_balance': np.random.uniform(3000, 15000),
-                'savings_growth_rate': np.random.uniform(0.05, 0.3),
-                'withdrawal_discipline_score': np.random.uniform(0.7, 1.0),
-                'income_regularity_score': np.random.uniform(0.8, 1.0),
-                'income_stability_months': np.random.randint(12, 48),
-                'account_tenure_months': np.random.randint(24, 120),
-                'address_stability_years': np.random.uniform(2.0, 10.0),
-                'discretionary_income_ratio': np.random.uniform(0.15, 0.35)
-            }
-            label = 0  # Low risk
-        
-        # Moderate risk profile (40%)
-        elif np.random.random() < 0.75:
-            raw_data = {
-                'utility_payment_months': np.random.randint(6, 18),
-                'utility_payment_consistency': np.random.uniform(0.6, 0.85),
-                'monthly_transaction_count': np.random.randint(15, 45),
-                'transaction_regularity_score': np.random.uniform(0.5, 0.75),
-                'spending_volatility': np.random.uniform(0.2, 0.5),
-                'avg_month_end_balance': np.random.uniform(1000, 5000),
-                'savings_growth_rate': np.random.uniform(-0.05, 0.15),
-                'withdrawal_discipline_score': np.random.uniform(0.4, 0.7),
-                'income_regularity_score': np.random.uniform(0.5, 0.8),
-                'income_stability_months': np.random.randint(6, 24),
-                'account_tenure_months': np.random.randint(12, 48),
-                'address_stability_years': np.random.uniform(1.0, 4.0),
-                'discretionary_income_ratio': np.random.uniform(0.1, 0.25)
-            }
-            label = 1  # Moderate risk
+    def save_artifact(self, path: str, version: Optional[str] = None) -> Dict:
+        """
+        Save the model as a single memory-mappable artifact
         
-        # High risk profile (20%)
-        else:
-            raw_data = {
-                'utility_payment_months': np.random.randint(0, 8),
-                'utility_payment_consistency': np.random.uniform(0.3, 0.6),
-                'monthly_transaction_count': np.random.randint(5, 25),
-                'transaction_regularity_score': np.random.uniform(0.2, 0.5),
-                'spending_volatility': np.random.uniform(0.5, 0.9),
-                'avg_month_end_balance': np.random.uniform(0, 2000),
-                'savings_growth_rate': np.random.uniform(-0.3, 0.05),
-                'withdrawal_discipline_score': np.random.uniform(0.1, 0.4),
-                'income_regularity_score': np.random.uniform(0.2, 0.5),
-                'income_stability_months': np.random.randint(0, 12),
-                'account_tenure_months': np.random.randint(3, 24),
-                'address_stability_years': np.random.uniform(0.5, 2.0),
-                'discretionary_income_ratio': np.random.uniform(0.05, 0.15)
-            }
-            label = 2  # High risk
+        The flattened trees and scaler parameters are stored as raw arrays;
+        the sklearn estimator and scaler are embedded as a blob for exact
+        SHAP. The SHAP explainer itself is rebuilt on demand.
         
-        # Engineer features
-        features = FeatureEngineer.engineer_features(raw_data)
-        data.append(features.iloc[0])
-        labels.append(label)
-    
-    X = pd.DataFrame(data)
-    y = np.array(labels)
+        Args:
+            path: Artifact file
+            version: Model version label (default: UTC timestamp)
+            
+        Returns:
+            The written artifact header
+        """
+        if self.forest is None:
+            self.forest = self._flatten()
+        self.version = version or datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S')
+        
+        arrays = {f'forest.{name}': array for name, array in self.forest.to_arrays().items()}
+        arrays['scaler.mean'] = self.scaler.mean_
+        arrays['scaler.scale'] = self.scaler.scale_
+        
+        import joblib
+        estimators = io.BytesIO()
+        joblib.dump({'model': self.model, 'scaler': self.scaler}, estimators)
+        
+        return write_artifact(path, arrays, header={
+            'model_type': self.backend,
+            'model_version': self.version,
+            'feature_schema': {
+                'names': self.feature_names,
+                'dtype': 'float64'
+            },
+            'classes': [int(c) for c in self.forest.classes]
+        }, blobs={'sklearn': estimators.getvalue()})
     
-    return X, y
+    @classmethod
+    def load_artifact(cls, path: str, verify: bool = True) -> 'CreditTrustModel':
+        """
+        Load a model from a single artifact file
+        
+        Arrays are memory-mapped read-only and shared between processes;
+        nothing is unpickled unless exact SHAP or the sklearn path is used.
+        
+        Args:
+            path: Artifact file
+            verify: Check the data checksum (reads the whole file once)
+        """
+        artifact = Artifact(path, verify=verify)
+        header = artifact.header
+        backend = header.get('model_type')
+        if backend not in FLAT_ENGINES:
+            raise ArtifactError(f"{path}: unsupported model type {backend}")
+        
+        model = cls(backend=backend)
+        model.artifact = artifact
+        model.version = header['model_version']
+        model.feature_names = header['feature_schema']['names']
+        model.forest = FLAT_ENGINES[backend].from_arrays({
+            name[len('forest.'):]: array
+            for name, array in artifact.arrays.items()
+            if name.startswith('forest.')
+        })
+        if model.forest.n_features != len(model.feature_names):
+            raise ArtifactError(f"{path}: feature schema does not match the stored forest")
+        return model
@@ -0,0 +1,289 @@
+"""
+Local model registry and hot-swapping loader
+
+Layout:
+    <root>/versions/<version>/model.nexis     memory-mapped artifact
+    <root>/versions/<version>/manifest.json   metadata and training metrics
+    <root>/ACTIVE                             pointer to the serving version
+
+Versions are immutable once registered: a version directory only counts
+once its manifest exists, and the manifest is written last. The ACTIVE
+pointer is replaced atomically (os.replace). Activating or rolling back is a pointer update; serving
+processes pick it up through HotSwapModelLoader without a restart.
+"""
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ..core.config import settings
+from ..core.metrics import metrics
+from ..core.persistence import write_json_atomic
+from .model import CreditTrustModel
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_FILE = 'model.nexis'
+MANIFEST_FILE = 'manifest.json'
+POINTER_FILE = 'ACTIVE'
+_VERSION_PATTERN = re.compile(r'^v(\d+)$')
+
+
+class RegistryError(ValueError):
+    """Raised for unknown versions or an inconsistent registry"""
+
+
+def warm_model(model: CreditTrustModel):
+    """
+    Score and explain one row so the first request pays no page faults or lazy setup
+
+    With ML_ATTRIBUTION_METHOD="shap" this also imports SHAP and scikit-learn
+    and builds the explainer.
+    """
+    row = np.zeros((1, len(model.feature_names)))
+    model.predict_scores(row)
+    model.explain_predictions(row, method='path')
+    if settings.ML_ATTRIBUTION_METHOD == 'shap':
+        model.explain_predictions(row, method='shap')
+
+
+class ModelRegistry:
+    """Versioned model store on the local filesystem"""
+
+    def __init__(self, root: str):
+        self.root = root
+        self.versions_dir = os.path.join(root, 'versions')
+        self.pointer_path = os.path.join(root, POINTER_FILE)
+
+    def version_dir(self, version: str) -> str:
+        return os.path.join(self.versions_dir, version)
+
+    def artifact_path(self, version: str) -> str:
+        return os.path.join(self.version_dir(version), ARTIFACT_FILE)
+
+    def _version_names(self) -> List[str]:
+        if not os.path.isdir(self.versions_dir):
+            return []
+        return [
+            name for name in os.listdir(self.versions_dir)
+            if not name.startswith('.') and os.path.isfile(os.path.join(self.versions_dir, name, MANIFEST_FILE))
+        ]
+
+    def _claim_version(self) -> str:
+        """Create the next vNNNN directory; mkdir is atomic, so concurrent registrations never collide"""
+        os.makedirs(self.versions_dir, exist_ok=True)
+        while True:
+            numbers = [int(m.group(1)) for m in map(_VERSION_PATTERN.match, os.listdir(self.versions_dir)) if m]
+            version = f"v{max(numbers, default=0) + 1:04d}"
+            try:
+                os.mkdir(self.version_dir(version))
+                return version
+            except FileExistsError:
+                continue
+
+    def register(self, model: CreditTrustModel, training_metrics: Optional[Dict] = None,
+                 activate: bool = True, notes: Optional[str] = None) -> Dict:
+        """
+        Store a trained model as a new immutable version
+
+        The manifest is written last; a version directory without one is
+        incomplete and ignored.
+
+        Args:
+            model: Trained model
+            training_metrics: Metrics returned by train()
+            activate: Point ACTIVE at the new version
+            notes: Free-text description stored in the manifest
+
+        Returns:
+            The version manifest
+        """
+        version = self._claim_version()
+        try:
+            header = model.save_artifact(self.artifact_path(version), version=version)
+            manifest = {
+                'version': version,
+                'model_type': header['model_type'],
+                'artifact': ARTIFACT_FILE,
+                'checksum': header['checksum'],
+                'feature_names': header['feature_schema']['names'],
+                'classes': header['classes'],
+                'metrics': training_metrics or {},
+                'notes': notes,
+                'created_at': header['created_at']
+            }
+            write_json_atomic(os.path.join(self.version_dir(version), MANIFEST_FILE), manifest,
+                              indent=2, sort_keys=True)
+        except Exception:
+            shutil.rmtree(self.version_dir(version), ignore_errors=True)
+            raise
+
+        if activate:
+            self.activate(version)
+        return manifest
+
+    def manifest(self, version: str) -> Dict:
+        path = os.path.join(self.version_dir(version), MANIFEST_FILE)
+        if not os.path.isfile(path):
+            raise RegistryError(f"Unknown model version: {version}")
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def list_versions(self) -> List[Dict]:
+        """Manifests of all registered versions, oldest first"""
+        return sorted((self.manifest(name) for name in self._version_names()), key=lambda m: m['created_at'])
+
+    def pointer(self) -> Optional[Dict]:
+        """Contents of the ACTIVE pointer, or None if nothing is active"""
+        try:
+            with open(self.pointer_path, encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def active_version(self) -> Optional[str]:
+        pointer = self.pointer()
+        return pointer['version'] if pointer else None
+
+    def activate(self, version: str) -> Dict:
+        """Point ACTIVE at a registered version"""
+        self.manifest(version)
+        current = self.pointer()
+        previous = current['version'] if current else None
+        pointer = {
+            'version': version,
+            'previous': previous if previous != version else current.get('previous'),
+            'activated_at': datetime.now(timezone.utc).isoformat()
+        }
+        write_json_atomic(self.pointer_path, pointer, indent=2, sort_keys=True)
+        logger.info(f"Activated model version {version} (previous: {pointer['previous']})")
+        return pointer
+
+    def rollback(self, version: Optional[str] = None) -> Dict:
+        """
+        Re-activate an earlier version
+
+        Args:
+            version: Target version (default: the previously active one)
+        """
+        if version is None:
+            current = self.pointer()
+            if not current or not current.get('previous'):
+                raise RegistryError("No previous model version to roll back to")
+            version = current['previous']
+        return self.activate(version)
+
+    def load(self, version: Optional[str] = None) -> CreditTrustModel:
+        """Load a version (default: the active one) from its artifact"""
+        version = version or self.active_version()
+        if version is None:
+            raise RegistryError("No active model version")
+        return CreditTrustModel.load_artifact(self.artifact_path(version))
+
+
+class HotSwapModelLoader:
+    """
+    Keeps the active model loaded and follows the ACTIVE pointer
+
+    A new version is fully loaded, verified and warmed before it replaces the
+    current one with a single reference assignment. Requests that already
+    hold the previous model finish on it; a version that fails to load is
+    logged and the current model keeps serving.
+    """
+
+    def __init__(self, registry: ModelRegistry, poll_interval: float = 5.0):
+        self.registry = registry
+        self.poll_interval = poll_interval
+        self.swaps = 0
+        self.failures = 0
+        self._model: Optional[CreditTrustModel] = None
+        self._pointer_stat = None
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def model(self) -> Optional[CreditTrustModel]:
+        """Current model; callers keep this reference for a whole request"""
+        return self._model
+
+    @property
+    def version(self) -> Optional[str]:
+        model = self._model
+        return model.version if model is not None else None
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Load the active version if it differs from the served one
+
+        Returns:
+            True if the model was swapped
+        """
+        with self._lock:
+            try:
+                stat = os.stat(self.registry.pointer_path)
+                pointer_stat = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+            except FileNotFoundError:
+                return False
+            if pointer_stat == self._pointer_stat and not force:
+                return False
+
+            # Remembered even if loading fails: a broken version is not
+            # retried every poll, only after the pointer changes again
+            self._pointer_stat = pointer_stat
+            version = self.registry.active_version()
+            if version is None or (version == self.version and not force):
+                return False
+            try:
+                model = self.registry.load(version)
+                warm_model(model)
+            except Exception as exc:
+                self.failures += 1
+                logger.error(f"Failed to load model version {version}: {exc}")
+                return False
+            previous = self.version
+            self._model = model
+            self.swaps += 1
+        logger.info(f"Serving model version {version} (was {previous})")
+        return True
+
+    def start(self):
+        """Load the active version and start polling the pointer"""
+        self.refresh()
+        if self.poll_interval > 0 and self._thread is None:
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name='nexis-model-loader', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stopped.wait(self.poll_interval):
+            try:
+                self.refresh()
+            except Exception as exc:
+                # Polling must never take the service down
+                logger.error(f"Model pointer check failed: {exc}")
+
+    def stop(self, timeout: float = 5.0):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+
+model_registry = ModelRegistry(settings.MODEL_REGISTRY_PATH)
+model_loader = HotSwapModelLoader(model_registry, settings.MODEL_REGISTRY_POLL_SECONDS)
+
+metrics.gauge_callback(
+    'nexis_model_version_info', 'Model version currently served (value is always 1)', ['version'],
+    lambda: {(model_loader.version,): 1} if model_loader.version else {}
+)
+metrics.gauge_callback(
+    'nexis_model_swaps', 'Model hot swaps and failed loads since start', ['outcome'],
+    lambda: {('swapped',): model_loader.swaps, ('failed',): model_loader.failures}
+)
@@ -0,0 +1,254 @@
+"""
+Synthetic training data generation
+
+Samples are drawn column-wise with np.random.Generator: each chunk draws
+its class labels, then every field for a whole profile class in one call.
+Chunks are yielded one at a time so datasets can be streamed straight to
+.npy memmaps or Parquet without holding n_samples rows in memory.
+"""
+import os
+from typing import TYPE_CHECKING, Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+from .feature_engineering import FeatureEngineer
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Behavioral field distributions per risk profile (0=Low, 1=Moderate, 2=High).
+# Each entry is (sampler, low, high) with numpy's half-open range
+# semantics (integers: high exclusive).
+PROFILE_DISTRIBUTIONS = {
+    0: {
+        'utility_payment_months': ('randint', 12, 36),
+        'utility_payment_consistency': ('uniform', 0.85, 1.0),
+        'monthly_transaction_count': ('randint', 30, 80),
+        'transaction_regularity_score': ('uniform', 0.75, 1.0),
+        'spending_volatility': ('uniform', 0.0, 0.2),
+        'avg_month_end_balance': ('uniform', 3000, 15000),
+        'savings_growth_rate': ('uniform', 0.05, 0.3),
+        'withdrawal_discipline_score': ('uniform', 0.7, 1.0),
+        'income_regularity_score': ('uniform', 0.8, 1.0),
+        'income_stability_months': ('randint', 12, 48),
+        'account_tenure_months': ('randint', 24, 120),
+        'address_stability_years': ('uniform', 2.0, 10.0),
+        'discretionary_income_ratio': ('uniform', 0.15, 0.35)
+    },
+    1: {
+        'utility_payment_months': ('randint', 6, 18),
+        'utility_payment_consistency': ('uniform', 0.6, 0.85),
+        'monthly_transaction_count': ('randint', 15, 45),
+        'transaction_regularity_score': ('uniform', 0.5, 0.75),
+        'spending_volatility': ('uniform', 0.2, 0.5),
+        'avg_month_end_balance': ('uniform', 1000, 5000),
+        'savings_growth_rate': ('uniform', -0.05, 0.15),
+        'withdrawal_discipline_score': ('uniform', 0.4, 0.7),
+        'income_regularity_score': ('uniform', 0.5, 0.8),
+        'income_stability_months': ('randint', 6, 24),
+        'account_tenure_months': ('randint', 12, 48),
+        'address_stability_years': ('uniform', 1.0, 4.0),
+        'discretionary_income_ratio': ('uniform', 0.1, 0.25)
+    },
+    2: {
+        'utility_payment_months': ('randint', 0, 8),
+        'utility_payment_consistency': ('uniform', 0.3, 0.6),
+        'monthly_transaction_count': ('randint', 5, 25),
+        'transaction_regularity_score': ('uniform', 0.2, 0.5),
+        'spending_volatility': ('uniform', 0.5, 0.9),
+        'avg_month_end_balance': ('uniform', 0, 2000),
+        'savings_growth_rate': ('uniform', -0.3, 0.05),
+        'withdrawal_discipline_score': ('uniform', 0.1, 0.4),
+        'income_regularity_score': ('uniform', 0.2, 0.5),
+        'income_stability_months': ('randint', 0, 12),
+        'account_tenure_months': ('randint', 3, 24),
+        'address_stability_years': ('uniform', 0.5, 2.0),
+        'discretionary_income_ratio': ('uniform', 0.05, 0.15)
+    }
+}
+
+# Class mix: 40% low, 45% moderate, 15% high risk
+PROFILE_WEIGHTS = (0.4, 0.45, 0.15)
+
+BEHAVIORAL_FIELDS = list(PROFILE_DISTRIBUTIONS[0])
+DEFAULT_CHUNK_SIZE = 100_000
+
+
+def sample_profiles(labels: np.ndarray, rng: np.random.Generator) -> Dict[str, np.ndarray]:
+    """
+    Draw one raw behavioral record per label
+
+    Each field is drawn once per profile class for all rows of that class.
+
+    Args:
+        labels: Risk profile per row (0=Low, 1=Moderate, 2=High)
+        rng: Random generator
+
+    Returns:
+        Column arrays keyed by behavioral field, in PROFILE_DISTRIBUTIONS order
+    """
+    labels = np.asarray(labels)
+    blocks = [(label, np.flatnonzero(labels == label)) for label in PROFILE_DISTRIBUTIONS]
+    columns = {}
+    for field in BEHAVIORAL_FIELDS:
+        integer = PROFILE_DISTRIBUTIONS[0][field][0] == 'randint'
+        column = np.empty(len(labels), dtype=np.int64 if integer else np.float64)
+        for label, rows in blocks:
+            _, low, high = PROFILE_DISTRIBUTIONS[label][field]
+            if integer:
+                column[rows] = rng.integers(low, high, size=len(rows))
+            else:
+                column[rows] = rng.uniform(low, high, size=len(rows))
+        columns[field] = column
+    return columns
+
+
+def iter_synthetic_chunks(
+    n_samples: int,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    seed: Optional[int] = 42,
+    rng: Optional[np.random.Generator] = None
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Yield synthetic training data in fixed-size chunks
+
+    Args:
+        n_samples: Total number of samples
+        chunk_size: Rows per chunk (the last chunk may be shorter)
+        seed: Seed for a new generator (ignored if rng is given)
+        rng: Generator to draw from
+
+    Yields:
+        (features, labels): float64 array of shape (rows, n_features) in
+        FeatureEngineer.FEATURE_NAMES order, and int64 risk labels
+    """
+    rng = rng if rng is not None else np.random.default_rng(seed)
+    remaining = n_samples
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        labels = rng.choice(len(PROFILE_WEIGHTS), size=size, p=PROFILE_WEIGHTS)
+        raw = sample_profiles(labels, rng)
+        features = FeatureEngineer.engineer_features_batch(raw).to_numpy(dtype=np.float64)
+        yield features, labels.astype(np.int64)
+        remaining -= size
+
+
+def generate_synthetic_training_data(
+    n_samples: int = 1000,
+    seed: Optional[int] = 42,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Tuple['pd.DataFrame', np.ndarray]:
+    """
+    Generate synthetic training data for model development
+    
+    Args:
+        n_samples: Number of samples to generate
+        seed: RNG seed (the global numpy RNG is not touched)
+        chunk_size: Rows generated per vectorized step
+        
+    Returns:
+        Tuple of (features DataFrame, target array)
+    """
+    import pandas as pd
+    
+    X = np.empty((n_samples, len(FeatureEngineer.FEATURE_NAMES)), dtype=np.float64)
+    y = np.empty(n_samples, dtype=np.int64)
+    offset = 0
+    for features, labels in iter_synthetic_chunks(n_samples, chunk_size, seed):
+        X[offset:offset + len(labels)] = features
+        y[offset:offset + len(labels)] = labels
+        offset += len(labels)
+    
+    return pd.DataFrame(X, columns=FeatureEngineer.FEATURE_NAMES), y
+
+
+def write_npy(
+    path: str,
+    n_samples: int,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    seed: Optional[int] = 42,
+    dtype=np.float64
+) -> Tuple[str, str]:
+    """
+    Stream synthetic data into .npy files through memory maps
+
+    Args:
+        path: Output prefix; writes <path>_X.npy and <path>_y.npy
+        n_samples: Number of samples
+        chunk_size: Rows per chunk
+        seed: RNG seed
+        dtype: Feature dtype on disk
+
+    Returns:
+        Paths of the feature and label files
+    """
+    X_path, y_path = f"{path}_X.npy", f"{path}_y.npy"
+    os.makedirs(os.path.dirname(os.path.abspath(X_path)), exist_ok=True)
+    X = np.lib.format.open_memmap(
+        X_path, mode='w+', dtype=dtype, shape=(n_samples, len(FeatureEngineer.FEATURE_NAMES))
+    )
+    y = np.lib.format.open_memmap(y_path, mode='w+', dtype=np.int8, shape=(n_samples,))
+    offset = 0
+    for features, labels in iter_synthetic_chunks(n_samples, chunk_size, seed):
+        X[offset:offset + len(labels)] = features
+        y[offset:offset + len(labels)] = labels
+        offset += len(labels)
+    X.flush()
+    y.flush()
+    del X, y
+    return X_path, y_path
+
+
+def load_npy(path: str, mmap: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+    """Open a dataset written by write_npy (memory-mapped read-only by default)"""
+    mode = 'r' if mmap else None
+    return np.load(f"{path}_X.npy", mmap_mode=mode), np.load(f"{path}_y.npy", mmap_mode=mode)
+
+
+def write_parquet(
+    path: str,
+    n_samples: int,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    seed: Optional[int] = 42
+) -> str:
+    """
+    Stream synthetic data into a Parquet file, one row group per chunk
+
+    Requires pyarrow. Columns are FeatureEngineer.FEATURE_NAMES plus 'label'.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Writing Parquet requires pyarrow (pip install pyarrow)") from e
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    schema = pa.schema(
+        [(name, pa.float64()) for name in FeatureEngineer.FEATURE_NAMES] + [('label', pa.int8())]
+    )
+    with pq.ParquetWriter(path, schema) as writer:
+        for features, labels in iter_synthetic_chunks(n_samples, chunk_size, seed):
+            arrays = [pa.array(features[:, i]) for i in range(features.shape[1])]
+            arrays.append(pa.array(labels.astype(np.int8)))
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+    return path
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description='Write a synthetic training dataset')
+    parser.add_argument('output', help='output prefix (.npy) or file path (.parquet)')
+    parser.add_argument('--n-samples', type=int, default=10_000_000)
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--format', choices=['npy', 'parquet'], default='npy')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.format == 'parquet':
+        written = [write_parquet(args.output, args.n_samples, args.chunk_size, args.seed)]
+    else:
+        written = list(write_npy(args.output, args.n_samples, args.chunk_size, args.seed))
+    print(f"Wrote {args.n_samples:,} samples in {time.perf_counter() - start:.1f}s: {', '.join(written)}")
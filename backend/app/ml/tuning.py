@@ -0,0 +1,316 @@
+"""
+Hyperparameter search for CreditTrustModel
+
+Random forest and histogram gradient boosting configurations are sampled
+and compared by successive halving. Every surviving candidate is fitted
+on a growing share of the training rows (ETA times more per rung). After
+each rung the non-dominated candidates on (accuracy, latency) survive
+first, and the remaining slots go to the most accurate.
+
+Candidates are evaluated in parallel in spawned worker processes. The
+data is shared through read-only .npy memory maps, and each fit is
+single-threaded. Latency is the median time of one explained single-row
+request through the serving path (CreditTrustModel.predict_array on the
+flattened trees). Workers measure it while other fits are running, so
+absolute numbers are pessimistic but comparable between candidates.
+
+The search stops at the wall-clock budget. Workers still running at the
+deadline are terminated before the shared data is removed. The choice is
+made from the largest rung that has a servable result. Both families are
+served by CreditTrustModel; a family outside SERVABLE_FAMILIES would be
+measured through sklearn and reported but never chosen.
+"""
+import itertools
+import logging
+import math
+import os
+import tempfile
+import time
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeout, as_completed
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .model import CreditTrustModel
+
+logger = logging.getLogger(__name__)
+
+# Training rows grow by this factor per rung; 1/ETA of the candidates survive
+ETA = 3
+
+SEARCH_SPACE = {
+    'random_forest': {
+        'n_estimators': [25, 50, 100, 200],
+        'max_depth': [6, 8, 10, 14],
+        'min_samples_leaf': [5, 10, 20],
+        'max_features': ['sqrt', 0.5]
+    },
+    'hist_gradient_boosting': {
+        'max_iter': [50, 100, 200],
+        'learning_rate': [0.05, 0.1, 0.2],
+        'max_leaf_nodes': [15, 31, 63],
+        'min_samples_leaf': [10, 20, 40]
+    }
+}
+
+# Families the serving path can run (CreditTrustModel backends); others are
+# reported but not registered
+SERVABLE_FAMILIES = ('random_forest', 'hist_gradient_boosting')
+
+LATENCY_REPEATS = 200
+
+
+def sample_candidates(n_candidates: int, seed: int = 42,
+                      search_space: Optional[Dict] = None) -> List[Dict]:
+    """Distinct random configurations, alternating between model families"""
+    search_space = search_space or SEARCH_SPACE
+    rng = np.random.default_rng(seed)
+    grids = []
+    for family, space in search_space.items():
+        grid = [dict(zip(space, values)) for values in itertools.product(*space.values())]
+        grids.append([(family, grid[i]) for i in rng.permutation(len(grid))])
+
+    candidates = []
+    for round_robin in itertools.zip_longest(*grids):
+        for entry in round_robin:
+            if entry is not None and len(candidates) < n_candidates:
+                candidates.append({'id': len(candidates), 'family': entry[0], 'params': entry[1]})
+    return candidates
+
+
+def build_estimator(family: str, params: Dict, n_jobs: int = 1):
+    """Unfitted classifier for one configuration"""
+    if family == 'random_forest':
+        from sklearn.ensemble import RandomForestClassifier
+        return RandomForestClassifier(**{
+            **CreditTrustModel.FOREST_PARAMS, 'class_weight': 'balanced', 'n_jobs': n_jobs, **params
+        })
+    if family == 'hist_gradient_boosting':
+        from sklearn.ensemble import HistGradientBoostingClassifier
+        return HistGradientBoostingClassifier(**{
+            **CreditTrustModel.BOOSTING_PARAMS, 'class_weight': 'balanced', **params
+        })
+    raise ValueError(f"Unknown model family: {family}")
+
+
+def serving_latency_ms(family: str, estimator, scaler, row: np.ndarray,
+                       repeats: int = LATENCY_REPEATS) -> float:
+    """Median latency of one explained single-row request"""
+    if family in SERVABLE_FAMILIES:
+        model = CreditTrustModel.from_estimators(estimator, scaler)
+        call = lambda: model.predict_array(row, explain=True)
+    else:
+        # Not servable: sklearn's own single-row prediction
+        scaled = scaler.transform(row.astype(np.float64))
+        call = lambda: estimator.predict_proba(scaled)
+    call()
+    timings = np.empty(repeats)
+    for i in range(repeats):
+        started = time.perf_counter()
+        call()
+        timings[i] = time.perf_counter() - started
+    return float(np.median(timings) * 1000)
+
+
+# Data shared by the evaluation workers (memory-mapped .npy files)
+_worker_data: Dict[str, np.ndarray] = {}
+
+
+def _init_worker(data_dir: str):
+    for name in ('X_train', 'y_train', 'X_val', 'y_val'):
+        _worker_data[name] = np.load(os.path.join(data_dir, f'{name}.npy'), mmap_mode='r')
+
+
+def evaluate_candidate(candidate: Dict, n_rows: int) -> Dict:
+    """Fit one candidate on the first n_rows training rows and score it"""
+    from sklearn.preprocessing import StandardScaler
+
+    X = np.asarray(_worker_data['X_train'][:n_rows])
+    y = np.asarray(_worker_data['y_train'][:n_rows])
+    X_val, y_val = _worker_data['X_val'], _worker_data['y_val']
+
+    started = time.perf_counter()
+    scaler = StandardScaler().fit(X)
+    estimator = build_estimator(candidate['family'], candidate['params']).fit(scaler.transform(X), y)
+    fit_seconds = time.perf_counter() - started
+
+    accuracy = float(estimator.score(scaler.transform(X_val), y_val))
+    row = np.asarray(X_val[:1], dtype=np.float32)
+    return {
+        **candidate,
+        'n_rows': n_rows,
+        'accuracy': accuracy,
+        'latency_ms': serving_latency_ms(candidate['family'], estimator, scaler, row),
+        'fit_seconds': round(fit_seconds, 3),
+        'servable': candidate['family'] in SERVABLE_FAMILIES
+    }
+
+
+def pareto_front(results: List[Dict]) -> List[Dict]:
+    """Results not dominated on (higher accuracy, lower latency), most accurate first"""
+    front = [
+        r for r in results
+        if not any(
+            o['accuracy'] >= r['accuracy'] and o['latency_ms'] <= r['latency_ms']
+            and (o['accuracy'] > r['accuracy'] or o['latency_ms'] < r['latency_ms'])
+            for o in results
+        )
+    ]
+    return sorted(front, key=lambda r: (-r['accuracy'], r['latency_ms']))
+
+
+def select_survivors(results: List[Dict], k: int) -> List[Dict]:
+    """Pareto front first, then the most accurate of the rest"""
+    front = pareto_front(results)
+    front_ids = {r['id'] for r in front}
+    rest = sorted((r for r in results if r['id'] not in front_ids), key=lambda r: -r['accuracy'])
+    return (front + rest)[:k]
+
+
+def choose(results: List[Dict], max_latency_ms: Optional[float] = None) -> Optional[Dict]:
+    """
+    Most accurate servable result within the latency limit
+
+    Without a result inside the limit, the fastest servable result on the
+    Pareto front is chosen.
+    """
+    front = pareto_front([r for r in results if r['servable']])
+    if not front:
+        return None
+    if max_latency_ms is not None:
+        within = [r for r in front if r['latency_ms'] <= max_latency_ms]
+        return within[0] if within else min(front, key=lambda r: r['latency_ms'])
+    return front[0]
+
+
+def tune(
+    X: np.ndarray,
+    y: np.ndarray,
+    budget_seconds: float = 300.0,
+    n_candidates: int = 27,
+    n_jobs: Optional[int] = None,
+    min_rows: int = 1000,
+    validation_fraction: float = 0.2,
+    max_latency_ms: Optional[float] = None,
+    seed: int = 42
+) -> Dict:
+    """
+    Successive-halving search over SEARCH_SPACE under a wall-clock budget
+
+    Args:
+        X: Raw features in FeatureEngineer.FEATURE_NAMES order
+        y: Risk labels
+        budget_seconds: Wall-clock limit for the search
+        n_candidates: Configurations in the first rung
+        n_jobs: Worker processes (default: all cores)
+        min_rows: Training rows per candidate in the first rung
+        validation_fraction: Rows held out for accuracy
+        max_latency_ms: Latency limit for the chosen configuration
+        seed: Sampling and split seed
+
+    Returns:
+        Report with every result, the rungs, the Pareto front of the
+        largest rung reached and the chosen result
+    """
+    started = time.perf_counter()
+    deadline = started + budget_seconds
+
+    # Shuffle and split; every rung is scored on the same validation rows
+    rng = np.random.default_rng(seed)
+    order = rng.permutation(len(y))
+    n_val = int(len(y) * validation_fraction)
+    val_idx, train_idx = order[:n_val], order[n_val:]
+    n_train = len(train_idx)
+    min_rows = min(min_rows, n_train)
+    n_rungs = 1 + max(0, int(math.floor(math.log(n_train / min_rows, ETA))))
+    rung_rows = [min(n_train, min_rows * ETA ** r) for r in range(n_rungs - 1)] + [n_train]
+
+    candidates = sample_candidates(n_candidates, seed)
+    results: List[Dict] = []
+    rungs: List[Dict] = []
+    budget_exhausted = False
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        np.save(os.path.join(data_dir, 'X_train.npy'), np.asarray(X, dtype=np.float64)[train_idx])
+        np.save(os.path.join(data_dir, 'y_train.npy'), np.asarray(y)[train_idx])
+        np.save(os.path.join(data_dir, 'X_val.npy'), np.asarray(X, dtype=np.float64)[val_idx])
+        np.save(os.path.join(data_dir, 'y_val.npy'), np.asarray(y)[val_idx])
+
+        pool = ProcessPoolExecutor(
+            max_workers=n_jobs or os.cpu_count(), mp_context=mp.get_context('spawn'),
+            initializer=_init_worker, initargs=(data_dir,)
+        )
+        try:
+            survivors = candidates
+            for rung, n_rows in enumerate(rung_rows):
+                futures = [pool.submit(evaluate_candidate, c, n_rows) for c in survivors]
+                rung_results = []
+                try:
+                    for future in as_completed(futures, timeout=max(deadline - time.perf_counter(), 0)):
+                        rung_results.append(future.result())
+                except FuturesTimeout:
+                    budget_exhausted = True
+                rungs.append({'rung': rung, 'n_rows': n_rows, 'submitted': len(survivors),
+                              'completed': len(rung_results)})
+                results.extend(rung_results)
+                logger.info(f"Rung {rung}: {len(rung_results)}/{len(survivors)} candidates on {n_rows} rows")
+                if budget_exhausted or not rung_results:
+                    break
+                survivors = select_survivors(rung_results, max(1, math.ceil(len(rung_results) / ETA)))
+        finally:
+            if budget_exhausted:
+                # Stop evaluations still running at the deadline. shutdown()
+                # never interrupts a running task, so the workers are
+                # terminated, and joined while data_dir still exists.
+                # _processes is private: a {pid: Process} dict, None once the
+                # pool has shut down (checked on CPython 3.11)
+                workers = list((pool._processes or {}).values())
+                pool.shutdown(wait=False, cancel_futures=True)
+                for worker in workers:
+                    worker.terminate()
+                for worker in workers:
+                    worker.join()
+            else:
+                pool.shutdown(wait=True)
+
+    # Report the largest rung reached; choose from the largest rung with a
+    # servable result
+    final_rows = max((r['n_rows'] for r in results), default=None)
+    final = [r for r in results if r['n_rows'] == final_rows]
+    servable_rows = max((r['n_rows'] for r in results if r['servable']), default=None)
+    chosen = choose([r for r in results if r['n_rows'] == servable_rows], max_latency_ms)
+    return {
+        'budget_seconds': budget_seconds,
+        'elapsed_seconds': round(time.perf_counter() - started, 1),
+        'budget_exhausted': budget_exhausted,
+        'n_train': n_train,
+        'n_validation': n_val,
+        'max_latency_ms': max_latency_ms,
+        'rungs': rungs,
+        'results': results,
+        'pareto_front': pareto_front(final),
+        'chosen': chosen
+    }
+
+
+def format_report(report: Dict) -> str:
+    """Plain-text Pareto report"""
+    lines = [
+        f"Search: {report['elapsed_seconds']}s of {report['budget_seconds']}s budget"
+        f"{' (budget exhausted)' if report['budget_exhausted'] else ''}, "
+        f"{report['n_train']:,} training / {report['n_validation']:,} validation rows",
+        "Rungs: " + ", ".join(f"{r['completed']}/{r['submitted']} on {r['n_rows']:,} rows" for r in report['rungs']),
+        "",
+        "Pareto front (largest rung):"
+    ]
+    chosen_id = report['chosen']['id'] if report['chosen'] else None
+    for r in report['pareto_front']:
+        params = ', '.join(f"{k}={v}" for k, v in r['params'].items())
+        marker = '*' if r['id'] == chosen_id else ' '
+        servable = '' if r['servable'] else '  (not servable)'
+        lines.append(f" {marker} #{r['id']:<3} {r['family']:<23} acc {r['accuracy']:.4f}  "
+                     f"latency {r['latency_ms']:.3f} ms  [{params}]{servable}")
+    if chosen_id is None:
+        lines.append("No servable configuration was evaluated")
+    return '\n'.join(lines)
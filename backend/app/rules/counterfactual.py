@@ -0,0 +1,274 @@
+"""
+Counterfactual Plan Solver
+Finds the least-effort set of rule level upgrades that reaches a target risk band
+"""
+import heapq
+import math
+from typing import Dict, List, Tuple
+
+from .scoring_engine import ScoringEngine
+
+
+class CounterfactualSolver:
+    """
+    Answers "what is the cheapest set of changes to move to a better risk band?"
+
+    Each rule can be raised from its current level to any higher level for
+    a fixed number of points (ScoringEngine.RULES) at an effort cost in
+    months. Choosing at most one upgrade per rule so the point total
+    reaches the band's minimum score at the lowest total effort is a
+    multiple-choice knapsack, solved exactly by dynamic programming over
+    points gained (capped at the points needed, at most 360 states).
+    Each state keeps the cheapest few partial plans, so the top-k plans
+    come from the same pass. Plans are minimal: no change in a plan can
+    be dropped or scaled back to a lower level while still reaching the
+    target.
+    """
+
+    LEVELS = ('minimum', 'low', 'medium', 'high')
+
+    # Minimum trust score of each band (ScoringEngine.classify_risk)
+    TARGET_BANDS = {'Moderate': 550, 'Low': 700}
+
+    # Time-based rules: months of history per unit of the rule value
+    TIME_RULES = {'A1': 1, 'E2': 1, 'F1': 1, 'F2': 12}
+
+    # Behavioral rules: months per level climbed (midpoints of the
+    # completion pathway timeframes: 2-4 months, savings 3-6 months)
+    EFFORT_MONTHS_PER_LEVEL = {
+        'A2': 3.0, 'B1': 3.0, 'B2': 3.0, 'C1': 3.0, 'C2': 3.0, 'E1': 3.0,
+        'D1': 4.5, 'D2': 4.5
+    }
+
+    # Partial plans kept per state for each plan requested, so enough
+    # minimal plans survive after non-minimal ones are filtered out
+    CANDIDATES_PER_PLAN = 4
+
+    @staticmethod
+    def points_needed(total_points: int, target_score: int) -> int:
+        """
+        Additional points needed to reach a trust score
+
+        Args:
+            total_points: Points currently earned
+            target_score: Trust score to reach
+
+        Returns:
+            Smallest point gain reaching target_score (0 if already reached)
+        """
+        for gain in range(ScoringEngine.MAX_POINTS - total_points + 1):
+            if ScoringEngine.points_to_score(total_points + gain) >= target_score:
+                return gain
+        return ScoringEngine.MAX_POINTS + 1
+
+    @staticmethod
+    def upgrade_effort(rule_id: str, user_value: float, level: str, levels_climbed: int) -> float:
+        """
+        Effort in months to raise a rule to a level
+
+        Args:
+            rule_id: Rule identifier
+            user_value: Current value of the rule field
+            level: Target level
+            levels_climbed: Levels between the current and target level
+
+        Returns:
+            Months of effort
+        """
+        if rule_id in CounterfactualSolver.TIME_RULES:
+            gap = ScoringEngine.RULES[rule_id]['thresholds'][level] - user_value
+            return float(max(1, math.ceil(gap * CounterfactualSolver.TIME_RULES[rule_id] - 1e-9)))
+        return CounterfactualSolver.EFFORT_MONTHS_PER_LEVEL[rule_id] * levels_climbed
+
+    @staticmethod
+    def upgrade_options(rule_results: List[Dict]) -> Tuple:
+        """
+        Level upgrades available per rule
+
+        Args:
+            rule_results: List of rule evaluation results
+
+        Returns:
+            Tuple of (rule_id, ((level, points_gained, effort_months), ...))
+            for every rule below its highest level
+        """
+        options = []
+        for result in rule_results:
+            rule = ScoringEngine.RULES[result['rule_id']]
+            current = CounterfactualSolver.LEVELS.index(result['level'])
+            rule_options = tuple(
+                (
+                    level,
+                    rule['points'][level] - result['points_earned'],
+                    CounterfactualSolver.upgrade_effort(
+                        result['rule_id'], result['user_value'], level, index - current
+                    )
+                )
+                for index, level in enumerate(CounterfactualSolver.LEVELS)
+                if index > current
+            )
+            if rule_options:
+                options.append((result['rule_id'], rule_options))
+        return tuple(options)
+
+    @staticmethod
+    def _search(need: int, options: Tuple, top_k: int) -> Tuple:
+        """
+        Top-k minimal plans by effort
+
+        Returns:
+            Tuple of (effort, n_changes, -points_gained, ((rule_id, level), ...))
+        """
+        # The cheapest plan is always minimal (every change costs effort)
+        width = 1 if top_k == 1 else top_k * CounterfactualSolver.CANDIDATES_PER_PLAN
+        # Points gained (capped at need) -> cheapest partial plans
+        states = {0: [(0.0, 0, 0, ())]}
+        # Once `width` complete plans exist, costlier partial plans can never be kept
+        bound = math.inf
+        # Rules with the most points per month first, so the bound tightens early
+        by_value = sorted(options, key=lambda rule: -max(points / effort for _, points, effort in rule[1]))
+        for rule_id, rule_options in by_value:
+            merged = {gain: list(plans) for gain, plans in states.items()}
+            for gain, plans in states.items():
+                if gain == need:
+                    # Adding to a plan that already reaches the target is never minimal
+                    continue
+                for level, points, effort in rule_options:
+                    bucket = merged.setdefault(min(need, gain + points), [])
+                    for plan_effort, n_changes, neg_points, changes in plans:
+                        if plan_effort + effort <= bound:
+                            bucket.append((
+                                plan_effort + effort,
+                                n_changes + 1,
+                                neg_points - points,
+                                changes + ((rule_id, level),)
+                            ))
+            states = {
+                gain: plans if len(plans) <= width else heapq.nsmallest(width, plans)
+                for gain, plans in merged.items()
+            }
+            complete = states.get(need, [])
+            if len(complete) >= width:
+                bound = max(plan[0] for plan in complete)
+
+        # Keep plans where scaling back any change by one level misses the target
+        gains = {
+            (rule_id, level): points
+            for rule_id, rule_options in options
+            for level, points, _ in rule_options
+        }
+        previous = {
+            (rule_id, level): rule_options[i - 1][0] if i else None
+            for rule_id, rule_options in options
+            for i, (level, _, _) in enumerate(rule_options)
+        }
+        minimal = []
+        for plan in sorted(states.get(need, [])):
+            total = -plan[2]
+            smallest_step = min(
+                gains[change] - gains.get((change[0], previous[change]), 0)
+                for change in plan[3]
+            )
+            if total - smallest_step < need:
+                minimal.append(plan)
+                if len(minimal) == top_k:
+                    break
+        return tuple(minimal)
+
+    @staticmethod
+    def solve(rule_results: List[Dict], target_band: str = 'Low', top_k: int = 3) -> Dict:
+        """
+        Cheapest plans of rule upgrades that reach a target risk band
+
+        Args:
+            rule_results: List of rule evaluation results
+            target_band: 'Moderate' or 'Low'
+            top_k: Number of plans to return
+
+        Returns:
+            Dictionary with the current and target score, 'status'
+            ('met', 'solved' or 'unreachable'), 'plans' ordered by effort
+            and 'optimal' (the first plan, or None)
+        """
+        if target_band not in CounterfactualSolver.TARGET_BANDS:
+            raise ValueError(f"Unknown target band: {target_band}")
+        if top_k < 1:
+            raise ValueError("top_k must be at least 1")
+
+        total_points = sum(result['points_earned'] for result in rule_results)
+        current_score = ScoringEngine.points_to_score(total_points)
+        target_score = CounterfactualSolver.TARGET_BANDS[target_band]
+        need = CounterfactualSolver.points_needed(total_points, target_score)
+
+        response = {
+            'current_score': current_score,
+            'current_band': ScoringEngine.classify_risk(current_score),
+            'target_band': target_band,
+            'target_score': target_score,
+            'points_needed': need,
+            'status': 'met',
+            'plans': [],
+            'optimal': None
+        }
+        if need == 0:
+            return response
+
+        options = CounterfactualSolver.upgrade_options(rule_results)
+        found = CounterfactualSolver._search(need, options, top_k)
+        if not found:
+            response['status'] = 'unreachable'
+            return response
+
+        by_rule = {result['rule_id']: result for result in rule_results}
+        upgrades = {
+            (rule_id, level): (points, effort)
+            for rule_id, rule_options in options
+            for level, points, effort in rule_options
+        }
+        for effort, _, neg_points, changes in found:
+            steps = []
+            for rule_id, level in sorted(changes):
+                result = by_rule[rule_id]
+                points, months = upgrades[(rule_id, level)]
+                steps.append({
+                    'rule_id': rule_id,
+                    'rule_name': result['rule_name'],
+                    'from_level': result['level'],
+                    'to_level': level,
+                    'current_value': result['user_value'],
+                    'target_value': ScoringEngine.RULES[rule_id]['thresholds'][level],
+                    'points_gained': points,
+                    'effort_months': months
+                })
+            projected_score = ScoringEngine.points_to_score(total_points - neg_points)
+            response['plans'].append({
+                'changes': steps,
+                'points_gained': -neg_points,
+                'effort_months': round(effort, 1),
+                # Changes pursued in parallel finish with the longest one
+                'elapsed_months': max(step['effort_months'] for step in steps),
+                'projected_score': projected_score,
+                'projected_band': ScoringEngine.classify_risk(projected_score)
+            })
+        response['status'] = 'solved'
+        response['optimal'] = response['plans'][0]
+        return response
+
+    @staticmethod
+    def solve_portfolio(portfolio: Dict[str, List[Dict]], target_band: str = 'Low',
+                        top_k: int = 1) -> Dict[str, Dict]:
+        """
+        Solve for every applicant in a portfolio
+
+        Args:
+            portfolio: Rule evaluation results per user_id
+            target_band: 'Moderate' or 'Low'
+            top_k: Number of plans per applicant
+
+        Returns:
+            Solver result per user_id
+        """
+        return {
+            user_id: CounterfactualSolver.solve(rule_results, target_band, top_k)
+            for user_id, rule_results in portfolio.items()
+        }
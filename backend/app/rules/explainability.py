@@ -2,7 +2,7 @@
 Rule-Based Explainability Engine
 Generates transparent, deterministic explanations for credit assessments
 """
-from typing import List, Dict
+from typing import List, Dict, Optional
 from datetime import datetime, timedelta
 
 
@@ -304,14 +304,41 @@ class ExplainabilityEngine:
         }
     }
     
+    # What each rule measures, as used in peer comparisons
+    PEER_LABELS = {
+        'A1': 'utility payment history',
+        'A2': 'payment reliability',
+        'B1': 'monthly digital transactions',
+        'B2': 'transaction regularity',
+        'C1': 'spending volatility',
+        'C2': 'withdrawal discipline',
+        'D1': 'savings balance',
+        'D2': 'savings growth',
+        'E1': 'income regularity',
+        'E2': 'income stability',
+        'F1': 'account tenure',
+        'F2': 'address stability'
+    }
+    
     @staticmethod
-    def generate_factors(rule_results: List[Dict], top_n: int = 8) -> List[Dict]:
+    def peer_text(rule_id: str, peer: Dict) -> str:
+        """Sentence comparing a rule value with peers"""
+        direction = 'lower than' if peer.get('inverse') else 'higher than'
+        return (
+            f"Your {ExplainabilityEngine.PEER_LABELS[rule_id]} is {direction} "
+            f"{peer['percentile']:.0f}% of {peer['peer_group']}"
+        )
+    
+    @staticmethod
+    def generate_factors(rule_results: List[Dict], top_n: int = 8,
+                         peers: Optional[Dict[str, Dict]] = None) -> List[Dict]:
         """
         Generate user-friendly factor explanations from rule results
         
         Args:
             rule_results: List of rule evaluation results
             top_n: Number of top factors to return
+            peers: Optional peer ranks per rule_id (PeerComparison.compare)
             
         Returns:
             List of factor dictionaries for frontend
@@ -349,6 +376,13 @@ class ExplainabilityEngine:
             # Add insight
             description += f"\n\n{rule_config['insight']}"
             
+            # Add peer comparison
+            peer = (peers or {}).get(rule_id)
+            peer_comparison = None
+            if peer is not None:
+                peer_comparison = ExplainabilityEngine.peer_text(rule_id, peer)
+                description += f"\n\nPeer Comparison: {peer_comparison}"
+            
             factors.append({
                 'id': idx + 1,
                 'rule_id': rule_id,
@@ -364,7 +398,9 @@ class ExplainabilityEngine:
                 'threshold_met': result['threshold_met'],
                 'points_earned': result['points_earned'],
                 'max_points': result['max_points'],
-                'status': result['status']
+                'status': result['status'],
+                'peer_percentile': peer['percentile'] if peer else None,
+                'peer_comparison': peer_comparison
             })
         
         return factors
@@ -185,20 +185,10 @@ class ScoringEngine:
             })
         
         # Convert points to score (420-860 range)
-        point_ratio = total_points / cls.MAX_POINTS
-        score_range = cls.SCORE_MAX - cls.SCORE_MIN
-        trust_score = cls.SCORE_MIN + int(point_ratio * score_range)
-        
-        # Ensure bounds
-        trust_score = max(cls.SCORE_MIN, min(cls.SCORE_MAX, trust_score))
+        trust_score = cls.points_to_score(total_points)
         
         # Classify risk
-        if trust_score >= 700:
-            risk_level = 'Low'
-        elif trust_score >= 550:
-            risk_level = 'Moderate'
-        else:
-            risk_level = 'High'
+        risk_level = cls.classify_risk(trust_score)
         
         # Count rule satisfaction
         rules_satisfied = sum(1 for r in rule_results if r['status'] == 'Fully Satisfied')
@@ -217,6 +207,24 @@ class ScoringEngine:
             'rules_not_met': rules_not_met
         }
     
+    @classmethod
+    def points_to_score(cls, total_points: int) -> int:
+        """
+        Trust score for a rule point total
+        
+        Args:
+            total_points: Points earned across all rules
+            
+        Returns:
+            Trust score in the SCORE_MIN-SCORE_MAX range
+        """
+        point_ratio = total_points / cls.MAX_POINTS
+        score_range = cls.SCORE_MAX - cls.SCORE_MIN
+        trust_score = cls.SCORE_MIN + int(point_ratio * score_range)
+        
+        # Ensure bounds
+        return max(cls.SCORE_MIN, min(cls.SCORE_MAX, trust_score))
+    
     @classmethod
     def get_assessment_strength(cls, behavioral_data: Dict, documentation_months: int) -> str:
         """
@@ -266,3 +274,18 @@ class ScoringEngine:
             return 'Medium'
         else:
             return 'Low'
+    
+    @staticmethod
+    def classify_risk(trust_score: int) -> str:
+        """
+        Risk level for a trust score
+        
+        Returns:
+            'Low' (700+), 'Moderate' (550-699) or 'High'
+        """
+        if trust_score >= 700:
+            return 'Low'
+        elif trust_score >= 550:
+            return 'Moderate'
+        else:
+            return 'High'
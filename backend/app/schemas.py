@@ -2,7 +2,7 @@
 Pydantic schemas for request/response validation
 """
 from pydantic import BaseModel, Field, EmailStr
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 
 
@@ -175,6 +175,8 @@ class Factor(BaseModel):
     points_earned: Optional[int] = None
     max_points: Optional[int] = None
     status: Optional[str] = None
+    peer_percentile: Optional[float] = Field(None, description="Share of peers this value is better than")
+    peer_comparison: Optional[str] = None
 
 
 class ExplainabilityResponse(BaseModel):
@@ -194,6 +196,44 @@ class ExplainabilityResponse(BaseModel):
     explanation_generated_at: datetime
 
 
+# ============= HYBRID SCORING =============
+class HybridScoreResponse(BaseModel):
+    """Blended rule + model score with both explanations"""
+    user_id: str
+    trust_score: int = Field(ge=300, le=900, description="Blended score (rule score if rule-only)")
+    risk_level: str
+    risk_color: str
+    scoring_mode: str = Field(..., description="hybrid or rule_only")
+    fallback_reason: Optional[str] = Field(None, description="timeout, model_unavailable or model_error")
+    
+    # Rule assessment
+    rule_score: int
+    rule_risk_level: str
+    assessment_strength: str
+    rule_match_level: str
+    rules_evaluated: int
+    rules_satisfied: int
+    rule_factors: List[Factor]
+    
+    # Model assessment (absent in rule-only mode)
+    model_score: Optional[int] = None
+    model_calibrated_score: Optional[float] = None
+    model_risk_level: Optional[str] = None
+    model_confidence: Optional[float] = None
+    model_version: Optional[str] = None
+    model_weight: float
+    model_latency_ms: Optional[float] = None
+    model_factors: List[Factor] = []
+    
+    scored_at: datetime
+    valid_until: datetime
+    message: str
+    
+    class Config:
+        # Allow the model_* field names
+        protected_namespaces = ()
+
+
 # ============= IMPROVEMENT PLAN =============
 class Recommendation(BaseModel):
     """Single improvement recommendation"""
@@ -240,6 +280,11 @@ class LenderViewResponse(BaseModel):
     trust_score: int
     risk_level: str
     
+    # Position among the latest scores of all applicants
+    population_percentile: Optional[float] = Field(None, description="Share of applicants scoring lower (%)")
+    population_top_percent: Optional[float] = Field(None, description="Share scoring the same or higher (%)")
+    population_size: Optional[int] = None
+    
     # Assessment Summary (replaced AI recommendation)
     assessment_classification: str
     assessment_strength: str
@@ -293,3 +338,85 @@ class RoadmapResponse(BaseModel):
     """User improvement roadmap"""
     user_id: str
     roadmap: List[RoadmapStep]
+
+
+# ============= COUNTERFACTUAL PLANS =============
+class PlanChange(BaseModel):
+    """One rule level upgrade within a plan"""
+    rule_id: str
+    rule_name: str
+    from_level: str
+    to_level: str
+    current_value: float
+    target_value: float
+    points_gained: int
+    effort_months: float
+
+
+class CounterfactualPlan(BaseModel):
+    """Set of rule upgrades reaching the target band"""
+    changes: List[PlanChange]
+    points_gained: int
+    effort_months: float = Field(..., description="Total effort (the quantity minimized)")
+    elapsed_months: float = Field(..., description="Duration if all changes are pursued in parallel")
+    projected_score: int
+    projected_band: str
+
+
+class CounterfactualResponse(BaseModel):
+    """Least-effort plans to reach a target risk band"""
+    user_id: str
+    current_score: int
+    current_band: str
+    target_band: str
+    target_score: int
+    points_needed: int
+    status: str = Field(..., description="met, solved or unreachable")
+    plans: List[CounterfactualPlan]
+    optimal: Optional[CounterfactualPlan] = None
+
+
+class CounterfactualPortfolioRequest(BaseModel):
+    """Plans for a portfolio of applicants"""
+    user_ids: List[str] = Field(..., min_length=1, max_length=5000)
+    target_band: str = Field("Low", description="Moderate or Low")
+    top_k: int = Field(1, ge=1, le=10)
+
+
+class CounterfactualPortfolioResponse(BaseModel):
+    """Plans per applicant; users without behavioral data are listed as missing"""
+    target_band: str
+    results: List[CounterfactualResponse]
+    missing: List[str]
+
+
+# ============= DRIFT MONITORING =============
+class FieldDrift(BaseModel):
+    """Drift of one behavioral field against the reference"""
+    field: str
+    psi: float
+    ks: float
+    current_mean: float
+    reference_mean: float
+    mean_shift_std: float = Field(..., description="Mean shift in reference standard deviations")
+    status: str = Field(..., description="insufficient_data, stable, moderate or significant")
+
+
+class RuleDrift(BaseModel):
+    """Drift of one rule's level distribution against the reference"""
+    rule_id: str
+    psi: float
+    current_levels: Dict[str, int]
+    reference_levels: Dict[str, int]
+    status: str
+
+
+class DriftReportResponse(BaseModel):
+    """Input drift of recent assessments"""
+    status: str = Field(..., description="Worst field/rule status, or no_reference")
+    n_current: int
+    n_reference: int
+    window_started: datetime
+    reference_taken_at: Optional[datetime] = None
+    fields: List[FieldDrift]
+    rules: List[RuleDrift]
@@ -0,0 +1,125 @@
+"""
+Benchmark: memory per worker, joblib pickles vs memory-mapped artifact
+Starts N worker processes that each load the model the way a uvicorn
+worker would, score a batch, and report RSS and PSS (proportional set
+size: shared pages divided among the processes mapping them). PSS comes
+from /proc/self/smaps_rollup and is only available on Linux.
+
+Usage:
+    python benchmarks/artifact_rss.py [--workers 8] [--trees 300] [--samples 20000]
+"""
+import argparse
+import multiprocessing as mp
+import os
+import sys
+import tempfile
+
+# Add backend directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def memory_kb():
+    """(rss, pss) of the current process in kB"""
+    values = {}
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            for line in f:
+                key, _, rest = line.partition(':')
+                if key in ('Rss', 'Pss'):
+                    values[key] = int(rest.split()[0])
+    except OSError:
+        import resource
+        values['Rss'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return values.get('Rss', 0), values.get('Pss')
+
+
+def worker(mode, paths, barrier, results):
+    import numpy as np
+    from app.ml.model import CreditTrustModel
+    from app.ml.synthetic_data import generate_synthetic_training_data
+
+    X, _ = generate_synthetic_training_data(n_samples=256, seed=3)
+    rss_before, _ = memory_kb()
+
+    if mode == 'legacy':
+        model = CreditTrustModel()
+        model.load(paths['model'], paths['scaler'], paths['explainer'])
+    else:
+        model = CreditTrustModel.load_artifact(paths['artifact'])
+    model.predict_scores(X)
+    np.asarray(model.forest.value).sum()  # touch every node page
+
+    # Measure once every worker holds the model, so PSS reflects sharing
+    barrier.wait()
+    rss_after, pss_after = memory_kb()
+    results.put((rss_after - rss_before, rss_after, pss_after))
+    barrier.wait()
+
+
+def run_workers(mode, paths, n_workers):
+    ctx = mp.get_context('spawn')
+    barrier = ctx.Barrier(n_workers)
+    results = ctx.Queue()
+    processes = [ctx.Process(target=worker, args=(mode, paths, barrier, results)) for _ in range(n_workers)]
+    for process in processes:
+        process.start()
+    measurements = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return measurements
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Per-worker model memory benchmark')
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--trees', type=int, default=300)
+    parser.add_argument('--samples', type=int, default=20000)
+    args = parser.parse_args()
+
+    from app.ml.model import CreditTrustModel
+    from app.ml.synthetic_data import generate_synthetic_training_data
+
+    print("=" * 60)
+    print("NEXIS Model Memory per Worker Benchmark")
+    print("=" * 60)
+
+    print(f"\n🎯 Training {args.trees}-tree model on {args.samples:,} samples...")
+    model = CreditTrustModel()
+    X, y = generate_synthetic_training_data(n_samples=args.samples)
+    model.train(X, y)
+    if args.trees != model.model.n_estimators:
+        import shap
+        from app.ml.forest_engine import FlatForest
+        model.model.set_params(n_estimators=args.trees).fit(model.scaler.transform(X), y)
+        model.explainer = shap.TreeExplainer(model.model)
+        model.forest = FlatForest.from_sklearn(model.model, model.scaler)
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = {
+            'model': os.path.join(directory, 'model.pkl'),
+            'scaler': os.path.join(directory, 'scaler.pkl'),
+            'explainer': os.path.join(directory, 'explainer.pkl'),
+            'artifact': os.path.join(directory, 'model.nexis')
+        }
+        model.save(paths['model'], paths['scaler'], paths['explainer'])
+        model.save_artifact(paths['artifact'])
+        legacy_size = sum(os.path.getsize(paths[k]) for k in ('model', 'scaler', 'explainer'))
+        print(f"   - joblib pickles: {legacy_size / 1e6:.1f} MB, artifact: "
+              f"{os.path.getsize(paths['artifact']) / 1e6:.1f} MB")
+
+        for mode in ('legacy', 'artifact'):
+            measurements = run_workers(mode, paths, args.workers)
+            growth = sum(m[0] for m in measurements) / len(measurements)
+            rss = sum(m[1] for m in measurements) / len(measurements)
+            pss = [m[2] for m in measurements]
+            label = 'joblib pickles' if mode == 'legacy' else 'mmap artifact'
+            print(f"\n📊 {label} ({args.workers} workers):")
+            print(f"   - RSS growth from loading: {growth / 1024:8.1f} MB per worker")
+            print(f"   - RSS:                     {rss / 1024:8.1f} MB per worker")
+            if all(p is not None for p in pss):
+                print(f"   - PSS:                     {sum(pss) / len(pss) / 1024:8.1f} MB per worker "
+                      f"({sum(pss) / 1024:.1f} MB total)")
+
+
+if __name__ == "__main__":
+    main()
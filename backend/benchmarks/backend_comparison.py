@@ -0,0 +1,95 @@
+"""
+Benchmark: random forest vs histogram gradient boosting backend
+Trains CreditTrustModel with each backend on the same synthetic data and
+reports training time, test accuracy, explained single-row latency
+(median, from the loaded artifact), batch throughput with and without
+attributions, and artifact size (total and flat node arrays).
+
+Usage:
+    python benchmarks/backend_comparison.py [--samples 20000] [--batch 1000] [--repeats 300]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+# Add backend directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.ml.model import CreditTrustModel
+from app.ml.synthetic_data import generate_synthetic_training_data
+
+BACKENDS = ('random_forest', 'hist_gradient_boosting')
+
+
+def median_ms(call, repeats):
+    call()
+    timings = np.empty(repeats)
+    for i in range(repeats):
+        start = time.perf_counter()
+        call()
+        timings[i] = time.perf_counter() - start
+    return float(np.median(timings) * 1000)
+
+
+def rows_per_second(call, n_rows, repeats=5):
+    call()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        call()
+    return n_rows * repeats / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Model backend comparison')
+    parser.add_argument('--samples', type=int, default=20000, help='training samples')
+    parser.add_argument('--batch', type=int, default=1000, help='rows per batch call')
+    parser.add_argument('--repeats', type=int, default=300, help='single-row timing repeats')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("NEXIS Model Backend Benchmark")
+    print("=" * 60)
+
+    X_train, y = generate_synthetic_training_data(n_samples=args.samples)
+    X = generate_synthetic_training_data(n_samples=args.batch, seed=7)[0].to_numpy(dtype=np.float32)
+    row = X[:1]
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for backend in BACKENDS:
+            print(f"\n🔧 {backend}: training on {args.samples:,} samples...")
+            trained = CreditTrustModel(backend=backend)
+            start = time.perf_counter()
+            metrics = trained.train(X_train, y)
+            training_seconds = time.perf_counter() - start
+
+            path = os.path.join(directory, f'{backend}.nexis')
+            trained.save_artifact(path)
+            model = CreditTrustModel.load_artifact(path)
+
+            results[backend] = {
+                'training': f"{training_seconds:.2f} s",
+                'test accuracy': f"{metrics['test_accuracy']:.4f}",
+                'trees': f"{model.forest.n_trees}",
+                'nodes': f"{len(model.forest.feature):,}",
+                'single row + explain': f"{median_ms(lambda: model.predict_array(row, explain=True), args.repeats):.3f} ms",
+                'batch scoring': f"{rows_per_second(lambda: model.predict_array(X), len(X)):,.0f} rows/s",
+                'batch + explain': f"{rows_per_second(lambda: model.predict_array(X, explain=True), len(X)):,.0f} rows/s",
+                'artifact size': f"{os.path.getsize(path) / 1024:,.0f} KiB",
+                'flat arrays': f"{sum(a.nbytes for a in model.forest.to_arrays().values()) / 1024:,.0f} KiB"
+            }
+
+    print(f"\n📊 Results ({args.batch:,}-row batches, float32 input):")
+    print(f"   {'':<22}" + ''.join(f"{backend:>26}" for backend in BACKENDS))
+    for metric in results[BACKENDS[0]]:
+        print(f"   {metric:<22}" + ''.join(f"{results[backend][metric]:>26}" for backend in BACKENDS))
+
+    print("\n✅ Done")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark: counterfactual plan solver
+Solves least-effort plans to reach the Low risk band for random applicants
+and reports single-applicant latency (median and p99) and portfolio
+throughput (solve_portfolio).
+
+Usage:
+    python benchmarks/counterfactual_solver.py [--applicants 2000] [--top-k 3]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+# Add backend directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.rules.counterfactual import CounterfactualSolver
+from app.rules.scoring_engine import ScoringEngine
+
+
+def random_rule_results(rng):
+    """Rule results of an applicant with values scattered around the thresholds"""
+    data = {}
+    for rule in ScoringEngine.RULES.values():
+        thresholds = rule['thresholds']
+        spread = abs(thresholds['high'] - thresholds['low'])
+        level = rng.choice(['high', 'medium', 'low', 'low'])
+        data[rule['field']] = thresholds[level] + rng.uniform(-1.0, 0.5) * spread
+    return ScoringEngine.calculate_score(data)['rule_results']
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Counterfactual solver benchmark')
+    parser.add_argument('--applicants', type=int, default=2000, help='applicants in the portfolio')
+    parser.add_argument('--top-k', type=int, default=3, help='plans per applicant')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("NEXIS Counterfactual Solver Benchmark")
+    print("=" * 60)
+
+    rng = random.Random(0)
+    portfolio = {f"U{i}": random_rule_results(rng) for i in range(args.applicants)}
+
+    timings = []
+    for rule_results in portfolio.values():
+        start = time.perf_counter()
+        CounterfactualSolver.solve(rule_results, 'Low', args.top_k)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+
+    start = time.perf_counter()
+    results = CounterfactualSolver.solve_portfolio(portfolio, 'Low', args.top_k)
+    portfolio_seconds = time.perf_counter() - start
+    statuses = statistics.multimode(result['status'] for result in results.values())
+
+    print(f"\n📊 Results ({args.applicants:,} applicants, top {args.top_k} plans, target Low):")
+    print(f"   single applicant median: {statistics.median(timings):.2f} ms")
+    print(f"   single applicant p99:    {timings[int(0.99 * (len(timings) - 1))]:.2f} ms")
+    print(f"   portfolio:               {args.applicants / portfolio_seconds:,.0f} applicants/s")
+    print(f"   most common status:      {', '.join(statuses)}")
+
+    print("\n✅ Done")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark: sklearn forest vs flattened forest inference
+Measures single-row latency and batch throughput of scaler + predict +
+predict_proba in sklearn against FlatForest.predict_proba, and checks
+that the probabilities are bit-identical. A batch-size sweep shows where
+sklearn overtakes the flat engine and that CreditTrustModel.predict_proba
+follows the faster one (CreditTrustModel.SKLEARN_MIN_ROWS).
+
+Usage:
+    python benchmarks/forest_inference.py [--single 2000] [--batch 100000]
+    python benchmarks/forest_inference.py --backend hist_gradient_boosting --sizes 1,64,128,512
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add backend directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.ml.model import CreditTrustModel
+from app.ml.synthetic_data import generate_synthetic_training_data
+
+
+def per_call_us(fn, rows):
+    start = time.perf_counter()
+    for row in rows:
+        fn(row)
+    return (time.perf_counter() - start) / len(rows) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Forest inference benchmark')
+    parser.add_argument('--single', type=int, default=2000, help='single-row calls')
+    parser.add_argument('--batch', type=int, default=100000, help='rows for the batch run')
+    parser.add_argument('--backend', default='random_forest', choices=['random_forest', 'hist_gradient_boosting'])
+    parser.add_argument('--sizes', default='1,64,256,1024,4096,16384', help='batch sizes for the sweep')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("NEXIS Forest Inference Benchmark")
+    print("=" * 60)
+
+    print("\n🎯 Training model...")
+    model = CreditTrustModel(backend=args.backend)
+    X_train, y_train = generate_synthetic_training_data(n_samples=2000)
+    model.train(X_train, y_train)
+    sk_model, scaler, flat = model.model, model.scaler, model.forest
+
+    X, _ = generate_synthetic_training_data(n_samples=max(args.single, args.batch), seed=11)
+    X = X.to_numpy()
+    rows = [X[i:i + 1] for i in range(args.single)]
+
+    def sklearn_single(row):
+        scaled = scaler.transform(row)
+        sk_model.predict(scaled)
+        return sk_model.predict_proba(scaled)
+
+    print(f"\n⏱️  Single row ({args.single:,} calls):")
+    sk_us = per_call_us(sklearn_single, rows)
+    flat_us = per_call_us(flat.predict_proba, rows)
+    print(f"   - sklearn scaler + predict + predict_proba: {sk_us:8.1f} µs")
+    print(f"   - {type(flat).__name__}.predict_proba:                 {flat_us:8.1f} µs  ({sk_us / flat_us:.1f}x)")
+
+    batch = X[:args.batch]
+    print(f"\n⏱️  Batch ({len(batch):,} rows):")
+    start = time.perf_counter()
+    expected = sk_model.predict_proba(scaler.transform(batch))
+    sk_s = time.perf_counter() - start
+    start = time.perf_counter()
+    actual = flat.predict_proba(batch)
+    flat_s = time.perf_counter() - start
+    print(f"   - sklearn:    {len(batch) / sk_s:12,.0f} rows/s")
+    print(f"   - {type(flat).__name__}: {len(batch) / flat_s:12,.0f} rows/s  ({sk_s / flat_s:.1f}x)")
+
+    identical = np.array_equal(expected, actual)
+    print(f"\n{'✅' if identical else '❌'} Bit-identical probabilities: {identical}")
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    print(f"\n⏱️  Batch size sweep (ms per batch, model switches to sklearn "
+          f"from {model.SKLEARN_MIN_ROWS[args.backend]} rows):")
+    print(f"   {'rows':>6} {'flat':>10} {'sklearn':>10} {'model':>10}")
+    for size in sizes:
+        sized = X[:size]
+        repeats = max(3, 4096 // size)
+        timings = [
+            per_call_us(fn, [sized] * repeats) / 1000
+            for fn in (
+                flat.predict_proba,
+                lambda rows: sk_model.predict_proba(scaler.transform(rows)),
+                model.predict_proba
+            )
+        ]
+        print(f"   {size:>6} " + " ".join(f"{ms:10.2f}" for ms in timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark: micro-batched vs per-request model scoring under concurrency
+C concurrent clients each score rows back to back, either calling the
+model directly per request or through the InferenceServer with each
+executor. Reports throughput, latency percentiles and mean batch size.
+
+Usage:
+    python benchmarks/inference_batching.py [--clients 64] [--requests 4000] [--max-wait-ms 2]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+# Add backend directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.ml.inference_server import InferenceServer, score_batch
+from app.ml.model import CreditTrustModel
+from app.ml.synthetic_data import generate_synthetic_training_data
+
+
+async def drive(score, X, clients, n_requests):
+    """Run n_requests through `score` from `clients` concurrent callers"""
+    latencies = []
+    counter = iter(range(n_requests))
+
+    async def client():
+        for i in counter:
+            start = time.perf_counter()
+            await score(X[i % len(X)])
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+    return n_requests / elapsed, np.percentile(latencies, [50, 99]) * 1000
+
+
+def report(label, throughput, percentiles, batch_size=None):
+    batch = f"  mean batch {batch_size:5.1f}" if batch_size is not None else ''
+    print(f"   - {label:<22} {throughput:9,.0f} req/s  p50 {percentiles[0]:7.2f} ms  "
+          f"p99 {percentiles[1]:7.2f} ms{batch}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inference micro-batching benchmark')
+    parser.add_argument('--clients', type=int, default=64)
+    parser.add_argument('--requests', type=int, default=4000)
+    parser.add_argument('--max-batch-size', type=int, default=64)
+    parser.add_argument('--max-wait-ms', type=float, default=2.0)
+    parser.add_argument('--workers', type=int, default=2, help='pool size for thread/process executors')
+    parser.add_argument('--no-explain', action='store_true', help='score only, skip attributions')
+    args = parser.parse_args()
+    explain = not args.no_explain
+
+    print("=" * 60)
+    print("NEXIS Inference Micro-Batching Benchmark")
+    print("=" * 60)
+
+    X_train, y = generate_synthetic_training_data(n_samples=5000)
+    trained = CreditTrustModel()
+    trained.train(X_train, y)
+    X = generate_synthetic_training_data(n_samples=1000, seed=7)[0].to_numpy()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'model.nexis')
+        trained.save_artifact(path)
+        model = CreditTrustModel.load_artifact(path)
+
+        print(f"\n⏱️  {args.requests:,} requests from {args.clients} clients "
+              f"(explain={explain}, max wait {args.max_wait_ms} ms):")
+
+        async def per_request(row):
+            return score_batch(model, row[np.newaxis, :], explain)
+
+        report('per request (inline)', *asyncio.run(drive(per_request, X, args.clients, args.requests)))
+
+        for executor in ('inline', 'thread', 'process'):
+            server = InferenceServer(
+                lambda: model, max_batch_size=args.max_batch_size, max_wait_ms=args.max_wait_ms,
+                executor=executor, workers=args.workers
+            )
+            batches = []
+            source = server.model_source
+            server.model_source = lambda: batches.append(None) or source()
+
+            async def batched(row):
+                return await server.submit(row, explain=explain)
+
+            async def run():
+                # Warm the pool (process workers import and map the model once)
+                await batched(X[0])
+                batches.clear()
+                try:
+                    return await drive(batched, X, args.clients, args.requests)
+                finally:
+                    await server.stop()
+
+            throughput, percentiles = asyncio.run(run())
+            report(f'micro-batched ({executor})', throughput, percentiles, args.requests / max(len(batches), 1))
+
+    print("\n✅ Done")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,353 @@
+"""
+End-to-end API load test with scripted applicant journeys
+
+Each virtual user runs the full journey
+    register -> login -> consent -> score -> explainability -> improvement
+    -> lender-view -> lender-decision
+and then issues follow-up requests drawn from a weighted request mix.
+
+The app is driven in-process through httpx's ASGI transport (default) or
+against a running server with --base-url. Reports throughput, latency
+percentiles and error rates per endpoint, and can act as a regression gate
+against a saved baseline.
+
+Usage:
+    python benchmarks/load_harness.py --users 50 --concurrency 10
+    python benchmarks/load_harness.py --base-url http://localhost:8000 --users 200
+    python benchmarks/load_harness.py --save baseline.json
+    python benchmarks/load_harness.py --baseline baseline.json --max-regression 0.25
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import sys
+import time
+import uuid
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+# Add backend directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+API = "/api/v1"
+
+DEFAULT_MIX = {
+    "score": 1,
+    "explainability": 3,
+    "improvement": 2,
+    "lender-view": 3,
+    "lender-decision": 1
+}
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def random_behavioral_data(rng: random.Random) -> Dict:
+    """Behavioral payload drawn from a low, moderate or high risk profile"""
+    profile = rng.choices(['low', 'moderate', 'high'], weights=[0.4, 0.45, 0.15])[0]
+    quality = {'low': 0.85, 'moderate': 0.6, 'high': 0.3}[profile]
+
+    def frac(spread=0.15):
+        return round(min(1.0, max(0.0, rng.gauss(quality, spread))), 3)
+
+    return {
+        "utility_payment_months": rng.randint(0, 36),
+        "utility_payment_consistency": frac(),
+        "monthly_transaction_count": rng.randint(5, 80),
+        "transaction_regularity_score": frac(),
+        "spending_volatility": round(1 - frac(), 3),
+        "avg_month_end_balance": round(rng.uniform(0, 15000), 2),
+        "savings_growth_rate": round(rng.uniform(-0.3, 0.3), 3),
+        "withdrawal_discipline_score": frac(),
+        "income_regularity_score": frac(),
+        "income_stability_months": rng.randint(0, 48),
+        "account_tenure_months": rng.randint(3, 120),
+        "address_stability_years": round(rng.uniform(0.5, 10.0), 1),
+        "discretionary_income_ratio": round(rng.uniform(0.05, 0.35), 3)
+    }
+
+
+class Recorder:
+    """Latency and outcome samples per endpoint"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.status_codes: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+
+    async def call(self, client: httpx.AsyncClient, endpoint: str, method: str, url: str,
+                   expected=(200,), **kwargs) -> Optional[httpx.Response]:
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.latencies[endpoint].append(time.perf_counter() - start)
+            self.errors[endpoint] += 1
+            self.status_codes[endpoint][0] += 1
+            return None
+        self.latencies[endpoint].append(time.perf_counter() - start)
+        self.status_codes[endpoint][response.status_code] += 1
+        if response.status_code not in expected:
+            self.errors[endpoint] += 1
+            return None
+        return response
+
+    def report(self, wall_time: float) -> Dict:
+        endpoints = {}
+        total_requests = 0
+        total_errors = 0
+        for endpoint, samples in sorted(self.latencies.items()):
+            ordered = sorted(samples)
+            errors = self.errors[endpoint]
+            total_requests += len(ordered)
+            total_errors += errors
+            endpoints[endpoint] = {
+                'requests': len(ordered),
+                'errors': errors,
+                'error_rate': errors / len(ordered) if ordered else 0.0,
+                'throughput_rps': len(ordered) / wall_time if wall_time else 0.0,
+                'p50_ms': percentile(ordered, 50) * 1000,
+                'p95_ms': percentile(ordered, 95) * 1000,
+                'p99_ms': percentile(ordered, 99) * 1000,
+                'max_ms': ordered[-1] * 1000 if ordered else 0.0,
+                'status_codes': {str(k): v for k, v in sorted(self.status_codes[endpoint].items())}
+            }
+        return {
+            'wall_time_s': wall_time,
+            'total_requests': total_requests,
+            'total_errors': total_errors,
+            'error_rate': total_errors / total_requests if total_requests else 0.0,
+            'throughput_rps': total_requests / wall_time if wall_time else 0.0,
+            'endpoints': endpoints
+        }
+
+
+async def applicant_journey(client: httpx.AsyncClient, recorder: Recorder, rng: random.Random,
+                            mix: Dict[str, int], follow_ups: int):
+    """Run one virtual user's journey"""
+    email = f"load-{uuid.uuid4().hex[:12]}@example.com"
+    password = "LoadTest123!"
+
+    response = await recorder.call(client, "register", "POST", f"{API}/auth/register", json={
+        "name": "Load Tester", "email": email, "password": password
+    })
+    if response is None:
+        return
+    user_id = response.json()["user_id"]
+
+    response = await recorder.call(client, "login", "POST", f"{API}/auth/login", json={
+        "email": email, "password": password
+    })
+    if response is None:
+        return
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    response = await recorder.call(client, "consent", "POST", f"{API}/consent",
+                                   json={"consent_given": True}, headers=headers)
+    if response is None:
+        return
+
+    async def score():
+        return await recorder.call(client, "score", "POST", f"{API}/score", json={
+            "user_id": user_id, "behavioral_data": random_behavioral_data(rng)
+        })
+
+    async def explainability():
+        return await recorder.call(client, "explainability", "GET", f"{API}/explainability/{user_id}")
+
+    async def improvement():
+        return await recorder.call(client, "improvement", "GET", f"{API}/improvement/{user_id}")
+
+    async def lender_view():
+        return await recorder.call(client, "lender-view", "GET", f"{API}/lender-view/{user_id}")
+
+    async def lender_decision():
+        return await recorder.call(client, "lender-decision", "POST", f"{API}/lender-decision", json={
+            "user_id": user_id,
+            "lender_id": "LOADTEST-LENDER",
+            "decision": rng.choice(["approve", "request_more_data", "decline"]),
+            "justification": "Automated load test decision with sufficient justification text."
+        })
+
+    steps = {
+        "score": score,
+        "explainability": explainability,
+        "improvement": improvement,
+        "lender-view": lender_view,
+        "lender-decision": lender_decision
+    }
+
+    # Scripted journey
+    if await score() is None:
+        return
+    for name in ("explainability", "improvement", "lender-view", "lender-decision"):
+        await steps[name]()
+
+    # Follow-up traffic according to the request mix
+    names = [name for name in mix if mix[name] > 0]
+    weights = [mix[name] for name in names]
+    for _ in range(follow_ups):
+        await steps[rng.choices(names, weights=weights)[0]]()
+
+
+async def run_load_test(users: int = 20, concurrency: int = 5, follow_ups: int = 5,
+                        mix: Optional[Dict[str, int]] = None, base_url: Optional[str] = None,
+                        bypass_rate_limits: bool = True, seed: int = 42) -> Dict:
+    """
+    Run the load test and return the report
+
+    Args:
+        users: Number of virtual users (journeys)
+        concurrency: Journeys in flight at once
+        follow_ups: Mixed requests per user after the scripted journey
+        mix: Relative weights of follow-up endpoints
+        base_url: Target server; None drives the app in-process
+        bypass_rate_limits: Disable slowapi limits (in-process only; set
+            RATE_LIMIT_ENABLED=false on a remote server)
+        seed: RNG seed for payloads and request mix
+    """
+    mix = mix or DEFAULT_MIX
+    recorder = Recorder()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded(client, index):
+        async with semaphore:
+            await applicant_journey(client, recorder, random.Random(seed + index), mix, follow_ups)
+
+    async def drive(client):
+        start = time.perf_counter()
+        await asyncio.gather(*(bounded(client, i) for i in range(users)))
+        return time.perf_counter() - start
+
+    if base_url:
+        async with httpx.AsyncClient(base_url=base_url, timeout=30.0) as client:
+            wall_time = await drive(client)
+    else:
+        from app.main import app, limiter as app_limiter
+        from app.api.routes import limiter as route_limiter
+
+        if bypass_rate_limits:
+            app_limiter.enabled = False
+            route_limiter.enabled = False
+
+        transport = httpx.ASGITransport(app=app)
+        async with app.router.lifespan_context(app):
+            async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+                wall_time = await drive(client)
+
+    report = recorder.report(wall_time)
+    report['config'] = {
+        'users': users,
+        'concurrency': concurrency,
+        'follow_ups': follow_ups,
+        'mix': mix,
+        'target': base_url or 'in-process'
+    }
+    return report
+
+
+def check_regressions(report: Dict, baseline: Optional[Dict], max_regression: float,
+                      max_error_rate: float, max_p95_ms: Optional[float]) -> List[str]:
+    """Return a list of gate failures (empty if the run passes)"""
+    failures = []
+    if report['error_rate'] > max_error_rate:
+        failures.append(f"error rate {report['error_rate']:.2%} > {max_error_rate:.2%}")
+
+    for endpoint, stats in report['endpoints'].items():
+        if max_p95_ms is not None and stats['p95_ms'] > max_p95_ms:
+            failures.append(f"{endpoint}: p95 {stats['p95_ms']:.1f} ms > {max_p95_ms:.1f} ms")
+        if baseline is None or endpoint not in baseline['endpoints']:
+            continue
+        reference = baseline['endpoints'][endpoint]['p95_ms']
+        if reference > 0 and stats['p95_ms'] > reference * (1 + max_regression):
+            failures.append(
+                f"{endpoint}: p95 {stats['p95_ms']:.1f} ms regressed more than "
+                f"{max_regression:.0%} from baseline {reference:.1f} ms"
+            )
+    return failures
+
+
+def parse_mix(value: str) -> Dict[str, int]:
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        if name.strip() not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"Unknown endpoint in mix: {name}")
+        mix[name.strip()] = int(weight or 1)
+    return mix
+
+
+def print_report(report: Dict):
+    print(f"\n📈 {report['total_requests']:,} requests in {report['wall_time_s']:.2f}s "
+          f"({report['throughput_rps']:.1f} req/s), error rate {report['error_rate']:.2%}\n")
+    print(f"   {'endpoint':<16}{'reqs':>7}{'rps':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}")
+    for endpoint, stats in report['endpoints'].items():
+        print(f"   {endpoint:<16}{stats['requests']:>7}{stats['throughput_rps']:>9.1f}"
+              f"{stats['p50_ms']:>9.1f}{stats['p95_ms']:>9.1f}{stats['p99_ms']:>9.1f}{stats['errors']:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='NEXIS end-to-end load test')
+    parser.add_argument('--users', type=int, default=20, help='virtual users (journeys)')
+    parser.add_argument('--concurrency', type=int, default=5, help='journeys in flight')
+    parser.add_argument('--follow-ups', type=int, default=5, help='mixed requests per user after the journey')
+    parser.add_argument('--mix', type=parse_mix, default=None,
+                        help='follow-up weights, e.g. "lender-view=5,score=1"')
+    parser.add_argument('--base-url', default=None, help='target a running server instead of in-process')
+    parser.add_argument('--keep-rate-limits', action='store_true', help='do not bypass rate limits')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--save', help='write the JSON report here')
+    parser.add_argument('--baseline', help='baseline JSON report to compare against')
+    parser.add_argument('--max-regression', type=float, default=0.2, help='allowed p95 increase vs baseline')
+    parser.add_argument('--max-error-rate', type=float, default=0.0)
+    parser.add_argument('--max-p95-ms', type=float, default=None, help='absolute p95 ceiling per endpoint')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("NEXIS Load Test")
+    print("=" * 60)
+
+    report = asyncio.run(run_load_test(
+        users=args.users,
+        concurrency=args.concurrency,
+        follow_ups=args.follow_ups,
+        mix=args.mix,
+        base_url=args.base_url,
+        bypass_rate_limits=not args.keep_rate_limits,
+        seed=args.seed
+    ))
+    print_report(report)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Report saved to {args.save}")
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    failures = check_regressions(report, baseline, args.max_regression, args.max_error_rate, args.max_p95_ms)
+    if failures:
+        print("\n❌ Regression gate failed:")
+        for failure in failures:
+            print(f"   - {failure}")
+        sys.exit(1)
+
+    print("\n✅ Regression gate passed")
+
+
+if __name__ == "__main__":
+    main()
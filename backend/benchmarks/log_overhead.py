@@ -0,0 +1,96 @@
+"""
+Benchmark: logging overhead per request
+Measures the time the request path spends emitting the per-request access
+log line, comparing the original synchronous three-pass masking formatter
+with the queued single-pass pipeline.
+
+Usage:
+    python benchmarks/log_overhead.py [--records 50000]
+"""
+import argparse
+import logging
+import os
+import re
+import sys
+import time
+
+# Add backend directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.middleware.logging import (
+    PIIMaskingFormatter,
+    ACCESS_LOGGER_NAME,
+    setup_logging,
+    shutdown_logging
+)
+
+
+class LegacyPIIMaskingFormatter(logging.Formatter):
+    """The original formatter: three uncompiled re.sub passes per record"""
+
+    def format(self, record):
+        original = super().format(record)
+        masked = re.sub(PIIMaskingFormatter.EMAIL_PATTERN, '[EMAIL_MASKED]', original)
+        masked = re.sub(PIIMaskingFormatter.PHONE_PATTERN, '[PHONE_MASKED]', masked)
+        return re.sub(PIIMaskingFormatter.SSN_PATTERN, '[SSN_MASKED]', masked)
+
+
+def emit_access_lines(logger, n_records):
+    """Emit n access lines the way the timing middleware does; returns µs per record"""
+    start = time.perf_counter()
+    for i in range(n_records):
+        logger.info("%s %s - %s - %.3fs", "GET", f"/api/v1/lender-view/NEX-{i:08X}", 200, 0.004)
+    return (time.perf_counter() - start) / n_records * 1e6
+
+
+def run_legacy(n_records, devnull):
+    handler = logging.StreamHandler(devnull)
+    handler.setFormatter(LegacyPIIMaskingFormatter(
+        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    ))
+    root = logging.getLogger()
+    root.addHandler(handler)
+    root.setLevel(logging.INFO)
+    try:
+        return emit_access_lines(logging.getLogger(ACCESS_LOGGER_NAME), n_records)
+    finally:
+        root.removeHandler(handler)
+
+
+def run_pipeline(n_records, devnull, log_format='text', sample_rate=1.0):
+    setup_logging(log_format=log_format, access_sample_rate=sample_rate, asynchronous=True, stream=devnull)
+    try:
+        per_record = emit_access_lines(logging.getLogger(ACCESS_LOGGER_NAME), n_records)
+    finally:
+        drain_start = time.perf_counter()
+        shutdown_logging()
+        drain = time.perf_counter() - drain_start
+    return per_record, drain
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Logging overhead benchmark')
+    parser.add_argument('--records', type=int, default=50000)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("NEXIS Logging Overhead Benchmark")
+    print("=" * 60)
+    print(f"\n📊 Emitting {args.records:,} access log lines per configuration")
+
+    with open(os.devnull, 'w') as devnull:
+        legacy = run_legacy(args.records, devnull)
+        text, text_drain = run_pipeline(args.records, devnull, 'text')
+        json_, json_drain = run_pipeline(args.records, devnull, 'json')
+        sampled, sampled_drain = run_pipeline(args.records, devnull, 'text', sample_rate=0.1)
+
+    print("\n⏱️  Request-path cost per record:")
+    print(f"   - Legacy sync, 3x re.sub:        {legacy:7.2f} µs")
+    print(f"   - Queued text, single pass:      {text:7.2f} µs  (listener drain {text_drain:.2f}s)")
+    print(f"   - Queued JSON, single pass:      {json_:7.2f} µs  (listener drain {json_drain:.2f}s)")
+    print(f"   - Queued text, 10% sampled:      {sampled:7.2f} µs  (listener drain {sampled_drain:.2f}s)")
+    print(f"\n✅ Request-path speedup (text): {legacy / text:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
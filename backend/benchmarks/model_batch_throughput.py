@@ -0,0 +1,82 @@
+"""
+Benchmark: model scoring and SHAP explanation throughput vs batch size
+Compares N single-row predict_score / explain_prediction calls with
+predict_scores / explain_predictions on batches of the same rows.
+
+Usage:
+    python benchmarks/model_batch_throughput.py [--rows 2048] [--batch-sizes 1,8,64,512,2048]
+"""
+import argparse
+import os
+import sys
+import time
+
+# Add backend directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.ml.model import CreditTrustModel
+from app.ml.synthetic_data import generate_synthetic_training_data
+from app.ml.registry import model_registry
+
+
+def load_or_train_model():
+    if model_registry.active_version():
+        return model_registry.load(), f'{model_registry.active_version()} loaded'
+    model = CreditTrustModel()
+    X, y = generate_synthetic_training_data(n_samples=2000)
+    model.train(X, y)
+    return model, 'trained'
+
+
+def rows_per_second(fn, X, batch_size):
+    start = time.perf_counter()
+    for offset in range(0, len(X), batch_size):
+        fn(X.iloc[offset:offset + batch_size])
+    return len(X) / (time.perf_counter() - start)
+
+
+def single_rows_per_second(fn, X):
+    start = time.perf_counter()
+    for i in range(len(X)):
+        fn(X.iloc[[i]])
+    return len(X) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Model batch throughput benchmark')
+    parser.add_argument('--rows', type=int, default=2048)
+    parser.add_argument('--batch-sizes', default='1,8,64,512,2048')
+    parser.add_argument('--explain-rows', type=int, default=256, help='rows for the (slower) SHAP runs')
+    args = parser.parse_args()
+    batch_sizes = [int(size) for size in args.batch_sizes.split(',')]
+
+    print("=" * 60)
+    print("NEXIS Model Batch Throughput Benchmark")
+    print("=" * 60)
+
+    model, source = load_or_train_model()
+    print(f"\n🤖 Model {source}")
+    X, _ = generate_synthetic_training_data(n_samples=args.rows, seed=7)
+    X_explain = X.iloc[:args.explain_rows]
+
+    print(f"\n⏱️  Scoring ({args.rows:,} rows):")
+    baseline = single_rows_per_second(model.predict_score, X)
+    print(f"   - predict_score per row:      {baseline:10,.0f} rows/s")
+    for size in batch_sizes:
+        rate = rows_per_second(model.predict_scores, X, size)
+        print(f"   - predict_scores batch {size:>5}: {rate:10,.0f} rows/s  ({rate / baseline:5.1f}x)")
+
+    print(f"\n⏱️  SHAP explanations ({len(X_explain):,} rows):")
+    baseline = single_rows_per_second(model.explain_prediction, X_explain)
+    print(f"   - explain_prediction per row:      {baseline:8,.0f} rows/s")
+    for size in batch_sizes:
+        if size > len(X_explain):
+            continue
+        rate = rows_per_second(model.explain_predictions, X_explain, size)
+        print(f"   - explain_predictions batch {size:>5}: {rate:8,.0f} rows/s  ({rate / baseline:5.1f}x)")
+
+    print("\n✅ Done")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Manage registered model versions
+Serving workers follow the ACTIVE pointer, so activate and rollback take
+effect within MODEL_REGISTRY_POLL_SECONDS without a restart
+
+Usage:
+    python manage_models.py list
+    python manage_models.py show v0003
+    python manage_models.py activate v0003
+    python manage_models.py rollback          # to the previously active version
+    python manage_models.py rollback v0001
+"""
+import argparse
+import json
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.ml.registry import model_registry, RegistryError
+
+
+def list_versions():
+    active = model_registry.active_version()
+    versions = model_registry.list_versions()
+    if not versions:
+        print(f"No versions registered in {model_registry.root}; run python train_model.py")
+        return
+    print(f"{'':2}{'VERSION':<10}{'CREATED':<28}{'TEST ACC':>10}  NOTES")
+    for manifest in versions:
+        marker = '* ' if manifest['version'] == active else '  '
+        accuracy = manifest['metrics'].get('test_accuracy')
+        accuracy = f"{accuracy:.2%}" if accuracy is not None else '-'
+        print(f"{marker}{manifest['version']:<10}{manifest['created_at'][:26]:<28}{accuracy:>10}  {manifest.get('notes') or ''}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Manage registered NEXIS model versions')
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('list', help='list versions (* marks the active one)')
+    show = commands.add_parser('show', help='print a version manifest')
+    show.add_argument('version')
+    activate = commands.add_parser('activate', help='serve a version')
+    activate.add_argument('version')
+    rollback = commands.add_parser('rollback', help='re-activate an earlier version')
+    rollback.add_argument('version', nargs='?', help='default: the previously active version')
+    args = parser.parse_args()
+
+    try:
+        if args.command == 'list':
+            list_versions()
+        elif args.command == 'show':
+            print(json.dumps(model_registry.manifest(args.version), indent=2))
+        elif args.command == 'activate':
+            pointer = model_registry.activate(args.version)
+            print(f"✅ Active version: {pointer['version']} (previous: {pointer['previous']})")
+        elif args.command == 'rollback':
+            pointer = model_registry.rollback(args.version)
+            print(f"✅ Rolled back to {pointer['version']} (previous: {pointer['previous']})")
+    except RegistryError as exc:
+        print(f"❌ {exc}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+"""
+Shared test configuration
+"""
+import os
+import shutil
+import tempfile
+
+# Must be set before app.core.config is first imported. The test database
+# lives in a temporary directory, never in the directory pytest runs from.
+TEST_DB_DIR = tempfile.mkdtemp(prefix="nexis-test-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(TEST_DB_DIR, 'nexis_test.db')}")
+os.environ.setdefault("ENVIRONMENT", "test")
+# Score percentiles are rebuilt from the test database, never saved
+os.environ.setdefault("SCORE_PERCENTILE_PATH", "")
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(TEST_DB_DIR, ignore_errors=True)
@@ -0,0 +1,114 @@
+"""
+Test Suite for the Memory-Mapped Model Artifact
+Tests round trips, checksum verification and lazy estimator loading
+"""
+import numpy as np
+import pytest
+
+from app.ml.artifact import Artifact, ArtifactError, read_header, write_artifact
+from app.ml.model import CreditTrustModel
+from app.ml.synthetic_data import generate_synthetic_training_data
+
+
+@pytest.fixture(scope="module")
+def trained():
+    """Small trained model and held-out rows"""
+    X, y = generate_synthetic_training_data(n_samples=1500, seed=0)
+    model = CreditTrustModel()
+    model.train(X, y)
+    X_new, _ = generate_synthetic_training_data(n_samples=40, seed=1)
+    return model, X_new
+
+
+class TestArtifactFile:
+    """Test the file format"""
+
+    def test_round_trip(self, tmp_path):
+        """Test that arrays and blobs come back unchanged and aligned"""
+        path = str(tmp_path / 'a.nexis')
+        arrays = {
+            'ints': np.arange(7, dtype=np.int32),
+            'floats': np.linspace(0, 1, 12).reshape(3, 4)
+        }
+        write_artifact(path, arrays, header={'model_type': 'test'}, blobs={'extra': b'payload'})
+
+        artifact = Artifact(path)
+        assert artifact.header['model_type'] == 'test'
+        assert artifact.blob('extra') == b'payload'
+        for name, array in arrays.items():
+            loaded = artifact.arrays[name]
+            assert loaded.dtype == array.dtype
+            assert np.array_equal(loaded, array)
+            assert artifact.header['entries'][name]['offset'] % 64 == 0
+
+    def test_arrays_are_read_only_maps(self, tmp_path):
+        """Test that loaded arrays are views of a read-only memory map"""
+        path = str(tmp_path / 'a.nexis')
+        write_artifact(path, {'x': np.ones(100)}, header={})
+
+        array = Artifact(path).arrays['x']
+        assert isinstance(array.base, np.memmap) or isinstance(array, np.memmap)
+        with pytest.raises(ValueError):
+            array[0] = 2.0
+
+    def test_corruption_is_detected(self, tmp_path):
+        """Test that a flipped data byte fails checksum verification"""
+        path = str(tmp_path / 'a.nexis')
+        write_artifact(path, {'x': np.arange(1000, dtype=np.float64)}, header={})
+        data_start = read_header(path)['data_start']
+        with open(path, 'r+b') as f:
+            f.seek(data_start + 100)
+            byte = f.read(1)
+            f.seek(data_start + 100)
+            f.write(bytes([byte[0] ^ 0xFF]))
+
+        with pytest.raises(ArtifactError):
+            Artifact(path)
+        Artifact(path, verify=False)
+
+    def test_rejects_foreign_files(self, tmp_path):
+        """Test that files without the magic prefix are rejected"""
+        path = tmp_path / 'not_a_model.nexis'
+        path.write_bytes(b'\x80\x04joblib pickle' * 4)
+        with pytest.raises(ArtifactError):
+            read_header(str(path))
+
+
+class TestModelArtifact:
+    """Test saving and loading CreditTrustModel artifacts"""
+
+    def test_predictions_match(self, trained, tmp_path):
+        """Test that an artifact-loaded model scores identically"""
+        model, X = trained
+        path = str(tmp_path / 'model.nexis')
+        header = model.save_artifact(path, version='v-test')
+
+        loaded = CreditTrustModel.load_artifact(path)
+        assert header['feature_schema']['names'] == model.feature_names
+        assert loaded.version == 'v-test'
+        assert loaded.feature_names == model.feature_names
+        assert np.array_equal(loaded.predict_proba(X), model.predict_proba(X))
+        for expected, actual in zip(model.predict_scores(X), loaded.predict_scores(X)):
+            assert np.array_equal(expected, actual)
+
+    def test_estimators_load_lazily(self, trained, tmp_path):
+        """Test that the sklearn blob is only unpickled for exact SHAP"""
+        model, X = trained
+        path = str(tmp_path / 'model.nexis')
+        model.save_artifact(path)
+
+        loaded = CreditTrustModel.load_artifact(path)
+        loaded.predict_scores(X)
+        loaded.explain_predictions(X, method='path')
+        assert loaded._model is None
+
+        exact = loaded.explain_predictions(X, method='shap')
+        assert loaded._model is not None
+        assert np.allclose(exact['contributions'], model.explain_predictions(X, method='shap')['contributions'])
+
+    def test_rejects_other_model_types(self, tmp_path):
+        """Test that a foreign model type is refused"""
+        path = str(tmp_path / 'other.nexis')
+        write_artifact(path, {'x': np.zeros(3)}, header={'model_type': 'linear'})
+        with pytest.raises(ArtifactError):
+            CreditTrustModel.load_artifact(path)
@@ -0,0 +1,144 @@
+"""
+Test Suite for the Flattened Gradient-Boosting Engine
+Tests agreement with HistGradientBoostingClassifier, attribution additivity
+and the histogram gradient boosting model backend
+"""
+import numpy as np
+import pytest
+from sklearn.ensemble import HistGradientBoostingClassifier
+from sklearn.preprocessing import StandardScaler
+
+from app.ml.boosting_engine import FlatBoosting
+from app.ml.forest_engine import fold_thresholds
+from app.ml.model import CreditTrustModel
+from app.ml.synthetic_data import generate_synthetic_training_data
+
+
+@pytest.fixture(scope="module")
+def fitted():
+    """Scaler and booster trained the way CreditTrustModel trains them"""
+    X, y = generate_synthetic_training_data(n_samples=1500, seed=0)
+    X = X.to_numpy()
+    scaler = StandardScaler().fit(X)
+    booster = HistGradientBoostingClassifier(
+        max_iter=40, max_leaf_nodes=15, early_stopping=False, random_state=42, class_weight='balanced'
+    ).fit(scaler.transform(X), y)
+    return scaler, booster, FlatBoosting.from_sklearn(booster, scaler)
+
+
+class TestFoldThresholdsFloat64:
+    """Test threshold folding at float64 precision"""
+
+    def test_folded_threshold_is_exact_boundary(self):
+        """Test that the folded value goes left and its successor goes right"""
+        rng = np.random.default_rng(0)
+        thresholds = rng.normal(size=200)
+        mean = rng.uniform(-100, 100, 200)
+        scale = rng.uniform(0.01, 50, 200)
+
+        folded = fold_thresholds(thresholds, mean, scale, dtype=np.float64)
+
+        assert ((folded - mean) / scale <= thresholds).all()
+        assert not ((np.nextafter(folded, np.inf) - mean) / scale <= thresholds).any()
+
+
+class TestFlatBoosting:
+    """Test the flattened booster"""
+
+    def test_raw_scores_match_sklearn(self, fitted):
+        """Test bit-identical raw scores and matching probabilities"""
+        scaler, booster, flat = fitted
+        X, _ = generate_synthetic_training_data(n_samples=2000, seed=1)
+        X = X.to_numpy()
+        scaled = scaler.transform(X)
+
+        assert np.array_equal(flat.decision_function(X), booster.decision_function(scaled))
+        assert np.allclose(flat.predict_proba(X), booster.predict_proba(scaled), rtol=0, atol=1e-12)
+        assert np.array_equal(flat.predict(X), booster.predict(scaled))
+
+    def test_one_tree_per_class_and_iteration(self, fitted):
+        """Test the tree layout"""
+        _, booster, flat = fitted
+
+        assert flat.n_trees == booster.n_iter_ * len(booster.classes_)
+        assert flat.tree_normalizer == 1.0
+
+    def test_path_contributions_are_additive(self, fitted):
+        """Test that bias plus contributions equals the raw score per class"""
+        _, _, flat = fitted
+        X, _ = generate_synthetic_training_data(n_samples=100, seed=3)
+        X = X.to_numpy()
+
+        bias, contributions = flat.contributions(X)
+
+        assert np.allclose(bias + contributions.sum(axis=1), flat.decision_function(X))
+
+    def test_save_and_load(self, fitted, tmp_path):
+        """Test that the baseline survives an .npz round trip"""
+        _, _, flat = fitted
+        X, _ = generate_synthetic_training_data(n_samples=50, seed=4)
+        X = X.to_numpy()
+        path = str(tmp_path / 'flat.npz')
+
+        flat.save(path)
+        loaded = FlatBoosting.load(path)
+
+        assert np.array_equal(loaded.baseline, flat.baseline)
+        assert np.array_equal(loaded.predict_proba(X), flat.predict_proba(X))
+
+    def test_rejects_binary_models(self):
+        """Test that a single tree per iteration is refused"""
+        X, y = generate_synthetic_training_data(n_samples=300, seed=5)
+        booster = HistGradientBoostingClassifier(max_iter=5).fit(X.to_numpy(), y == 0)
+
+        with pytest.raises(ValueError):
+            FlatBoosting.from_sklearn(booster)
+
+
+class TestBoostingBackend:
+    """Test CreditTrustModel with the histogram gradient boosting backend"""
+
+    def test_artifact_round_trip(self, tmp_path):
+        """Test training, artifact save/load and the scoring API"""
+        X, y = generate_synthetic_training_data(n_samples=1500, seed=6)
+        model = CreditTrustModel(backend='hist_gradient_boosting')
+        metrics = model.train(X, y, params={'max_iter': 30})
+        path = str(tmp_path / 'boosting.nexis')
+
+        model.save_artifact(path)
+        loaded = CreditTrustModel.load_artifact(path)
+        result = loaded.predict_array(X.to_numpy()[:20], explain=True)
+
+        assert metrics['test_accuracy'] > 0.5
+        assert loaded.backend == 'hist_gradient_boosting'
+        assert isinstance(loaded.forest, FlatBoosting)
+        assert np.array_equal(loaded.predict_proba(X), model.predict_proba(X))
+        assert result['contributions'].shape == (20, len(model.feature_names))
+        assert ((result['trust_score'] >= 300) & (result['trust_score'] <= 900)).all()
+
+    def test_backend_follows_estimator(self, fitted):
+        """Test that from_estimators picks the backend from the estimator"""
+        scaler, booster, _ = fitted
+
+        model = CreditTrustModel.from_estimators(booster, scaler)
+
+        assert model.backend == 'hist_gradient_boosting'
+        assert isinstance(model.forest, FlatBoosting)
+
+    def test_rejects_unknown_backend(self):
+        """Test that an unknown backend name is refused"""
+        with pytest.raises(ValueError):
+            CreditTrustModel(backend='linear')
+
+    def test_contributions_are_on_the_probability_scale(self, fitted):
+        """Test that boosted attributions sum to the predicted class probability"""
+        scaler, booster, _ = fitted
+        model = CreditTrustModel.from_estimators(booster, scaler)
+        X, _ = generate_synthetic_training_data(n_samples=200, seed=9)
+        X = X.to_numpy()
+        batch = model.explain_predictions(X, method='path')
+        probabilities = model.predict_proba(X)
+        predicted = probabilities[np.arange(len(X)), probabilities.argmax(axis=1)]
+
+        assert np.allclose(batch['contributions'].sum(axis=1) + batch['base_values'], predicted)
+        assert (np.abs(batch['contributions']) <= 1).all()
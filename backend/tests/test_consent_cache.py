@@ -0,0 +1,197 @@
+"""
+Test Suite for Consent Status Cache
+Tests caching, expiry and invalidation of consent lookups
+"""
+import asyncio
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from app.api.routes import limiter
+from app.db import models
+from app.db.database import SessionLocal, engine
+from app.db.query_monitor import record_queries
+from app.main import app
+from app.middleware.consent import (
+    ConsentCache,
+    consent_cache,
+    get_consent_status,
+    get_consent_statuses,
+    verify_consent_batch
+)
+
+
+def add_user(consent_given: bool) -> str:
+    """Insert a user directly and return its user_id"""
+    user_id = f"NEX-{uuid.uuid4().hex[:8].upper()}"
+    db = SessionLocal()
+    try:
+        db.add(models.User(
+            user_id=user_id,
+            name="Consent Tester",
+            email=f"{user_id.lower()}@example.com",
+            hashed_password="x",
+            consent_given=consent_given
+        ))
+        db.commit()
+    finally:
+        db.close()
+    return user_id
+
+
+def set_consent_in_db(user_id: str, consent_given: bool):
+    """Change consent behind the cache's back"""
+    db = SessionLocal()
+    try:
+        db.query(models.User).filter(models.User.user_id == user_id).update(
+            {models.User.consent_given: consent_given}
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def db():
+    """Session on the test database with an empty consent cache"""
+    models.Base.metadata.create_all(bind=engine)
+    consent_cache.clear()
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+class TestConsentCache:
+    """Test the consent status cache"""
+
+    def test_miss_returns_none(self):
+        """Test that an unknown user is a cache miss"""
+        cache = ConsentCache()
+        assert cache.get('NEX-UNKNOWN') is None
+        assert cache.stats()['misses'] == 1
+
+    def test_set_and_get(self):
+        """Test that granted consent is cached and refusals are not"""
+        cache = ConsentCache()
+        cache.set('NEX-1', True)
+        cache.set('NEX-2', False)
+
+        assert cache.get('NEX-1') is True
+        assert cache.get('NEX-2') is None
+        assert cache.stats()['hits'] == 1
+
+    def test_invalidate(self):
+        """Test that invalidation forces a reload"""
+        cache = ConsentCache()
+        cache.set('NEX-1', True)
+        cache.invalidate('NEX-1')
+
+        assert cache.get('NEX-1') is None
+
+    def test_set_skips_lookup_older_than_invalidation(self):
+        """Test that a lookup racing an invalidation is not cached"""
+        cache = ConsentCache()
+        generation = cache.generation()
+        cache.invalidate('NEX-1')
+        cache.set('NEX-1', True, generation)
+
+        assert cache.get('NEX-1') is None
+        cache.set('NEX-1', True, cache.generation())
+        assert cache.get('NEX-1') is True
+
+    def test_expired_entries_miss(self):
+        """Test that expired entries are treated as misses"""
+        cache = ConsentCache(ttl_seconds=-1)
+        cache.set('NEX-1', True)
+
+        assert cache.get('NEX-1') is None
+
+    def test_max_entries_evicts_oldest(self):
+        """Test that the cache stays bounded"""
+        cache = ConsentCache(max_entries=2)
+        cache.set('NEX-1', True)
+        cache.set('NEX-2', True)
+        cache.set('NEX-3', True)
+
+        assert cache.get('NEX-1') is None
+        assert cache.get('NEX-3') is True
+        assert cache.stats()['entries'] == 2
+
+    def test_hit_ratio(self):
+        """Test hit ratio reporting"""
+        cache = ConsentCache()
+        cache.set('NEX-1', True)
+        cache.get('NEX-1')
+        cache.get('NEX-2')
+
+        assert cache.stats()['hit_ratio'] == pytest.approx(0.5)
+
+
+class TestConsentLookup:
+    """Test consent lookups through the shared cache"""
+
+    def test_cache_hit_skips_database(self, db):
+        """Test that a second lookup is served from the cache"""
+        user_id = add_user(consent_given=True)
+        assert get_consent_status(db, user_id) is True
+
+        set_consent_in_db(user_id, False)
+        with record_queries() as recorder:
+            assert get_consent_status(db, user_id) is True
+
+        assert recorder.count() == 0
+        assert consent_cache.stats()['hits'] == 1
+
+    def test_unknown_user_is_not_cached(self, db):
+        """Test that missing users return None and stay uncached"""
+        assert get_consent_status(db, 'NEX-MISSING') is None
+        assert consent_cache.stats()['entries'] == 0
+
+    def test_consent_route_invalidates_cache(self, db, monkeypatch):
+        """Test that a grant through POST /consent is seen at once"""
+        monkeypatch.setattr(limiter, 'enabled', False)
+        with TestClient(app) as client:
+            response = client.post("/api/v1/auth/register", json={
+                "name": "Consent Tester",
+                "email": f"consent-{uuid.uuid4().hex[:8]}@example.com",
+                "password": "SecurePass123!"
+            })
+            assert response.status_code == 200
+            auth = response.json()
+            user_id = auth['user_id']
+            assert get_consent_status(db, user_id) is False
+
+            response = client.post(
+                "/api/v1/consent",
+                json={"consent_given": True},
+                headers={"Authorization": f"Bearer {auth['access_token']}"}
+            )
+            assert response.status_code == 200
+
+        assert consent_cache.get(user_id) is None
+        assert get_consent_status(db, user_id) is True
+
+    def test_batch_lookup_resolves_misses_in_one_query(self, db):
+        """Test cached, uncached and unknown users in one batch"""
+        cached, given, refused = add_user(True), add_user(True), add_user(False)
+        consent_cache.set(cached, True)
+
+        with record_queries() as recorder:
+            statuses = get_consent_statuses(db, [cached, given, refused, 'NEX-MISSING', given])
+
+        assert statuses == {cached: True, given: True, refused: False, 'NEX-MISSING': None}
+        assert recorder.count() == 1
+        assert consent_cache.get(given) is True
+        assert consent_cache.get(refused) is None
+
+    def test_verify_consent_batch(self, db):
+        """Test that the batch check returns statuses and rejects unknown users"""
+        given, refused = add_user(True), add_user(False)
+
+        assert asyncio.run(verify_consent_batch([given, refused])) == {given: True, refused: False}
+        with pytest.raises(HTTPException) as error:
+            asyncio.run(verify_consent_batch([given, 'NEX-MISSING']))
+        assert error.value.status_code == 404
+        assert 'NEX-MISSING' in error.value.detail
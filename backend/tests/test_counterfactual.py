@@ -0,0 +1,154 @@
+"""
+Test Suite for Counterfactual Plan Solver
+Tests least-effort rule upgrade plans against exhaustive enumeration
+"""
+import itertools
+import random
+
+import pytest
+from app.rules.counterfactual import CounterfactualSolver
+from app.rules.scoring_engine import ScoringEngine
+
+
+def brute_force_efforts(rule_results, target_band, top_k):
+    """Efforts of the cheapest minimal plans by enumerating every upgrade combination"""
+    options = CounterfactualSolver.upgrade_options(rule_results)
+    total = sum(r['points_earned'] for r in rule_results)
+    need = CounterfactualSolver.points_needed(total, CounterfactualSolver.TARGET_BANDS[target_band])
+    efforts = []
+    for combo in itertools.product(*[[None] + list(rule_options) for _, rule_options in options]):
+        gain = sum(choice[1] for choice in combo if choice)
+        if gain < need:
+            continue
+        minimal = True
+        for (_, rule_options), choice in zip(options, combo):
+            if choice is not None:
+                index = rule_options.index(choice)
+                lower = rule_options[index - 1][1] if index else 0
+                minimal = minimal and gain - (choice[1] - lower) < need
+        if minimal:
+            efforts.append(sum(choice[2] for choice in combo if choice))
+    return sorted(efforts)[:top_k]
+
+
+def random_applicant(rng):
+    """Values scattered around the rule thresholds, mostly near the top level"""
+    data = {}
+    for rule in ScoringEngine.RULES.values():
+        thresholds = rule['thresholds']
+        spread = abs(thresholds['high'] - thresholds['low'])
+        level = rng.choice(['high', 'high', 'medium', 'low'])
+        data[rule['field']] = thresholds[level] + rng.uniform(-0.5, 0.5) * spread
+    return data
+
+
+class TestCounterfactualSolver:
+    """Test the counterfactual plan solver"""
+    
+    @pytest.fixture
+    def moderate_rule_results(self):
+        """Rule results of a Moderate-risk applicant"""
+        behavioral_data = {
+            'utility_payment_months': 10,
+            'utility_payment_consistency': 0.78,
+            'monthly_transaction_count': 20,
+            'transaction_regularity_score': 0.60,
+            'spending_volatility': 0.35,
+            'withdrawal_discipline_score': 0.70,
+            'avg_month_end_balance': 2000,
+            'savings_growth_rate': 0.03,
+            'income_regularity_score': 0.72,
+            'income_stability_months': 10,
+            'account_tenure_months': 20,
+            'address_stability_years': 1.5,
+            'discretionary_income_ratio': 0.12
+        }
+        return ScoringEngine.calculate_score(behavioral_data)['rule_results']
+    
+    def test_target_bands_match_risk_classification(self):
+        """Test that band minimum scores agree with classify_risk"""
+        for band, min_score in CounterfactualSolver.TARGET_BANDS.items():
+            assert ScoringEngine.classify_risk(min_score) == band
+            assert ScoringEngine.classify_risk(min_score - 1) != band
+    
+    def test_points_needed_is_smallest_gain(self):
+        """Test the point gain needed to reach a score"""
+        for total in (100, 150, 230):
+            need = CounterfactualSolver.points_needed(total, 700)
+            assert ScoringEngine.points_to_score(total + need) >= 700
+            assert need == 0 or ScoringEngine.points_to_score(total + need - 1) < 700
+    
+    def test_optimal_plan_reaches_target(self, moderate_rule_results):
+        """Test that the optimal plan lands in the target band"""
+        result = CounterfactualSolver.solve(moderate_rule_results, 'Low')
+        
+        assert result['current_band'] == 'Moderate'
+        assert result['status'] == 'solved'
+        assert result['optimal'] == result['plans'][0]
+        assert result['optimal']['projected_band'] == 'Low'
+        assert result['optimal']['points_gained'] >= result['points_needed']
+    
+    def test_plans_match_exhaustive_search(self, moderate_rule_results):
+        """Test optimal and top-k efforts against enumeration of every combination"""
+        rng = random.Random(0)
+        profiles = [moderate_rule_results]
+        while len(profiles) < 6:
+            result = ScoringEngine.calculate_score(random_applicant(rng))
+            if result['risk_level'] != 'Low':
+                profiles.append(result['rule_results'])
+        
+        for rule_results in profiles:
+            for band in ('Moderate', 'Low'):
+                expected = brute_force_efforts(rule_results, band, 5)
+                result = CounterfactualSolver.solve(rule_results, band, top_k=5)
+                
+                if result['status'] == 'met':
+                    continue
+                assert [plan['effort_months'] for plan in result['plans']] == [round(e, 1) for e in expected]
+    
+    def test_top_k_plans_are_distinct_and_ordered(self, moderate_rule_results):
+        """Test that alternatives are different plans in order of effort"""
+        plans = CounterfactualSolver.solve(moderate_rule_results, 'Low', top_k=5)['plans']
+        signatures = [tuple((c['rule_id'], c['to_level']) for c in plan['changes']) for plan in plans]
+        efforts = [plan['effort_months'] for plan in plans]
+        
+        assert len(plans) == 5
+        assert len(set(signatures)) == len(signatures)
+        assert efforts == sorted(efforts)
+        assert all(plan['elapsed_months'] <= plan['effort_months'] for plan in plans)
+    
+    def test_time_rule_effort_is_remaining_history(self, moderate_rule_results):
+        """Test that time-based upgrades cost the months still to accrue"""
+        options = dict(CounterfactualSolver.upgrade_options(moderate_rule_results))
+        
+        assert ('medium', 10, 2.0) in options['A1']
+        assert ('high', 15, 16.0) in options['F1']
+        assert ('medium', 7, 6.0) in options['F2']
+    
+    def test_target_already_met(self, moderate_rule_results):
+        """Test that no plan is needed inside the target band"""
+        result = CounterfactualSolver.solve(moderate_rule_results, 'Moderate')
+        
+        assert result['status'] == 'met'
+        assert result['points_needed'] == 0
+        assert result['plans'] == [] and result['optimal'] is None
+    
+    def test_unknown_target_band(self, moderate_rule_results):
+        """Test that an unknown band is rejected"""
+        with pytest.raises(ValueError):
+            CounterfactualSolver.solve(moderate_rule_results, 'Excellent')
+    
+    def test_portfolio_matches_single_solves(self, moderate_rule_results):
+        """Test that batch results equal per-applicant results"""
+        weak = ScoringEngine.calculate_score({})['rule_results']
+        portfolio = {'U1': moderate_rule_results, 'U2': weak, 'U3': moderate_rule_results}
+        
+        results = CounterfactualSolver.solve_portfolio(portfolio, 'Low', top_k=2)
+        
+        assert results['U1'] == results['U3'] == CounterfactualSolver.solve(moderate_rule_results, 'Low', top_k=2)
+        assert results['U2']['current_band'] == 'High'
+        assert results['U2']['optimal']['projected_band'] == 'Low'
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,94 @@
+"""
+Test Suite for Out-of-Core Training
+Tests the point-in-time join, keyset chunking and checkpoint resume
+"""
+import numpy as np
+import pytest
+from sqlalchemy import create_engine, func, select
+
+from app.db import models
+from app.db.seed import seed_database
+from app.ml.db_training import iter_labelled_chunks, train_from_database, VALIDATION_EVERY
+from app.ml.feature_engineering import FeatureEngineer
+
+
+class Interrupted(Exception):
+    pass
+
+
+@pytest.fixture(scope="module")
+def engine(tmp_path_factory):
+    """Small seeded database where every user has a lender decision"""
+    engine = create_engine(f"sqlite:///{tmp_path_factory.mktemp('training') / 'train.db'}")
+    seed_database(engine, n_users=600, chunk_size=300, mean_history=3, decision_rate=1.0)
+    return engine
+
+
+class TestDatabaseTraining:
+    """Test training from lender decisions"""
+
+    def test_chunks_cover_every_decision_once(self, engine):
+        """Test keyset pagination and the label mapping"""
+        chunks = list(iter_labelled_chunks(engine, chunk_size=128))
+        ids = np.concatenate([chunk.ids for chunk in chunks])
+        with engine.connect() as conn:
+            n_decisions = conn.execute(select(func.count()).select_from(models.LenderDecision.__table__)).scalar()
+
+        assert len(ids) == n_decisions == 600
+        assert np.all(np.diff(ids) > 0)
+        assert all(chunk.X.shape == (len(chunk.ids), len(FeatureEngineer.FEATURE_NAMES)) for chunk in chunks)
+        assert set(np.concatenate([chunk.y for chunk in chunks]).tolist()) == {0, 1, 2}
+
+    def test_joins_latest_snapshot_before_decision(self, engine):
+        """Test that each decision sees its user's latest snapshot"""
+        chunk = next(iter_labelled_chunks(engine, chunk_size=5))
+        with engine.connect() as conn:
+            for decision_id, features in zip(chunk.ids.tolist(), chunk.X):
+                user_id = conn.execute(select(models.LenderDecision.user_id).where(
+                    models.LenderDecision.id == decision_id)).scalar()
+                months = conn.execute(
+                    select(models.BehavioralData.utility_payment_months)
+                    .where(models.BehavioralData.user_id == user_id)
+                    .order_by(models.BehavioralData.id.desc()).limit(1)
+                ).scalar()
+                assert features[0] == months
+
+    def test_trains_servable_model(self, engine):
+        """Test the forest size, held-out split and serving path"""
+        result = train_from_database(engine, chunk_size=100, n_estimators=12, n_jobs=1)
+        model, metrics = result['model'], result['metrics']
+
+        assert metrics['n_samples'] + metrics['n_validation'] == 600
+        assert metrics['n_validation'] == len([i for i in range(1, 601) if i % VALIDATION_EVERY == 0])
+        assert metrics['n_trees'] >= 12 - 1
+        assert metrics['test_accuracy'] > 0.5
+        assert model.predict_array(np.zeros((2, len(model.feature_names)), dtype=np.float32))['trust_score'].shape == (2,)
+
+    def test_final_checkpoint_covers_last_decision(self, engine):
+        """Test that the trailing partial block records the last decision read"""
+        events = []
+        train_from_database(engine, chunk_size=120, n_estimators=12, n_jobs=1, progress=events.append)
+        with engine.connect() as connection:
+            last_id = connection.execute(select(func.max(models.LenderDecision.id))).scalar()
+
+        assert events[-1]['phase'] == 'done'
+        assert events[-1]['last_id'] == last_id
+
+    def test_resume_matches_uninterrupted_run(self, engine, tmp_path):
+        """Test that a run interrupted mid-fit resumes to the same forest"""
+        X = next(iter_labelled_chunks(engine, chunk_size=50)).X
+        expected = train_from_database(engine, chunk_size=100, n_estimators=12, n_jobs=1)['model']
+
+        def interrupt(state):
+            if state['phase'] == 'fit' and state['step'] == 2:
+                raise Interrupted()
+
+        checkpoint = str(tmp_path / 'train.ckpt')
+        with pytest.raises(Interrupted):
+            train_from_database(engine, chunk_size=100, n_estimators=12, n_jobs=1,
+                                checkpoint_path=checkpoint, progress=interrupt)
+        resumed = train_from_database(engine, chunk_size=100, n_estimators=12, n_jobs=1,
+                                      checkpoint_path=checkpoint)['model']
+
+        assert len(resumed.forest.classes) == 3
+        assert np.array_equal(resumed.predict_proba(X), expected.predict_proba(X))
@@ -0,0 +1,155 @@
+"""
+Test Suite for the Drift Monitor
+Tests streaming moments across thread shards, PSI/KS and reference snapshots
+"""
+import random
+import statistics
+import threading
+
+from fastapi.testclient import TestClient
+
+from app.analytics.drift import (
+    DRIFT_FIELDS,
+    DriftMonitor,
+    FIELD_EDGES,
+    ks_distance,
+    psi
+)
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.main import app
+from app.rules.scoring_engine import ScoringEngine
+
+
+def applicant(rng, shift=0.0):
+    """Random behavioral record; shift moves every field up"""
+    data = {}
+    for field, edges in FIELD_EDGES.items():
+        low, high = edges[0], edges[-1]
+        data[field] = rng.uniform(low, high) * (1 - shift) + high * shift
+    return data
+
+
+def observe(monitor, data):
+    monitor.observe(data, ScoringEngine.calculate_score(data)['rule_results'])
+
+
+class TestDriftStatistics:
+    """Test PSI and KS on histograms"""
+
+    def test_identical_histograms(self):
+        """Test that identical distributions show no drift"""
+        counts = [5, 10, 20, 10, 5]
+        assert psi(counts, [2 * c for c in counts]) == 0.0
+        assert ks_distance(counts, counts) == 0.0
+
+    def test_shifted_histograms(self):
+        """Test that moving mass to other bins raises PSI and KS"""
+        reference = [50, 30, 20, 0]
+        current = [0, 20, 30, 50]
+
+        assert psi(reference, current) > 0.25
+        assert abs(ks_distance(reference, current) - 0.6) < 1e-12
+
+
+class TestDriftMonitor:
+    """Test the streaming monitor"""
+
+    def test_moments_merge_across_threads(self):
+        """Test that per-thread Welford moments merge to the exact mean and std"""
+        monitor = DriftMonitor()
+        rows = [applicant(random.Random(seed)) for seed in range(400)]
+
+        def worker(chunk):
+            for data in chunk:
+                observe(monitor, data)
+
+        threads = [threading.Thread(target=worker, args=(rows[i::4],)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        snapshot = monitor.snapshot()
+
+        assert snapshot['n'] == len(rows)
+        for field in DRIFT_FIELDS:
+            values = [row[field] for row in rows]
+            stats = snapshot['fields'][field]
+            assert abs(stats['mean'] - statistics.mean(values)) < 1e-9 * max(1.0, abs(stats['mean']))
+            assert abs(stats['std'] - statistics.stdev(values)) < 1e-9 * max(1.0, stats['std'])
+            assert sum(stats['histogram']) == len(rows)
+        assert sum(snapshot['rule_levels']['A1'].values()) == len(rows)
+
+    def test_report_without_reference(self):
+        """Test the status before a reference exists"""
+        monitor = DriftMonitor()
+        observe(monitor, applicant(random.Random(0)))
+
+        report = monitor.report()
+
+        assert report['status'] == 'no_reference'
+        assert report['n_current'] == 1
+
+    def test_detects_shifted_population(self, tmp_path):
+        """Test stable vs drifted windows against a saved reference"""
+        rng = random.Random(1)
+        monitor = DriftMonitor(min_samples=50)
+        for _ in range(2000):
+            observe(monitor, applicant(rng))
+        path = str(tmp_path / 'reference.json')
+        monitor.freeze_reference(path)
+        assert monitor.snapshot()['n'] == 0
+
+        for _ in range(2000):
+            observe(monitor, applicant(rng))
+        assert monitor.report()['status'] == 'stable'
+
+        restarted = DriftMonitor(min_samples=50)
+        assert restarted.load_reference(path)
+        for _ in range(500):
+            observe(restarted, applicant(rng, shift=0.5))
+        report = restarted.report()
+
+        assert report['status'] == 'significant'
+        assert all(entry['mean_shift_std'] > 0 for entry in report['fields'])
+
+    def test_small_window_is_insufficient(self):
+        """Test that fewer than min_samples assessments are not judged"""
+        rng = random.Random(2)
+        monitor = DriftMonitor(min_samples=100)
+        for _ in range(200):
+            observe(monitor, applicant(rng))
+        monitor.freeze_reference()
+        observe(monitor, applicant(rng, shift=0.9))
+
+        assert monitor.report()['status'] == 'insufficient_data'
+
+
+class TestDriftEndpoints:
+    """Test access to the drift endpoints"""
+
+    def headers(self, user_id):
+        """Bearer header for a user_id"""
+        return {"Authorization": f"Bearer {create_access_token({'sub': user_id})}"}
+
+    def test_report_is_public(self):
+        """Test that the aggregate report needs no credentials"""
+        response = TestClient(app).get("/api/v1/drift")
+
+        assert response.status_code == 200
+
+    def test_freeze_requires_operator(self, tmp_path, monkeypatch):
+        """Test that only OPERATOR_USER_IDS may replace the reference"""
+        path = str(tmp_path / "reference.json")
+        monkeypatch.setattr(settings, 'DRIFT_REFERENCE_PATH', path)
+        monkeypatch.setattr(settings, 'OPERATOR_USER_IDS', ['NEX-OPS'])
+        client = TestClient(app)
+
+        assert client.post("/api/v1/drift/reference").status_code in (401, 403)
+        denied = client.post("/api/v1/drift/reference", headers=self.headers('NEX-APPLICANT'))
+        assert denied.status_code == 403
+        assert not (tmp_path / "reference.json").exists()
+
+        allowed = client.post("/api/v1/drift/reference", headers=self.headers('NEX-OPS'))
+        assert allowed.status_code == 200
+        assert (tmp_path / "reference.json").exists()
@@ -202,6 +202,29 @@ class TestExplainabilityEngine:
         assert len(factors_3) == 3
         assert len(factors_5) == 5
         assert len(factors_12) == 12
+    
+    def test_peer_comparison(self, sample_rule_results):
+        """Test that peer ranks are attached as plain-language sentences"""
+        peers = {
+            'D1': {'percentile': 64.2, 'peer_group': 'applicants', 'peer_count': 500, 'inverse': False},
+            'C1': {'percentile': 80.0, 'peer_group': 'applicants with 2-5 years of account history',
+                   'peer_count': 120, 'inverse': True}
+        }
+        factors = ExplainabilityEngine.generate_factors(sample_rule_results, top_n=12, peers=peers)
+        by_rule = {f['rule_id']: f for f in factors}
+        
+        assert by_rule['D1']['peer_percentile'] == 64.2
+        assert by_rule['D1']['peer_comparison'] == "Your savings balance is higher than 64% of applicants"
+        assert by_rule['C1']['peer_comparison'] == (
+            "Your spending volatility is lower than 80% of applicants with 2-5 years of account history"
+        )
+        assert by_rule['C1']['peer_comparison'] in by_rule['C1']['description']
+        assert by_rule['A1']['peer_percentile'] is None
+        
+        forbidden_terms = ['ai', 'ml', 'model', 'prediction', 'confidence', 'algorithm']
+        for factor in factors:
+            text = (factor['peer_comparison'] or '').lower()
+            assert not any(term in text for term in forbidden_terms)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,99 @@
+"""
+Test Suite for Feature Engineering
+Tests that the batch path matches the original per-row formulas exactly
+"""
+import numpy as np
+import pandas as pd
+
+from app.ml.feature_engineering import FeatureEngineer
+from app.ml.synthetic_data import BEHAVIORAL_FIELDS, sample_profiles
+
+
+def legacy_engineer_features(raw_data):
+    """The original scalar implementation"""
+    features = dict(raw_data)
+    features['payment_consistency_score'] = min(
+        features['utility_payment_months'] * 2 + features['utility_payment_consistency'] * 50, 100
+    )
+    tx_normalized = min(features['monthly_transaction_count'] / 50, 1.0)
+    features['transaction_stability_score'] = (
+        tx_normalized * 40 +
+        features['transaction_regularity_score'] * 40 +
+        (1 - features['spending_volatility']) * 20
+    )
+    balance_normalized = min(features['avg_month_end_balance'] / 5000, 1.0)
+    features['savings_discipline_index'] = (
+        balance_normalized * 40 +
+        max(features['savings_growth_rate'], 0) * 30 +
+        features['withdrawal_discipline_score'] * 30
+    )
+    features['volatility_index'] = (1 - features['spending_volatility']) * 100
+    features['income_regularity_flag'] = 1 if (
+        features['income_regularity_score'] >= 0.7 and
+        features['income_stability_months'] >= 6
+    ) else 0
+    account_score = min(features['account_tenure_months'] / 60, 1.0) * 50
+    address_score = min(features['address_stability_years'] / 5, 1.0) * 50
+    features['tenure_score'] = account_score + address_score
+    features['financial_health_score'] = (
+        features['payment_consistency_score'] * 0.25 +
+        features['transaction_stability_score'] * 0.20 +
+        features['savings_discipline_index'] * 0.25 +
+        features['volatility_index'] * 0.15 +
+        features['tenure_score'] * 0.15
+    )
+    return [float(features.get(name, 0.0)) for name in FeatureEngineer.FEATURE_NAMES]
+
+
+class TestFeatureEngineer:
+    """Test batch feature engineering"""
+
+    def test_batch_matches_legacy_exactly(self):
+        """Test exact equality with the scalar formulas across all profiles"""
+        rng = np.random.default_rng(7)
+        columns = sample_profiles(np.repeat([0, 1, 2], 200), rng)
+        rows = [{f: columns[f].tolist()[i] for f in BEHAVIORAL_FIELDS} for i in range(600)]
+        # Boundary cases: capped payment score, flag thresholds, negative growth
+        rows.append({**rows[0], 'utility_payment_months': 60, 'income_regularity_score': 0.7,
+                     'income_stability_months': 6, 'savings_growth_rate': -0.2})
+
+        batch = FeatureEngineer.engineer_features_batch(pd.DataFrame(rows))
+
+        assert list(batch.columns) == FeatureEngineer.FEATURE_NAMES
+        expected = np.array([legacy_engineer_features(row) for row in rows])
+        assert np.array_equal(batch.to_numpy(dtype=np.float64), expected)
+
+    def test_single_row_wrapper(self):
+        """Test that the single-row call returns one row in feature order"""
+        columns = sample_profiles(np.array([1]), np.random.default_rng(3))
+        raw = {f: columns[f].tolist()[0] for f in BEHAVIORAL_FIELDS}
+        del raw['discretionary_income_ratio']
+
+        df = FeatureEngineer.engineer_features(raw)
+
+        assert df.shape == (1, len(FeatureEngineer.FEATURE_NAMES))
+        assert df['discretionary_income_ratio'].iloc[0] == 0.0
+        assert df.iloc[0].tolist() == legacy_engineer_features(raw)
+
+    def test_array_matches_batch(self):
+        """Test the pandas-free path against the DataFrame batch"""
+        columns = sample_profiles(np.repeat([0, 1, 2], 50), np.random.default_rng(5))
+        raw = {f: columns[f] for f in BEHAVIORAL_FIELDS}
+        expected = FeatureEngineer.engineer_features_batch(pd.DataFrame(raw)).to_numpy(dtype=np.float64)
+
+        assert np.array_equal(FeatureEngineer.engineer_features_array(raw, dtype=np.float64), expected)
+        features = FeatureEngineer.engineer_features_array(raw)
+        assert features.dtype == np.float32
+        assert np.array_equal(features, expected.astype(np.float32))
+
+    def test_array_fills_preallocated_row(self):
+        """Test that a single request fills a reused buffer row in place"""
+        columns = sample_profiles(np.array([2]), np.random.default_rng(3))
+        raw = {f: columns[f].tolist()[0] for f in BEHAVIORAL_FIELDS}
+        buffer = np.zeros((4, len(FeatureEngineer.FEATURE_NAMES)), dtype=np.float32)
+
+        result = FeatureEngineer.engineer_features_array(raw, out=buffer[1])
+
+        assert np.shares_memory(result, buffer)
+        assert np.array_equal(buffer[1], np.float32(legacy_engineer_features(raw)))
+        assert not buffer[[0, 2, 3]].any()
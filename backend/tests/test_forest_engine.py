@@ -0,0 +1,114 @@
+"""
+Test Suite for the Flattened Forest Engine
+Tests bit-identical agreement with sklearn, including values on split boundaries
+"""
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.preprocessing import StandardScaler
+
+from app.ml.forest_engine import FlatForest, fold_thresholds
+from app.ml.synthetic_data import generate_synthetic_training_data
+
+
+@pytest.fixture(scope="module")
+def fitted():
+    """Scaler and forest trained the way CreditTrustModel trains them"""
+    X, y = generate_synthetic_training_data(n_samples=1500, seed=0)
+    X = X.to_numpy()
+    scaler = StandardScaler().fit(X)
+    forest = RandomForestClassifier(
+        n_estimators=30, max_depth=10, min_samples_split=20, min_samples_leaf=10,
+        random_state=42, class_weight='balanced'
+    ).fit(scaler.transform(X), y)
+    return scaler, forest, FlatForest.from_sklearn(forest, scaler)
+
+
+def sklearn_proba(scaler, forest, X):
+    return forest.predict_proba(scaler.transform(X))
+
+
+class TestFoldThresholds:
+    """Test threshold folding"""
+
+    def test_folded_threshold_is_exact_boundary(self):
+        """Test that the folded value goes left and its successor goes right"""
+        rng = np.random.default_rng(0)
+        thresholds = rng.normal(size=200)
+        mean = rng.uniform(-100, 100, 200)
+        scale = rng.uniform(0.01, 50, 200)
+
+        folded = fold_thresholds(thresholds, mean, scale)
+        successor = np.nextafter(folded, np.inf)
+
+        def goes_left(x):
+            return ((x - mean) / scale).astype(np.float32) <= thresholds
+
+        assert goes_left(folded).all()
+        assert not goes_left(successor).any()
+
+
+class TestFlatForest:
+    """Test the flattened forest"""
+
+    def test_matches_sklearn_on_synthetic_rows(self, fitted):
+        """Test bit-identical probabilities in batch mode"""
+        scaler, forest, flat = fitted
+        X, _ = generate_synthetic_training_data(n_samples=3000, seed=1)
+        X = X.to_numpy()
+
+        assert np.array_equal(flat.predict_proba(X), sklearn_proba(scaler, forest, X))
+        assert np.array_equal(flat.predict(X), forest.predict(scaler.transform(X)))
+
+    def test_matches_sklearn_on_split_boundaries(self, fitted):
+        """Test rows sitting exactly on and next to folded thresholds"""
+        scaler, forest, flat = fitted
+        X, _ = generate_synthetic_training_data(n_samples=200, seed=2)
+        X = X.to_numpy()
+
+        internal = np.flatnonzero(np.isfinite(flat.threshold))[:300]
+        rows = []
+        for node in internal:
+            base = X[node % len(X)].copy()
+            for value in (flat.threshold[node], np.nextafter(flat.threshold[node], np.inf)):
+                row = base.copy()
+                row[flat.feature[node]] = value
+                rows.append(row)
+        boundary = np.array(rows)
+
+        assert np.array_equal(flat.predict_proba(boundary), sklearn_proba(scaler, forest, boundary))
+
+    def test_single_row_mode(self, fitted):
+        """Test that the single-row path equals the batch path"""
+        scaler, forest, flat = fitted
+        X, _ = generate_synthetic_training_data(n_samples=20, seed=3)
+        X = X.to_numpy()
+
+        for row in X:
+            row = row[np.newaxis, :]
+            assert np.array_equal(flat.predict_proba(row), sklearn_proba(scaler, forest, row))
+
+    def test_path_contributions_are_additive(self, fitted):
+        """Test that bias plus per-feature contributions equals the probabilities"""
+        _, _, flat = fitted
+        X, _ = generate_synthetic_training_data(n_samples=300, seed=5)
+        X = X.to_numpy()
+
+        bias, contributions = flat.contributions(X)
+        single_bias, single = flat.contributions(X[:1])
+
+        assert contributions.shape == (300, X.shape[1], len(flat.classes))
+        assert np.allclose(bias + contributions.sum(axis=1), flat.predict_proba(X), atol=1e-9)
+        assert np.allclose(single[0], contributions[0], atol=1e-12)
+
+    def test_save_and_load(self, fitted, tmp_path):
+        """Test the .npz round trip"""
+        scaler, forest, flat = fitted
+        path = str(tmp_path / 'forest_flat.npz')
+        flat.save(path)
+        loaded = FlatForest.load(path)
+
+        X, _ = generate_synthetic_training_data(n_samples=100, seed=4)
+        assert loaded.max_depth == flat.max_depth
+        assert np.array_equal(loaded.delta, flat.delta)
+        assert np.array_equal(loaded.predict_proba(X.to_numpy()), flat.predict_proba(X.to_numpy()))
@@ -0,0 +1,163 @@
+"""
+Test Suite for Hybrid Rule + Model Scoring
+Tests calibration, blending and the /score/hybrid fallbacks
+"""
+import time
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import routes
+from app.api.routes import limiter
+from app.core.config import settings
+from app.db import models
+from app.db.database import engine
+from app.main import app
+from app.ml.hybrid import blend_scores, calibrate_model_score, model_factors
+from app.ml.feature_engineering import FeatureEngineer
+from app.ml.model import CreditTrustModel
+from app.ml.registry import model_loader
+from app.ml.synthetic_data import generate_synthetic_training_data
+from app.rules.scoring_engine import ScoringEngine
+
+
+BEHAVIORAL_DATA = {
+    'utility_payment_months': 14,
+    'utility_payment_consistency': 0.95,
+    'monthly_transaction_count': 45,
+    'transaction_regularity_score': 0.88,
+    'spending_volatility': 0.12,
+    'avg_month_end_balance': 5000.0,
+    'savings_growth_rate': 0.15,
+    'withdrawal_discipline_score': 0.82,
+    'income_regularity_score': 0.90,
+    'income_stability_months': 18,
+    'account_tenure_months': 38,
+    'address_stability_years': 2.5,
+    'discretionary_income_ratio': 0.22
+}
+
+
+class TestBlending:
+    """Test calibration and blending"""
+
+    def test_calibration_maps_model_range_onto_rule_range(self):
+        """Test that the default calibration maps 300-900 onto the rule scale"""
+        assert calibrate_model_score(300) == pytest.approx(ScoringEngine.SCORE_MIN, abs=0.1)
+        assert calibrate_model_score(900) == pytest.approx(ScoringEngine.SCORE_MAX, abs=0.1)
+        assert calibrate_model_score(2000) == ScoringEngine.SCORE_MAX
+
+    def test_blend_weights(self):
+        """Test the weight extremes and the rule-only fallback"""
+        assert blend_scores(600, None) == 600
+        assert blend_scores(600, 900, weight=0.0) == 600
+        assert blend_scores(600, 900, weight=1.0, scale=1.0, offset=0.0) == 860
+        assert blend_scores(600, 700, weight=0.5, scale=1.0, offset=0.0) == 650
+
+    def test_model_factors_point_towards_a_better_score(self):
+        """Test that contributions towards high risk become negative factors"""
+        features = np.ones(len(FeatureEngineer.FEATURE_NAMES))
+        contributions = np.zeros(len(features))
+        contributions[0] = 0.3
+
+        assert model_factors(features, contributions, predicted_class=0)[0]['type'] == 'positive'
+        assert model_factors(features, contributions, predicted_class=2)[0]['type'] == 'negative'
+
+
+@pytest.fixture(scope="module")
+def client():
+    """Test client on a fresh database"""
+    models.Base.metadata.drop_all(bind=engine)
+    models.Base.metadata.create_all(bind=engine)
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="module")
+def user_id(client):
+    """Registered user with consent"""
+    response = client.post("/api/v1/auth/register", json={
+        "name": "Hybrid Tester",
+        "email": "hybrid@example.com",
+        "password": "SecurePass123!"
+    })
+    assert response.status_code == 200
+    auth = response.json()
+    headers = {"Authorization": f"Bearer {auth['access_token']}"}
+    response = client.post("/api/v1/consent", json={"consent_given": True}, headers=headers)
+    assert response.status_code == 200
+    return auth['user_id']
+
+
+@pytest.fixture(scope="module")
+def trained_model():
+    X, y = generate_synthetic_training_data(n_samples=800, seed=0)
+    model = CreditTrustModel()
+    model.train(X, y)
+    model.version = 'v-test'
+    return model
+
+
+def score_hybrid(client, user_id):
+    response = client.post("/api/v1/score/hybrid", json={
+        "user_id": user_id,
+        "behavioral_data": BEHAVIORAL_DATA
+    })
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+class TestHybridEndpoint:
+    """Test /score/hybrid"""
+
+    def test_rule_only_without_model(self, client, user_id, monkeypatch):
+        """Test the fallback when no model version is loaded"""
+        monkeypatch.setattr(model_loader, '_model', None)
+        body = score_hybrid(client, user_id)
+
+        assert body['scoring_mode'] == 'rule_only'
+        assert body['fallback_reason'] == 'model_unavailable'
+        assert body['trust_score'] == body['rule_score']
+        assert body['model_score'] is None
+        assert body['rule_factors']
+
+    def test_blends_model_score(self, client, user_id, trained_model, monkeypatch):
+        """Test that both scores and both explanations are returned"""
+        monkeypatch.setattr(model_loader, '_model', trained_model)
+        monkeypatch.setattr(settings, 'HYBRID_MODEL_DEADLINE_MS', 5000.0)
+        body = score_hybrid(client, user_id)
+
+        assert body['scoring_mode'] == 'hybrid'
+        assert body['model_version'] == 'v-test'
+        assert body['trust_score'] == blend_scores(body['rule_score'], body['model_score'])
+        assert body['model_factors']
+        assert body['risk_level'] == ScoringEngine.classify_risk(body['trust_score'])
+
+    def test_deadline_falls_back_to_rules(self, client, user_id, trained_model, monkeypatch):
+        """Test the rule-only fallback under deadline pressure"""
+        monkeypatch.setattr(model_loader, '_model', trained_model)
+        monkeypatch.setattr(settings, 'HYBRID_MODEL_DEADLINE_MS', 0.0)
+        body = score_hybrid(client, user_id)
+
+        assert body['scoring_mode'] == 'rule_only'
+        assert body['fallback_reason'] == 'timeout'
+        assert body['trust_score'] == body['rule_score']
+
+    def test_model_overlaps_rule_assessment(self, client, user_id, trained_model, monkeypatch):
+        """Test that the model runs during the DB writes and its latency excludes them"""
+        monkeypatch.setattr(model_loader, '_model', trained_model)
+        monkeypatch.setattr(settings, 'HYBRID_MODEL_DEADLINE_MS', 5000.0)
+        monkeypatch.setattr(limiter, 'enabled', False)
+        store = routes._assess_and_store
+
+        def slow_store(*args):
+            # Blocks the event loop unless the assessment runs in a worker thread
+            time.sleep(0.3)
+            return store(*args)
+
+        monkeypatch.setattr(routes, '_assess_and_store', slow_store)
+        body = score_hybrid(client, user_id)
+
+        assert body['scoring_mode'] == 'hybrid'
+        assert body['model_latency_ms'] < 300
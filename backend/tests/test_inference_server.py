@@ -0,0 +1,128 @@
+"""
+Test Suite for the Micro-Batching Inference Server
+Tests batch collection, fan-out of results and executor equivalence
+"""
+import asyncio
+
+import numpy as np
+import pytest
+
+from app.ml.inference_server import InferenceServer, ModelUnavailableError, score_batch
+from app.ml.model import CreditTrustModel
+from app.ml.synthetic_data import generate_synthetic_training_data
+
+
+@pytest.fixture(scope="module")
+def trained():
+    """Small trained model and held-out rows"""
+    X, y = generate_synthetic_training_data(n_samples=1000, seed=0)
+    model = CreditTrustModel()
+    model.train(X, y)
+    X_new, _ = generate_synthetic_training_data(n_samples=10, seed=1)
+    return model, X_new.to_numpy()
+
+
+class RecordingModel:
+    """Delegates to a model and records the size of every batch"""
+
+    def __init__(self, model):
+        self.model = model
+        self.version = 'test'
+        self.artifact = None
+        self.batch_sizes = []
+
+    def predict_array(self, X, explain=False, method=None):
+        self.batch_sizes.append(len(X))
+        return self.model.predict_array(X, explain, method)
+
+
+def run_concurrently(server, rows, explain=True):
+    async def main():
+        try:
+            return await asyncio.gather(*(server.submit(row, explain=explain) for row in rows))
+        finally:
+            await server.stop()
+    return asyncio.run(main())
+
+
+class TestInferenceServer:
+    """Test micro-batching"""
+
+    def test_concurrent_requests_share_a_batch(self, trained):
+        """Test that requests arriving within the wait window run as one batch"""
+        model, X = trained
+        recording = RecordingModel(model)
+        server = InferenceServer(lambda: recording, max_batch_size=64, max_wait_ms=50, executor='inline')
+
+        results = run_concurrently(server, X)
+
+        assert recording.batch_sizes == [len(X)]
+        expected = score_batch(model, X)
+        for i, result in enumerate(results):
+            assert result.trust_score == expected['trust_score'][i]
+            assert result.risk_level == expected['risk_level'][i]
+            assert np.array_equal(result.contributions, expected['contributions'][i])
+            assert result.model_version == 'test'
+
+    def test_batches_are_capped(self, trained):
+        """Test that no batch exceeds max_batch_size"""
+        model, X = trained
+        recording = RecordingModel(model)
+        server = InferenceServer(lambda: recording, max_batch_size=4, max_wait_ms=50, executor='inline')
+
+        run_concurrently(server, X)
+
+        assert recording.batch_sizes == [4, 4, 2]
+
+    def test_thread_executor_matches_inline(self, trained):
+        """Test that the thread pool returns the same results"""
+        model, X = trained
+        inline = run_concurrently(InferenceServer(lambda: model, executor='inline'), X)
+        threaded = run_concurrently(InferenceServer(lambda: model, executor='thread', workers=2), X)
+
+        assert [r.trust_score for r in threaded] == [r.trust_score for r in inline]
+        assert all(np.array_equal(a.contributions, b.contributions) for a, b in zip(threaded, inline))
+
+    def test_process_executor_uses_artifact(self, trained, tmp_path):
+        """Test scoring in a spawned worker from the memory-mapped artifact"""
+        model, X = trained
+        path = str(tmp_path / 'model.nexis')
+        model.save_artifact(path, version='v-proc')
+        loaded = CreditTrustModel.load_artifact(path)
+
+        results = run_concurrently(InferenceServer(lambda: loaded, executor='process'), X, explain=False)
+
+        trust_scores, _, _ = model.predict_scores(X)
+        assert [r.trust_score for r in results] == list(trust_scores)
+        assert all(r.contributions is None and r.model_version == 'v-proc' for r in results)
+
+    def test_missing_model_fails_requests(self, trained, caplog):
+        """Test that requests fail cleanly, without error logs, when no model is loaded"""
+        _, X = trained
+        server = InferenceServer(lambda: None, executor='inline')
+
+        with pytest.raises(ModelUnavailableError):
+            run_concurrently(server, X[:2])
+        assert not [record for record in caplog.records if record.levelname == 'ERROR']
+
+    def test_rejects_wrong_feature_count(self, trained):
+        """Test input validation"""
+        model, _ = trained
+        server = InferenceServer(lambda: model, executor='inline')
+
+        with pytest.raises(ValueError):
+            run_concurrently(server, [np.zeros(3)])
+
+    def test_stop_fails_half_collected_batch(self, trained):
+        """Test that stopping mid-collection fails the requests already taken from the queue"""
+        model, X = trained
+        server = InferenceServer(lambda: model, max_batch_size=64, max_wait_ms=10000, executor='inline')
+
+        async def main():
+            requests = [asyncio.ensure_future(server.submit(row)) for row in X[:3]]
+            await asyncio.sleep(0.05)
+            await server.stop()
+            return await asyncio.wait_for(asyncio.gather(*requests, return_exceptions=True), 1)
+
+        results = asyncio.run(main())
+        assert all(isinstance(result, ModelUnavailableError) for result in results)
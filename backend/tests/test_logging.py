@@ -0,0 +1,94 @@
+"""
+Test Suite for the Logging Pipeline
+Tests PII masking, JSON output, sampling and the queue pipeline
+"""
+import io
+import json
+import logging
+import re
+import pytest
+from app.middleware import logging as logging_pipeline
+from app.middleware.logging import (
+    PIIMaskingFormatter,
+    JSONFormatter,
+    SamplingFilter,
+    setup_logging,
+    shutdown_logging
+)
+
+
+def legacy_mask(text):
+    """Original three-pass masking"""
+    masked = re.sub(PIIMaskingFormatter.EMAIL_PATTERN, '[EMAIL_MASKED]', text)
+    masked = re.sub(PIIMaskingFormatter.PHONE_PATTERN, '[PHONE_MASKED]', masked)
+    return re.sub(PIIMaskingFormatter.SSN_PATTERN, '[SSN_MASKED]', masked)
+
+
+def make_record(msg, name='nexis.test', level=logging.INFO, args=None):
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+
+@pytest.fixture
+def isolated_root_logger(monkeypatch):
+    """Run setup_logging/shutdown_logging without touching the app's handlers"""
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    # Hide the pipeline app.main installed, so shutdown_logging only stops ours
+    monkeypatch.setattr(logging_pipeline, '_listener', None)
+    monkeypatch.setattr(logging_pipeline, '_installed_handlers', [])
+    yield
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+
+class TestLogging:
+    """Test the logging pipeline"""
+
+    @pytest.mark.parametrize('text', [
+        'user alex@example.com logged in',
+        'call 555-123-4567 or 555.123.4567 or 5551234567',
+        'ssn 123-45-6789 on file',
+        'mixed a.b@c.io 123-45-6789 555-123-4567 done',
+        'nothing sensitive here: score 742'
+    ])
+    def test_single_pass_matches_legacy_masking(self, text):
+        """Test that the combined pattern masks like the three separate passes"""
+        assert PIIMaskingFormatter.mask(text) == legacy_mask(text)
+
+    def test_formatter_masks_output(self):
+        formatter = PIIMaskingFormatter('%(message)s')
+        assert formatter.format(make_record('mail alex@example.com')) == 'mail [EMAIL_MASKED]'
+
+    def test_json_formatter(self):
+        record = make_record('mail %s', args=('alex@example.com',))
+        record.trace_id = 'abc'
+        payload = json.loads(JSONFormatter().format(record))
+
+        assert payload['message'] == 'mail [EMAIL_MASKED]'
+        assert payload['trace_id'] == 'abc'
+        assert payload['level'] == 'INFO'
+
+    def test_sampling_keeps_every_nth_access_line(self):
+        sampler = SamplingFilter(0.25, logger_names=('nexis.access',))
+        kept = sum(sampler.filter(make_record('GET /', name='nexis.access')) for _ in range(100))
+        assert kept == 25
+
+    def test_sampling_never_drops_warnings_or_other_loggers(self):
+        sampler = SamplingFilter(0.0, logger_names=('nexis.access',))
+        assert sampler.filter(make_record('slow', name='nexis.access', level=logging.WARNING))
+        assert sampler.filter(make_record('hello', name='nexis.other'))
+        assert not sampler.filter(make_record('GET /', name='nexis.access'))
+
+    def test_queue_pipeline_writes_masked_lines(self, isolated_root_logger):
+        """Test that records flow through the background listener"""
+        stream = io.StringIO()
+        setup_logging(log_format='text', access_sample_rate=1.0, asynchronous=True, stream=stream)
+        try:
+            logging.getLogger('nexis.test').warning('contact %s', 'alex@example.com')
+        finally:
+            shutdown_logging()
+
+        output = stream.getvalue()
+        assert '[EMAIL_MASKED]' in output
+        assert 'alex@example.com' not in output
+        assert 'trace_id=-' in output
@@ -0,0 +1,77 @@
+"""
+Test Suite for Prometheus Metrics
+Tests histogram bucketing, thread sharding and text exposition
+"""
+import threading
+import pytest
+from app.core.metrics import MetricsRegistry, stage_timer, STAGE_LATENCY
+
+
+class TestMetrics:
+    """Test the metrics registry"""
+
+    def test_counter_exposition(self):
+        """Test counter rendering with labels"""
+        registry = MetricsRegistry()
+        counter = registry.counter('test_events_total', 'Events', ['kind'])
+        counter.labels('a').inc()
+        counter.labels('a').inc(2)
+
+        output = registry.render()
+        assert '# TYPE test_events_total counter' in output
+        assert 'test_events_total{kind="a"} 3' in output
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test histogram bucket counts, sum and count"""
+        registry = MetricsRegistry()
+        histogram = registry.histogram('test_latency_seconds', 'Latency', ['route'], buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.5, 5.0):
+            histogram.labels('/x').observe(value)
+
+        output = registry.render()
+        assert 'test_latency_seconds_bucket{route="/x",le="0.1"} 1' in output
+        assert 'test_latency_seconds_bucket{route="/x",le="1"} 3' in output
+        assert 'test_latency_seconds_bucket{route="/x",le="+Inf"} 4' in output
+        assert 'test_latency_seconds_count{route="/x"} 4' in output
+        assert 'test_latency_seconds_sum{route="/x"} 6.05' in output
+
+    def test_observations_from_many_threads(self):
+        """Test that per-thread shards are merged on scrape"""
+        registry = MetricsRegistry()
+        histogram = registry.histogram('test_threads', 'Threads', buckets=(1.0,))
+
+        def worker():
+            for _ in range(1000):
+                histogram.observe(0.5)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        counts, total = histogram.labels().snapshot()
+        assert sum(counts) == 4000
+        assert total == pytest.approx(2000.0)
+
+    def test_label_arity_is_checked(self):
+        """Test that wrong label counts are rejected"""
+        registry = MetricsRegistry()
+        histogram = registry.histogram('test_arity', 'Arity', ['a', 'b'])
+        with pytest.raises(ValueError):
+            histogram.labels('only-one')
+
+    def test_duplicate_registration_rejected(self):
+        """Test that metric names are unique"""
+        registry = MetricsRegistry()
+        registry.counter('test_dup', 'Dup')
+        with pytest.raises(ValueError):
+            registry.counter('test_dup', 'Dup')
+
+    def test_stage_timer_records(self):
+        """Test that stage timings land in the stage histogram"""
+        with stage_timer('test_endpoint', 'test_stage'):
+            pass
+
+        counts, _ = STAGE_LATENCY.labels('test_endpoint', 'test_stage').snapshot()
+        assert sum(counts) == 1
@@ -0,0 +1,104 @@
+"""
+Test Suite for the Credit Trust Model
+Tests batch scoring and explanations against the single-row API
+"""
+import numpy as np
+import pytest
+
+from app.ml.model import CreditTrustModel
+from app.ml.synthetic_data import generate_synthetic_training_data
+
+
+@pytest.fixture(scope="module")
+def trained():
+    """Small trained model and held-out rows"""
+    X, y = generate_synthetic_training_data(n_samples=1500, seed=0)
+    model = CreditTrustModel()
+    model.train(X, y)
+    X_new, _ = generate_synthetic_training_data(n_samples=40, seed=1)
+    return model, X_new
+
+
+class TestCreditTrustModel:
+    """Test batch inference"""
+
+    def test_predict_scores_matches_single_rows(self, trained):
+        """Test that batch scoring equals row-by-row predict_score"""
+        model, X = trained
+        trust_scores, risk_levels, confidences = model.predict_scores(X)
+
+        assert len(trust_scores) == len(risk_levels) == len(confidences) == len(X)
+        for i in range(len(X)):
+            assert model.predict_score(X.iloc[[i]]) == (
+                int(trust_scores[i]), risk_levels[i], float(confidences[i])
+            )
+            assert 300 <= trust_scores[i] <= 900
+
+    def test_predict_array_float32(self, trained):
+        """Test that float32 rows score like float64 rows of the same values"""
+        model, X = trained
+        X32 = X.to_numpy(dtype=np.float32)
+        result = model.predict_array(X32, explain=True)
+        trust_scores, risk_levels, confidences = model.predict_scores(X32.astype(np.float64))
+        expected = model.explain_predictions(X32.astype(np.float64))
+
+        assert np.array_equal(result['trust_score'], trust_scores)
+        assert list(result['risk_level']) == list(risk_levels)
+        assert np.array_equal(result['confidence'], confidences)
+        assert np.array_equal(result['contributions'], expected['contributions'])
+        assert model.predict_array(X32[0])['trust_score'].shape == (1,)
+
+    def test_explain_predictions_shapes(self, trained):
+        """Test per-row predicted-class contributions for a batch"""
+        model, X = trained
+        batch = model.explain_predictions(X)
+
+        assert batch['contributions'].shape == (len(X), len(model.feature_names))
+        assert batch['base_values'].shape == (len(X),)
+
+        single = model.explain_prediction(X.iloc[[3]])
+        assert single['method'] == batch['method']
+        assert single['predicted_class'] == batch['predicted_class'][3]
+        by_feature = {e['feature']: e['contribution'] for e in single['explanations']}
+        expected = dict(zip(model.feature_names, batch['contributions'][3]))
+        assert by_feature == pytest.approx(expected)
+
+    @pytest.mark.parametrize("method", ["path", "shap"])
+    def test_contributions_sum_to_probability(self, trained, method):
+        """Test additivity of both attribution methods for the predicted class"""
+        model, X = trained
+        batch = model.explain_predictions(X, method=method)
+        assert batch['method'] == method
+        probabilities = model.model.predict_proba(model.scaler.transform(X))
+        predicted = probabilities[np.arange(len(X)), batch['predicted_class']]
+
+        assert np.allclose(batch['contributions'].sum(axis=1) + batch['base_values'], predicted, atol=1e-6)
+
+    def test_path_attribution_agrees_with_shap_on_top_feature(self, trained):
+        """Test that path attribution mostly ranks the same top feature as SHAP"""
+        model, X = trained
+        path = model.explain_predictions(X, method='path')['contributions']
+        shap_values = model.explain_predictions(X, method='shap')['contributions']
+
+        agreement = np.mean(np.abs(path).argmax(axis=1) == np.abs(shap_values).argmax(axis=1))
+        assert agreement >= 0.6
+
+    def test_large_batches_use_sklearn(self, trained, monkeypatch):
+        """Test that batches past the crossover match the flat engine through sklearn"""
+        model, X = trained
+        monkeypatch.setitem(CreditTrustModel.SKLEARN_MIN_ROWS, model.backend, 10)
+        calls = []
+        sklearn_proba = model.model.predict_proba
+
+        def recording_proba(rows):
+            calls.append(len(rows))
+            return sklearn_proba(rows)
+
+        monkeypatch.setattr(model.model, 'predict_proba', recording_proba)
+
+        small = model.predict_proba(X.iloc[:5])
+        large = model.predict_proba(X)
+
+        assert calls == [len(X)]
+        assert np.array_equal(small, model.forest.predict_proba(X.iloc[:5].to_numpy()))
+        assert np.array_equal(large, model.forest.predict_proba(X.to_numpy()))
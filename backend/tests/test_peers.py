@@ -0,0 +1,111 @@
+"""
+Test Suite for Peer Comparison
+Tests per-rule peer ranks, rule direction, cohorts and warm-up from stored data
+"""
+import random
+
+import pytest
+from sqlalchemy import create_engine, insert
+
+from app.analytics.peers import FIELD_RANGES, PEER_BINS, PeerComparison
+from app.db import models
+
+
+def applicant(rng, tenure=None):
+    """Random behavioral record within the expected field ranges"""
+    data = {field: rng.uniform(low, high) for field, (low, high) in FIELD_RANGES.items()}
+    if tenure is not None:
+        data['account_tenure_months'] = tenure
+    return data
+
+
+class TestPeerComparison:
+    """Test ranks against all applicants and cohorts"""
+
+    def test_rank_matches_brute_force(self):
+        """Test that ranks are within one bin of the exact share"""
+        rng = random.Random(0)
+        peers = PeerComparison(min_peers=1)
+        population = [applicant(rng) for _ in range(3000)]
+        for data in population:
+            peers.observe(data)
+
+        probe = applicant(rng)
+        ranks = peers.compare(probe)
+
+        balances = [data['avg_month_end_balance'] for data in population]
+        exact = 100.0 * sum(b < probe['avg_month_end_balance'] for b in balances) / len(balances)
+        assert abs(ranks['D1']['percentile'] - exact) <= 100.0 / PEER_BINS + 0.5
+        assert ranks['D1']['peer_count'] == 3000
+        assert ranks['D1']['peer_group'] == 'applicants'
+
+    def test_inverse_rule_ranks_lower_values_higher(self):
+        """Test that a low spending volatility beats most peers"""
+        rng = random.Random(1)
+        peers = PeerComparison(min_peers=1)
+        for _ in range(1000):
+            peers.observe(applicant(rng))
+
+        data = applicant(rng)
+        data['spending_volatility'] = 0.1
+        data['avg_month_end_balance'] = 5000.0
+        ranks = peers.compare(data)
+
+        assert ranks['C1']['inverse'] and ranks['C1']['percentile'] > 80
+        assert not ranks['D1']['inverse'] and ranks['D1']['percentile'] < 20
+
+    def test_nothing_before_min_peers(self):
+        """Test that too few peers give no ranks"""
+        peers = PeerComparison(min_peers=10)
+        rng = random.Random(2)
+        for _ in range(9):
+            peers.observe(applicant(rng))
+
+        assert peers.compare(applicant(rng)) == {}
+
+    def test_cohort_falls_back_to_all_applicants(self):
+        """Test that a small tenure band is ranked against all applicants"""
+        rng = random.Random(3)
+        peers = PeerComparison(cohort_key='tenure_band', min_peers=50)
+        for _ in range(200):
+            peers.observe(applicant(rng, tenure=36))
+        for _ in range(10):
+            peers.observe(applicant(rng, tenure=6))
+
+        established = peers.compare(applicant(rng, tenure=40))
+        new = peers.compare(applicant(rng, tenure=3))
+
+        assert established['A1']['peer_group'] == 'applicants with 2-5 years of account history'
+        assert established['A1']['peer_count'] == 200
+        assert new['A1']['peer_group'] == 'applicants'
+        assert new['A1']['peer_count'] == 210
+
+    def test_memory_is_bounded(self):
+        """Test that counts stay in fixed bins however many values arrive"""
+        rng = random.Random(4)
+        peers = PeerComparison(cohort_key='tenure_band', min_peers=1)
+        for _ in range(5000):
+            peers.observe(applicant(rng))
+
+        assert len(peers._trees) == 5
+        assert all(tree.size == PEER_BINS for group in peers._trees for tree in group)
+
+    def test_unknown_cohort_key(self):
+        """Test that an unknown cohort key is rejected"""
+        with pytest.raises(ValueError):
+            PeerComparison(cohort_key='postcode')
+
+    def test_warm_from_behavioral_data(self, tmp_path):
+        """Test that warm-up reads only the most recent rows"""
+        engine = create_engine(f"sqlite:///{tmp_path / 'peers.db'}")
+        models.Base.metadata.create_all(bind=engine)
+        rng = random.Random(5)
+        with engine.begin() as conn:
+            conn.execute(insert(models.BehavioralData.__table__), [
+                dict(applicant(rng), user_id=f'U{i}', discretionary_income_ratio=0.2)
+                for i in range(30)
+            ])
+        peers = PeerComparison(min_peers=1)
+
+        assert peers.warm(engine, rows=20) == 20
+        assert peers.compare(applicant(rng))['F2']['peer_count'] == 20
@@ -0,0 +1,131 @@
+"""
+Test Suite for Score Percentiles
+Tests the Fenwick tree, latest-score-per-user ranking, database sync and snapshots
+"""
+import json
+import random
+
+from sqlalchemy import create_engine, insert
+
+from app.analytics.percentiles import FenwickTree, ScoreDistribution
+from app.db import models
+
+
+def store_scores(engine, rows):
+    """Insert (user_id, trust_score) rows into credit_scores"""
+    with engine.begin() as conn:
+        conn.execute(insert(models.CreditScore.__table__), [
+            {'user_id': user_id, 'trust_score': score, 'risk_level': 'Moderate', 'risk_category': 'Moderate'}
+            for user_id, score in rows
+        ])
+
+
+def score_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'scores.db'}")
+    models.Base.metadata.create_all(bind=engine)
+    return engine
+
+
+class TestFenwickTree:
+    """Test prefix sums"""
+
+    def test_matches_brute_force(self):
+        """Test random updates against a plain list"""
+        rng = random.Random(0)
+        counts = [0] * 441
+        tree = FenwickTree(441)
+        for _ in range(2000):
+            index, delta = rng.randrange(441), rng.choice((1, 1, 2, -1))
+            counts[index] += delta
+            tree.add(index, delta)
+
+        assert all(tree.prefix_sum(end) == sum(counts[:end]) for end in range(0, 442, 7))
+        assert tree.total == sum(counts)
+        assert tree.counts() == counts
+
+    def test_bulk_build(self):
+        """Test that from_counts equals incremental construction"""
+        rng = random.Random(1)
+        counts = [rng.randrange(5) for _ in range(441)]
+        tree = FenwickTree.from_counts(counts)
+
+        assert tree.counts() == counts
+        assert tree.prefix_sum(200) == sum(counts[:200])
+
+
+class TestScoreDistribution:
+    """Test ranking of the latest score per user"""
+
+    def test_rank(self):
+        """Test percentile and top share with ties"""
+        distribution = ScoreDistribution()
+        for i, score in enumerate([500, 600, 600, 700, 800]):
+            distribution.apply(f'U{i}', score)
+
+        rank = distribution.rank(600)
+
+        assert rank == {'percentile': 20.0, 'top_percent': 80.0, 'population': 5}
+        assert distribution.rank(860)['top_percent'] == 0.0
+        assert ScoreDistribution().rank(600) is None
+
+    def test_new_score_replaces_previous(self):
+        """Test that only a user's latest score counts"""
+        distribution = ScoreDistribution()
+        distribution.apply('U1', 500)
+        distribution.apply('U2', 700)
+        distribution.apply('U1', 800)
+        distribution.apply('U1', 800)
+
+        assert distribution.population == 2
+        assert distribution.rank(750)['percentile'] == 50.0
+
+    def test_sync_and_snapshot(self, tmp_path):
+        """Test keyset sync from credit_scores and a snapshot round trip"""
+        engine = score_engine(tmp_path)
+        store_scores(engine, [('U1', 500), ('U2', 650), ('U1', 720)])
+        distribution = ScoreDistribution()
+
+        assert distribution.sync(engine, chunk_size=2) == 3
+        assert distribution.population == 2
+        path = str(tmp_path / 'distribution.json')
+        distribution.save(path)
+
+        store_scores(engine, [('U3', 860)])
+        restored = ScoreDistribution()
+        restored.start(engine, path, sync_interval=0)
+
+        assert restored.last_score_id == 4
+        assert restored.rank(700) == {'percentile': 33.3, 'top_percent': 66.7, 'population': 3}
+
+    def test_rebuilds_when_table_is_behind(self, tmp_path):
+        """Test that a snapshot newer than the database is discarded"""
+        engine = score_engine(tmp_path)
+        distribution = ScoreDistribution()
+        for i in range(10):
+            distribution.apply(f'U{i}', 600)
+        distribution.last_score_id = 10
+        path = str(tmp_path / 'distribution.json')
+        distribution.save(path)
+        store_scores(engine, [('U1', 700)])
+
+        restored = ScoreDistribution()
+        restored.start(engine, path, sync_interval=0)
+
+        assert restored.population == 1
+        assert restored.last_score_id == 1
+
+    def test_inconsistent_snapshot_is_ignored(self, tmp_path):
+        """Test that counts disagreeing with the user buckets are not restored"""
+        distribution = ScoreDistribution()
+        distribution.apply('U1', 600)
+        distribution.apply('U2', 700)
+        path = tmp_path / 'distribution.json'
+        distribution.save(str(path))
+        snapshot = json.loads(path.read_text())
+        snapshot['counts'][600 - distribution.score_min] += 1
+        path.write_text(json.dumps(snapshot))
+
+        restored = ScoreDistribution()
+
+        assert not restored.load(str(path))
+        assert restored.population == 0
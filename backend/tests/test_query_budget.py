@@ -0,0 +1,140 @@
+"""
+Test Suite for Query Budgets
+Asserts per-endpoint SQL statement budgets and N+1 detection
+"""
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.main import app
+from app.db import models
+from app.db.database import engine
+from app.core.request_context import RequestContext
+from app.db.query_monitor import (
+    assert_max_queries,
+    record_queries,
+    statement_shape,
+    check_request_queries,
+    suppress_diagnostics
+)
+
+
+BEHAVIORAL_DATA = {
+    'utility_payment_months': 14,
+    'utility_payment_consistency': 0.95,
+    'monthly_transaction_count': 45,
+    'transaction_regularity_score': 0.88,
+    'spending_volatility': 0.12,
+    'avg_month_end_balance': 5000.0,
+    'savings_growth_rate': 0.15,
+    'withdrawal_discipline_score': 0.82,
+    'income_regularity_score': 0.90,
+    'income_stability_months': 18,
+    'account_tenure_months': 38,
+    'address_stability_years': 2.5,
+    'discretionary_income_ratio': 0.22
+}
+
+
+@pytest.fixture(scope="module")
+def client():
+    """Test client on a fresh database"""
+    models.Base.metadata.drop_all(bind=engine)
+    models.Base.metadata.create_all(bind=engine)
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="module")
+def scored_user(client):
+    """Registered user with consent and one score"""
+    response = client.post("/api/v1/auth/register", json={
+        "name": "Budget Tester",
+        "email": "budget@example.com",
+        "password": "SecurePass123!"
+    })
+    assert response.status_code == 200
+    auth = response.json()
+    headers = {"Authorization": f"Bearer {auth['access_token']}"}
+
+    response = client.post("/api/v1/consent", json={"consent_given": True}, headers=headers)
+    assert response.status_code == 200
+
+    with record_queries() as recorder:
+        response = client.post("/api/v1/score", json={
+            "user_id": auth['user_id'],
+            "behavioral_data": BEHAVIORAL_DATA
+        })
+    assert response.status_code == 200
+
+    return auth['user_id'], recorder
+
+
+class TestQueryBudgets:
+    """Per-endpoint SQL statement budgets"""
+
+    def test_score_budget(self, scored_user):
+        """Score issues one consent lookup and one insert per record"""
+        _, recorder = scored_user
+        assert recorder.count("/api/v1/score") <= 5, recorder.report("/api/v1/score")
+        assert recorder.repeated_shapes(route="/api/v1/score") == {}
+
+    def test_lender_view_budget(self, client, scored_user):
+        """Lender view loads everything in a single query"""
+        user_id, _ = scored_user
+        with assert_max_queries(2, route="/api/v1/lender-view/{user_id}"):
+            response = client.get(f"/api/v1/lender-view/{user_id}")
+        assert response.status_code == 200
+
+    def test_explainability_budget(self, client, scored_user):
+        user_id, _ = scored_user
+        with assert_max_queries(2, route="/api/v1/explainability/{user_id}"):
+            response = client.get(f"/api/v1/explainability/{user_id}")
+        assert response.status_code == 200
+
+    def test_improvement_budget(self, client, scored_user):
+        user_id, _ = scored_user
+        with assert_max_queries(2, route="/api/v1/improvement/{user_id}"):
+            response = client.get(f"/api/v1/improvement/{user_id}")
+        assert response.status_code == 200
+
+    def test_budget_violation_raises(self, client, scored_user):
+        user_id, _ = scored_user
+        with pytest.raises(AssertionError):
+            with assert_max_queries(0):
+                client.get(f"/api/v1/lender-view/{user_id}")
+
+
+class TestQueryMonitor:
+    """Statement normalization and N+1 detection"""
+
+    def test_statement_shape_ignores_parameters(self):
+        a = "SELECT * FROM users WHERE users.user_id IN (?, ?, ?)"
+        b = "SELECT *\n  FROM users WHERE users.user_id IN (?, ?)"
+        assert statement_shape(a) == statement_shape(b)
+        assert statement_shape("SELECT 1 WHERE x = 'abc'") == "SELECT ? WHERE x = ?"
+
+    def test_repeated_statements_are_flagged(self):
+        context = RequestContext('GET', '/x', track_statements=True)
+        context.query_count = 3
+        context.statement_shapes["SELECT * FROM credit_scores WHERE user_id = ?"] = 3
+
+        warnings = check_request_queries(context)
+        assert any('N+1' in message for message in warnings)
+
+    def test_query_count_threshold(self):
+        context = RequestContext('GET', '/x', track_statements=True)
+        context.query_count = 1000
+
+        warnings = check_request_queries(context)
+        assert any('1000 queries' in message for message in warnings)
+
+    def test_suppressed_statements_are_not_recorded(self):
+        with record_queries() as recorder:
+            with suppress_diagnostics():
+                with engine.connect() as conn:
+                    conn.execute(text("SELECT 1"))
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 2"))
+
+        assert [record.statement for record in recorder.records] == ["SELECT 2"]
@@ -0,0 +1,146 @@
+"""
+Test Suite for the Model Registry
+Tests versioning, the ACTIVE pointer, rollback and hot swapping
+"""
+import os
+import threading
+
+import numpy as np
+import pytest
+
+from app.ml.model import CreditTrustModel
+from app.ml.registry import HotSwapModelLoader, ModelRegistry, RegistryError
+from app.ml.synthetic_data import generate_synthetic_training_data
+
+
+@pytest.fixture(scope="module")
+def models():
+    """Two small models trained on different data"""
+    trained = []
+    for seed in (0, 1):
+        X, y = generate_synthetic_training_data(n_samples=600, seed=seed)
+        model = CreditTrustModel()
+        metrics = model.train(X, y)
+        trained.append((model, metrics))
+    return trained
+
+
+@pytest.fixture
+def registry(tmp_path):
+    return ModelRegistry(str(tmp_path / 'registry'))
+
+
+class TestModelRegistry:
+    """Test version storage and the active pointer"""
+
+    def test_register_assigns_sequential_versions(self, registry, models):
+        """Test versions, manifests and activation on register"""
+        (first, first_metrics), (second, _) = models
+        manifest = registry.register(first, training_metrics=first_metrics, notes='baseline')
+        registry.register(second, activate=False)
+
+        assert [m['version'] for m in registry.list_versions()] == ['v0001', 'v0002']
+        assert registry.active_version() == 'v0001'
+        assert manifest['metrics']['test_accuracy'] == pytest.approx(first_metrics['test_accuracy'])
+        assert manifest['feature_names'] == first.feature_names
+        assert registry.load().version == 'v0001'
+
+    def test_activate_and_rollback(self, registry, models):
+        """Test that rollback returns to the previously active version"""
+        (first, _), (second, _) = models
+        registry.register(first)
+        registry.register(second)
+        assert registry.active_version() == 'v0002'
+
+        pointer = registry.rollback()
+        assert (pointer['version'], pointer['previous']) == ('v0001', 'v0002')
+        registry.rollback('v0002')
+        assert registry.active_version() == 'v0002'
+
+    def test_unknown_version_is_rejected(self, registry, models):
+        """Test that the pointer never references a missing version"""
+        registry.register(models[0][0])
+        with pytest.raises(RegistryError):
+            registry.activate('v0099')
+        assert registry.active_version() == 'v0001'
+
+    def test_incomplete_version_is_ignored(self, registry, models):
+        """Test that a directory without a manifest is not listed"""
+        registry.register(models[0][0])
+        os.makedirs(registry.version_dir('v0002'))
+
+        assert [m['version'] for m in registry.list_versions()] == ['v0001']
+        assert registry.register(models[1][0])['version'] == 'v0003'
+
+
+class TestHotSwapModelLoader:
+    """Test in-process swapping"""
+
+    def test_follows_pointer(self, registry, models):
+        """Test that refresh swaps to the newly activated version"""
+        (first, _), (second, _) = models
+        registry.register(first)
+        loader = HotSwapModelLoader(registry, poll_interval=0)
+        loader.start()
+        assert loader.version == 'v0001'
+        assert not loader.refresh()
+
+        registry.register(second)
+        assert loader.refresh()
+        assert loader.version == 'v0002'
+        registry.rollback()
+        assert loader.refresh()
+        assert loader.version == 'v0001'
+
+    def test_requests_keep_their_model_during_swap(self, registry, models):
+        """Test that concurrent scoring never fails while versions swap"""
+        (first, _), (second, _) = models
+        registry.register(first)
+        registry.register(second, activate=False)
+        loader = HotSwapModelLoader(registry, poll_interval=0)
+        loader.start()
+        X, _ = generate_synthetic_training_data(n_samples=50, seed=7)
+        expected = {
+            'v0001': first.predict_proba(X),
+            'v0002': second.predict_proba(X)
+        }
+        errors = []
+        stop = threading.Event()
+
+        def score():
+            while not stop.is_set():
+                model = loader.model
+                try:
+                    assert np.array_equal(model.predict_proba(X), expected[model.version])
+                except Exception as exc:
+                    errors.append(exc)
+
+        workers = [threading.Thread(target=score) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        for version in ['v0002', 'v0001'] * 5:
+            registry.activate(version)
+            loader.refresh(force=True)
+        stop.set()
+        for worker in workers:
+            worker.join()
+
+        assert not errors
+        assert loader.swaps == 11
+
+    def test_broken_version_keeps_serving_current(self, registry, models):
+        """Test that a corrupted artifact does not replace the served model"""
+        (first, _), (second, _) = models
+        registry.register(first)
+        loader = HotSwapModelLoader(registry, poll_interval=0)
+        loader.start()
+
+        registry.register(second, activate=False)
+        with open(registry.artifact_path('v0002'), 'r+b') as f:
+            f.seek(-10, 2)
+            f.write(b'\xff' * 10)
+        registry.activate('v0002')
+
+        assert not loader.refresh()
+        assert loader.version == 'v0001'
+        assert loader.failures == 1
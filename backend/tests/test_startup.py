@@ -0,0 +1,73 @@
+"""
+Test Suite for Cold Start
+Tests the import-time budget of app.main and the startup profiler
+"""
+import subprocess
+import sys
+
+from app.core.startup_profile import (
+    BACKEND_DIR,
+    HEAVY_MODULES,
+    measure_imports,
+    parse_importtime,
+    startup_step,
+    STARTUP_STEPS,
+    time_by_package
+)
+
+
+# Generous for slow CI machines; the budget guards against eager ML imports
+IMPORT_BUDGET_SECONDS = 3.0
+
+
+class TestImportBudget:
+    """Test what importing app.main costs"""
+
+    def test_app_main_within_budget(self):
+        """Test the wall-clock import time of app.main in a fresh interpreter"""
+        wall, timings = measure_imports('app.main')
+
+        assert wall < IMPORT_BUDGET_SECONDS, time_by_package(timings)
+        assert any(timing.module == 'app.main' for timing in timings)
+
+    def test_no_heavy_ml_modules_on_import(self):
+        """Test that pandas, scikit-learn, SHAP and joblib stay unimported"""
+        code = (
+            "import sys, app.main; "
+            f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+        )
+        result = subprocess.run([sys.executable, '-c', code], cwd=BACKEND_DIR,
+                                capture_output=True, text=True)
+
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == ''
+
+
+class TestStartupProfiler:
+    """Test importtime parsing and step timing"""
+
+    def test_parse_importtime(self):
+        """Test nesting depth and per-package totals"""
+        output = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |   numpy.core\n"
+            "import time:       300 |        420 | numpy\n"
+            "import time:        50 |         50 | app\n"
+            "unrelated line\n"
+        )
+        timings = parse_importtime(output)
+
+        assert [(t.module, t.depth) for t in timings] == [('numpy.core', 1), ('numpy', 0), ('app', 0)]
+        assert timings[1].cumulative_us == 420
+        assert time_by_package(timings) == {'numpy': 420, 'app': 50}
+
+    def test_startup_step_records_duration(self):
+        """Test that each step is recorded in order"""
+        STARTUP_STEPS.clear()
+        with startup_step('first'):
+            pass
+        with startup_step('second'):
+            pass
+
+        assert [name for name, _ in STARTUP_STEPS] == ['first', 'second']
+        assert all(seconds >= 0 for _, seconds in STARTUP_STEPS)
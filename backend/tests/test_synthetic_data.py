@@ -0,0 +1,70 @@
+"""
+Test Suite for Synthetic Training Data
+Tests chunked generation, profile ranges and streaming writers
+"""
+import numpy as np
+import pytest
+
+from app.ml.feature_engineering import FeatureEngineer
+from app.ml.synthetic_data import (
+    iter_synthetic_chunks,
+    generate_synthetic_training_data,
+    sample_profiles,
+    write_npy,
+    load_npy,
+    write_parquet
+)
+
+
+class TestSyntheticData:
+    """Test the vectorized generator"""
+
+    def test_chunks_have_fixed_size(self):
+        """Test that chunks are chunk_size rows except the last"""
+        sizes = [len(y) for _, y in iter_synthetic_chunks(2500, chunk_size=1000)]
+        assert sizes == [1000, 1000, 500]
+
+    def test_seed_is_deterministic(self):
+        """Test that a seed reproduces the same dataset"""
+        X1, y1 = generate_synthetic_training_data(3000, seed=5)
+        X2, y2 = generate_synthetic_training_data(3000, seed=5)
+
+        assert list(X1.columns) == FeatureEngineer.FEATURE_NAMES
+        assert X1.shape == (3000, len(FeatureEngineer.FEATURE_NAMES))
+        assert X1.equals(X2)
+        assert np.array_equal(y1, y2)
+
+    def test_class_mix(self):
+        """Test the 40/45/15 class mix"""
+        _, y = generate_synthetic_training_data(50000, seed=1)
+        shares = np.bincount(y, minlength=3) / len(y)
+        assert np.allclose(shares, [0.40, 0.45, 0.15], atol=0.01)
+
+    def test_profiles_respect_distributions(self):
+        """Test that sampled values stay within each class's ranges"""
+        columns = sample_profiles(np.array([0] * 100 + [2] * 100), np.random.default_rng(1))
+
+        assert columns['utility_payment_months'][:100].min() >= 12
+        assert columns['utility_payment_months'][100:].max() < 8
+        assert columns['utility_payment_months'].dtype.kind == 'i'
+        assert columns['spending_volatility'][100:].min() >= 0.5
+
+    def test_write_npy_roundtrip(self, tmp_path):
+        """Test streaming into memmaps"""
+        prefix = str(tmp_path / 'train')
+        write_npy(prefix, 2500, chunk_size=1000, seed=9)
+
+        X, y = load_npy(prefix)
+        X_ref, y_ref = generate_synthetic_training_data(2500, seed=9, chunk_size=1000)
+        assert isinstance(X, np.memmap)
+        assert np.array_equal(X, X_ref.to_numpy())
+        assert np.array_equal(y, y_ref)
+
+    def test_write_parquet(self, tmp_path):
+        """Test streaming into Parquet"""
+        pq = pytest.importorskip('pyarrow.parquet')
+        path = write_parquet(str(tmp_path / 'train.parquet'), 2500, chunk_size=1000)
+
+        table = pq.read_table(path)
+        assert table.num_rows == 2500
+        assert table.column_names == FeatureEngineer.FEATURE_NAMES + ['label']
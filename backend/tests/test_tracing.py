@@ -0,0 +1,154 @@
+"""
+Test Suite for In-Process Tracing
+Tests sampling, span nesting and exporters
+"""
+import json
+import logging
+
+from fastapi.testclient import TestClient
+
+from app.core.request_context import get_request_context
+from app.db import query_monitor
+from app.main import app
+from app.middleware.logging import ACCESS_LOGGER_NAME, TraceIdFilter
+from app.core.tracing import (
+    Tracer,
+    JsonlSpanExporter,
+    OTLPJsonSpanExporter,
+    parse_traceparent
+)
+
+
+class RecordingProcessor:
+    """Collects finished spans synchronously"""
+
+    def __init__(self):
+        self.spans = []
+
+    def on_end(self, span):
+        self.spans.append(span)
+
+    def shutdown(self):
+        pass
+
+
+class RecordingHandler(logging.Handler):
+    """Collects records with the trace ID attached on the calling thread"""
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+        self.addFilter(TraceIdFilter())
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class TestTracing:
+    """Test the tracer"""
+
+    def test_parse_traceparent(self):
+        """Test W3C traceparent parsing"""
+        header = '00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01'
+        assert parse_traceparent(header) == (
+            '4bf92f3577b34da6a3ce929d0e0e4736', '00f067aa0ba902b7', True
+        )
+        assert parse_traceparent('garbage') is None
+        assert parse_traceparent(None) is None
+
+    def test_unsampled_request_has_trace_id_but_no_spans(self):
+        """Test that unsampled requests are cheap but still correlatable"""
+        processor = RecordingProcessor()
+        tracer = Tracer(sample_rate=0.0, processor=processor)
+
+        trace_id, span = tracer.start_request('GET /x')
+        assert len(trace_id) == 32
+        assert span is None
+
+        token = tracer.activate(span)
+        with tracer.span('child') as child:
+            assert child is None
+        tracer.deactivate(token)
+        assert processor.spans == []
+
+    def test_child_spans_nest_under_request(self):
+        """Test parent/child relationships"""
+        processor = RecordingProcessor()
+        tracer = Tracer(sample_rate=1.0, processor=processor)
+
+        trace_id, root = tracer.start_request('GET /x')
+        token = tracer.activate(root)
+        with tracer.span('stage') as stage:
+            db_span = tracer.start_span('db.query', kind='client')
+            tracer.end_span(db_span)
+        tracer.deactivate(token)
+        tracer.end_span(root)
+
+        names = [span.name for span in processor.spans]
+        assert names == ['db.query', 'stage', 'GET /x']
+        assert db_span.parent_id == stage.span_id
+        assert stage.parent_id == root.span_id
+        assert all(span.trace_id == trace_id for span in processor.spans)
+
+    def test_incoming_traceparent_is_continued(self):
+        """Test that the caller's trace ID and sampling decision are kept"""
+        tracer = Tracer(sample_rate=0.0, processor=RecordingProcessor())
+        header = '00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01'
+
+        trace_id, root = tracer.start_request('GET /x', header)
+        assert trace_id == '4bf92f3577b34da6a3ce929d0e0e4736'
+        assert root.parent_id == '00f067aa0ba902b7'
+
+    def test_jsonl_exporter(self, tmp_path):
+        """Test JSONL export"""
+        processor = RecordingProcessor()
+        tracer = Tracer(sample_rate=1.0, processor=processor)
+        _, root = tracer.start_request('GET /x')
+        tracer.end_span(root)
+
+        path = tmp_path / 'traces.jsonl'
+        JsonlSpanExporter(str(path)).export(processor.spans)
+
+        record = json.loads(path.read_text().strip())
+        assert record['name'] == 'GET /x'
+        assert record['duration_ms'] >= 0
+
+    def test_otlp_encoding(self):
+        """Test OTLP/JSON encoding"""
+        processor = RecordingProcessor()
+        tracer = Tracer(sample_rate=1.0, processor=processor)
+        _, root = tracer.start_request('GET /x', attributes={'http.status_code': 200})
+        tracer.end_span(root)
+
+        payload = OTLPJsonSpanExporter('http://localhost:4318/v1/traces').encode(processor.spans)
+        span = payload['resourceSpans'][0]['scopeSpans'][0]['spans'][0]
+        assert span['name'] == 'GET /x'
+        assert span['kind'] == 2
+        assert {'key': 'http.status_code', 'value': {'intValue': '200'}} in span['attributes']
+
+
+class TestRequestTracing:
+    """Test trace correlation in the request middleware"""
+
+    def test_request_logs_carry_the_trace_id(self, monkeypatch):
+        """Test that the access line and query checks run inside the request context"""
+        seen = []
+        check = query_monitor.check_request_queries
+
+        def recording_check(context):
+            seen.append(get_request_context().trace_id)
+            return check(context)
+
+        monkeypatch.setattr(query_monitor, 'check_request_queries', recording_check)
+        handler = RecordingHandler()
+        access_logger = logging.getLogger(ACCESS_LOGGER_NAME)
+        access_logger.addHandler(handler)
+        try:
+            with TestClient(app) as client:
+                response = client.get("/")
+        finally:
+            access_logger.removeHandler(handler)
+
+        trace_id = response.headers["X-Trace-Id"]
+        assert [record.trace_id for record in handler.records] == [trace_id]
+        assert seen == [trace_id]
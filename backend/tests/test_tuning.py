@@ -0,0 +1,69 @@
+"""
+Test Suite for Hyperparameter Tuning
+Tests candidate sampling, Pareto selection and a small budgeted search
+"""
+import multiprocessing as mp
+
+from app.ml.synthetic_data import generate_synthetic_training_data
+from app.ml.tuning import choose, pareto_front, sample_candidates, select_survivors, tune
+
+
+def result(id, accuracy, latency_ms, servable=True):
+    return {'id': id, 'family': 'random_forest', 'params': {}, 'accuracy': accuracy,
+            'latency_ms': latency_ms, 'servable': servable}
+
+
+class TestSelection:
+    """Test sampling and accuracy/latency selection"""
+
+    def test_candidates_are_distinct_and_alternate(self):
+        """Test that families alternate and no configuration repeats"""
+        candidates = sample_candidates(10, seed=1)
+
+        assert [c['family'] for c in candidates[:2]] == ['random_forest', 'hist_gradient_boosting']
+        keys = {(c['family'], tuple(sorted(c['params'].items()))) for c in candidates}
+        assert len(keys) == 10
+        assert sample_candidates(10, seed=1) == candidates
+
+    def test_pareto_front(self):
+        """Test that dominated results are excluded"""
+        results = [result(0, 0.90, 1.0), result(1, 0.85, 0.5), result(2, 0.84, 0.9), result(3, 0.90, 2.0)]
+
+        assert [r['id'] for r in pareto_front(results)] == [0, 1]
+        assert [r['id'] for r in select_survivors(results, 3)] == [0, 1, 3]
+
+    def test_choose_respects_latency_limit(self):
+        """Test the latency limit and that unservable results are never chosen"""
+        results = [result(0, 0.95, 0.2, servable=False), result(1, 0.90, 1.0), result(2, 0.85, 0.5)]
+
+        assert choose(results)['id'] == 1
+        assert choose(results, max_latency_ms=0.6)['id'] == 2
+        assert choose(results, max_latency_ms=0.1)['id'] == 2
+        assert choose([result(0, 0.9, 1.0, servable=False)]) is None
+
+
+class TestSearch:
+    """Test the budgeted search end to end"""
+
+    def test_small_search_chooses_servable_model(self):
+        """Test successive halving on a small dataset"""
+        X, y = generate_synthetic_training_data(n_samples=1500, seed=0)
+        report = tune(X.to_numpy(), y, budget_seconds=120, n_candidates=4, n_jobs=2, min_rows=300)
+
+        assert [r['n_rows'] for r in report['rungs']] == [300, 1200]
+        assert report['rungs'][0]['completed'] == 4
+        assert report['rungs'][1]['submitted'] == 2
+        assert report['chosen']['servable']
+        assert report['chosen']['accuracy'] > 0.6
+        assert all(r['latency_ms'] > 0 for r in report['results'])
+
+    def test_zero_budget_stops_early(self):
+        """Test that an exhausted budget returns without a choice"""
+        X, y = generate_synthetic_training_data(n_samples=600, seed=0)
+        before = set(mp.active_children())
+        report = tune(X.to_numpy(), y, budget_seconds=0, n_candidates=2, n_jobs=1, min_rows=300)
+
+        assert report['budget_exhausted']
+        assert report['chosen'] is None
+        # Workers running at the deadline are terminated, not left behind
+        assert set(mp.active_children()) <= before
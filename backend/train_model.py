@@ -1,7 +1,13 @@
 """
 Train Credit Trust Model
-Run this script to train and save the ML model
+Run this script to train the ML model and register it as a new version
+
+Usage:
+    python train_model.py
+    python train_model.py --no-activate --notes "candidate with more samples" --samples 20000
+    python train_model.py --from-db --chunk-size 100000 --checkpoint models/db_training.ckpt
 """
+import argparse
 import sys
 import os
 
@@ -9,51 +15,106 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from app.ml.model import CreditTrustModel, generate_synthetic_training_data
-from app.core.config import settings
+from app.ml.registry import model_registry
+
+
+def train_on_database(args):
+    """Stream labelled lender decisions from the database and train out of core"""
+    from app.db.database import engine
+    from app.ml.db_training import train_from_database
+    
+    print(f"\n📊 Streaming labelled decisions from {engine.url.render_as_string(hide_password=True)}...")
+    
+    def progress(state):
+        print(f"   ... {state['phase']} pass at decision {state['last_id']:,} "
+              f"({state['step']} fit steps, {state['n_trees']} trees)")
+    
+    result = train_from_database(
+        engine,
+        chunk_size=args.chunk_size,
+        n_estimators=args.n_estimators,
+        checkpoint_path=args.checkpoint,
+        resume=not args.restart,
+        progress=progress
+    )
+    metrics = result['metrics']
+    print(f"✅ Trained on {metrics['n_samples']:,} rows "
+          f"({metrics['n_trees']} trees in {metrics['fit_steps']} steps)")
+    print(f"   - Class counts: {metrics['class_counts']}")
+    if metrics['skipped_rows']:
+        print(f"   - Skipped rows: {metrics['skipped_rows']}")
+    return result['model'], metrics
 
 
 def main():
-    """Train and save the credit trust model"""
+    """Train the credit trust model and register it"""
+    parser = argparse.ArgumentParser(description='Train and register the credit trust model')
+    parser.add_argument('--samples', type=int, default=2000, help='synthetic training samples')
+    parser.add_argument('--no-activate', action='store_true',
+                        help='register without switching serving workers to the new version')
+    parser.add_argument('--notes', help='description stored in the version manifest')
+    parser.add_argument('--from-db', action='store_true',
+                        help='train on lender decisions in DATABASE_URL instead of synthetic data')
+    parser.add_argument('--chunk-size', type=int, default=50000, help='rows per query (--from-db)')
+    parser.add_argument('--n-estimators', type=int, default=100, help='trees in the forest (--from-db)')
+    parser.add_argument('--checkpoint', default='models/db_training.ckpt',
+                        help='checkpoint file, resumed if present (--from-db)')
+    parser.add_argument('--restart', action='store_true', help='ignore an existing checkpoint (--from-db)')
+    args = parser.parse_args()
+    
     print("=" * 60)
     print("NEXIS Credit Trust Model Training")
     print("=" * 60)
     
-    # Generate synthetic training data
-    print("\n📊 Generating synthetic training data...")
-    X, y = generate_synthetic_training_data(n_samples=2000)
-    print(f"✅ Generated {len(X)} samples")
-    print(f"   - Low Risk: {sum(y == 0)} samples")
-    print(f"   - Moderate Risk: {sum(y == 1)} samples")
-    print(f"   - High Risk: {sum(y == 2)} samples")
-    
-    # Initialize model
-    print("\n🤖 Initializing model...")
-    model = CreditTrustModel()
+    if args.from_db:
+        model, metrics = train_on_database(args)
+        test_sample = generate_synthetic_training_data(n_samples=1, seed=0)[0]
+        
+        print("\n📈 Training Results:")
+        if metrics['test_accuracy'] is not None:
+            print(f"   - Held-out Accuracy: {metrics['test_accuracy']:.2%} ({metrics['n_validation']:,} rows)")
+        print(f"   - Features: {metrics['n_features']}")
+    else:
+        # Generate synthetic training data
+        print("\n📊 Generating synthetic training data...")
+        X, y = generate_synthetic_training_data(n_samples=args.samples)
+        print(f"✅ Generated {len(X)} samples")
+        print(f"   - Low Risk: {sum(y == 0)} samples")
+        print(f"   - Moderate Risk: {sum(y == 1)} samples")
+        print(f"   - High Risk: {sum(y == 2)} samples")
+        
+        # Initialize model
+        print("\n🤖 Initializing model...")
+        model = CreditTrustModel()
+        
+        # Train model
+        print("\n🎯 Training model...")
+        metrics = model.train(X, y)
+        
+        print("\n📈 Training Results:")
+        print(f"   - Train Accuracy: {metrics['train_accuracy']:.2%}")
+        print(f"   - Test Accuracy: {metrics['test_accuracy']:.2%}")
+        print(f"   - Features: {metrics['n_features']}")
+        print(f"   - Samples: {metrics['n_samples']}")
+        
+        test_sample = X.iloc[[0]]
     
-    # Train model
-    print("\n🎯 Training model...")
-    metrics = model.train(X, y)
-    
-    print("\n📈 Training Results:")
-    print(f"   - Train Accuracy: {metrics['train_accuracy']:.2%}")
-    print(f"   - Test Accuracy: {metrics['test_accuracy']:.2%}")
-    print(f"   - Features: {metrics['n_features']}")
-    print(f"   - Samples: {metrics['n_samples']}")
-    
-    # Save model
-    print("\n💾 Saving model...")
-    model.save(
-        settings.MODEL_PATH,
-        settings.SCALER_PATH,
-        settings.EXPLAINER_PATH
+    # Register model
+    print("\n💾 Registering model...")
+    manifest = model_registry.register(
+        model, training_metrics=metrics, activate=not args.no_activate, notes=args.notes
     )
-    print(f"✅ Model saved to {settings.MODEL_PATH}")
-    print(f"✅ Scaler saved to {settings.SCALER_PATH}")
-    print(f"✅ Explainer saved to {settings.EXPLAINER_PATH}")
+    print(f"✅ Registered version {manifest['version']} in {model_registry.root}")
+    if args.no_activate:
+        print(f"   - Not activated; run: python manage_models.py activate {manifest['version']}")
+    else:
+        print("   - Active: running workers switch to it on their next registry poll")
+    
+    if args.from_db and args.checkpoint and os.path.exists(args.checkpoint):
+        os.remove(args.checkpoint)
     
     # Test prediction
     print("\n🧪 Testing prediction...")
-    test_sample = X.iloc[[0]]
     score, risk, confidence = model.predict_score(test_sample)
     print(f"   - Trust Score: {score}")
     print(f"   - Risk Level: {risk}")
@@ -64,7 +125,7 @@ def main():
     explanation = model.explain_prediction(test_sample)
     print(f"   - Top 3 features:")
     for i, exp in enumerate(explanation['explanations'][:3], 1):
-        print(f"     {i}. {exp['feature']}: {exp['shap_value']:.3f} ({exp['impact']})")
+        print(f"     {i}. {exp['feature']}: {exp['contribution']:.3f} ({exp['impact']})")
     
     print("\n" + "=" * 60)
     print("✅ Model training complete!")